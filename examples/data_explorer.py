@@ -4,10 +4,9 @@ import logging
 logging.basicConfig(level=logging.WARNING)
 
 from functools import partial
+from os.path import basename
 import wx
 
-from numpy import concatenate
-
 from spacq import VERSION
 from spacq.gui.display.plot.static.delegator import formats, available_formats
 from spacq.gui.display.table.filter import FilterListDialog
@@ -15,7 +14,8 @@ from spacq.gui.display.table.generic import TabularDisplayFrame
 from spacq.gui.display.plot.plotmath.derivative import DerivativeMathSetupDialog
 from spacq.gui.display.plot.plotmath.function import FunctionMathSetupDialog, FunctionMathSetupDialog2arg
 
-from spacq.gui.tool.box import load_csv, MessageDialog
+from spacq.gui.tool.box import choose_csv_path, MessageDialog
+from spacq.interface.loader import TableLoader
 
 
 class DataExplorerApp(wx.App):
@@ -26,9 +26,14 @@ class DataExplorerApp(wx.App):
 		self.filter_columns = {}
 		self.filter_dialog = None
 
+		self.loader = None
+
 		# Frames.
 		self.csv_frame = TabularDisplayFrame(None, title=self.default_title)
 
+		# Loading progress is shown without getting in the way of the rows loaded so far.
+		self.csv_frame.CreateStatusBar()
+
 		# Menu.
 		menuBar = wx.MenuBar()
 
@@ -39,6 +44,10 @@ class DataExplorerApp(wx.App):
 		item = menu.Append(wx.ID_OPEN, '&Open...')
 		self.Bind(wx.EVT_MENU, self.OnMenuFileOpen, item)
 
+		self.stop_menu_item = menu.Append(wx.ID_STOP, '&Stop loading')
+		self.stop_menu_item.Enable(False)
+		self.Bind(wx.EVT_MENU, self.OnMenuFileStop, self.stop_menu_item)
+
 		item = menu.Append(wx.ID_CLOSE, '&Close')
 		self.Bind(wx.EVT_MENU, self.OnMenuFileClose, item)
 
@@ -142,27 +151,78 @@ class DataExplorerApp(wx.App):
 		available_formats[format](self.csv_frame, headings, rows).Show()
 
 	def OnMenuFileOpen(self, evt=None):
-		try:
-			result = load_csv(self.csv_frame)
-		except IOError as e:
-			MessageDialog(self.csv_frame, str(e), 'Could not load data').Show()
-			return
+		path = choose_csv_path(self.csv_frame)
 
-		if result is None:
+		if path is None:
 			return
 		else:
 			self.OnMenuFileClose()
 
-		has_header, values, filename = result
+		filename = basename(path)
+
+		# The file is loaded in the background, and shown as it arrives.
+		loader = TableLoader(path)
+		loader.progress_callback = partial(wx.CallAfter, self.OnLoadProgress, loader)
+		loader.done_callback = partial(wx.CallAfter, self.OnLoadDone, loader, filename)
+		loader.exception_callback = partial(wx.CallAfter, self.OnLoadError, loader)
+
+		self.loader = loader
+		self.stop_menu_item.Enable(True)
+		self.csv_frame.SetStatusText('Loading {0}...'.format(filename))
+
+		self.csv_frame.Title = '{0} (loading) - {1}'.format(filename, self.default_title)
+
+		loader.start()
+
+	def OnLoadProgress(self, loader, loaded, total):
+		if loader is not self.loader:
+			return
+
+		self.csv_frame.display_panel.update_data(loader.data)
+
+		percent = min(100, 100 * loaded // max(total, 1))
+		self.csv_frame.SetStatusText('Loaded {0} of about {1} rows ({2}%)'.format(loaded, total, percent))
+
+	def OnLoadDone(self, loader, filename):
+		if loader is not self.loader:
+			return
+
+		self.loader = None
+		self.stop_menu_item.Enable(False)
 
-		self.csv_frame.display_panel.from_csv_data(has_header, values)
+		self.csv_frame.display_panel.update_data(loader.data)
+
+		if loader.cancelled:
+			filename = '{0} (partial)'.format(filename)
+			self.csv_frame.SetStatusText('Stopped after {0} rows'.format(loader.loaded))
+		else:
+			self.csv_frame.SetStatusText('Loaded {0} rows'.format(loader.loaded))
 		self.csv_frame.Title = '{0} - {1}'.format(filename, self.default_title)
 
 		self.update_plot_menus(len(self.csv_frame.display_panel) > 0)
 
 		self.filter_menu_item.Enable(True)
 
+	def OnLoadError(self, loader, e):
+		if loader is not self.loader:
+			return
+
+		self.OnMenuFileClose()
+
+		MessageDialog(self.csv_frame, str(e), 'Could not load data').Show()
+
+	def OnMenuFileStop(self, evt=None):
+		if self.loader is not None:
+			self.loader.cancel()
+
 	def OnMenuFileClose(self, evt=None):
+		if self.loader is not None:
+			self.loader.cancel()
+			self.loader = None
+
+		self.stop_menu_item.Enable(False)
+		self.csv_frame.SetStatusText('')
+
 		self.csv_frame.display_panel.SetValue([], [])
 		self.csv_frame.Title = self.default_title
 
@@ -202,11 +262,13 @@ class DataExplorerApp(wx.App):
 		dmath = DerivativeMathSetupDialog(self.csv_frame, headings, rows)
 		dmath_open = dmath.ShowModal()
 
-		new_headings = headings
-		new_headings.append(dmath.dheading)
-		new_rows = concatenate([rows.astype(float),dmath.ddata],1)
+		# Nothing was calculated.
+		if not dmath.dheading:
+			return
+
+		new_rows = rows.with_column(dmath.dheading, dmath.ddata)
 
-		self.csv_frame.display_panel.SetValue(new_headings,new_rows)
+		self.csv_frame.display_panel.SetValue(new_rows.headings, new_rows)
 
 	def OnMenuMathFunction(self, format, evt=None, type='scalar'):
 		"""
@@ -216,11 +278,13 @@ class DataExplorerApp(wx.App):
 		dmath = FunctionMathSetupDialog(self.csv_frame, headings, rows)
 		dmath_open = dmath.ShowModal()
 				
-		new_headings = headings
-		new_headings.append(dmath.dheading)
-		new_rows = concatenate([rows.astype(float),dmath.ddata],1)
+		# Nothing was calculated.
+		if not dmath.dheading:
+			return
 
-		self.csv_frame.display_panel.SetValue(new_headings,new_rows)
+		new_rows = rows.with_column(dmath.dheading, dmath.ddata)
+
+		self.csv_frame.display_panel.SetValue(new_rows.headings, new_rows)
 
 	def OnMenuMathFunction2arg(self, format, evt=None, type='scalar'):
 		"""
@@ -230,11 +294,13 @@ class DataExplorerApp(wx.App):
 		dmath = FunctionMathSetupDialog2arg(self.csv_frame, headings, rows)
 		dmath_open = dmath.ShowModal()
 				
-		new_headings = headings
-		new_headings.append(dmath.dheading)
-		new_rows = concatenate([rows.astype(float),dmath.ddata],1)
+		# Nothing was calculated.
+		if not dmath.dheading:
+			return
+
+		new_rows = rows.with_column(dmath.dheading, dmath.ddata)
 
-		self.csv_frame.display_panel.SetValue(new_headings,new_rows)
+		self.csv_frame.display_panel.SetValue(new_rows.headings, new_rows)
 
 	def OnMenuHelpAbout(self, evt=None):
 		info = wx.adv.AboutDialogInfo()
@@ -1,13 +1,5 @@
-import logging
-log = logging.getLogger(__name__)
-
-
 name = 'Scientific Instruments'
 
-from . import model9700
-models = [model9700]
-log.debug('Found models for "{0}": {1}'.format(name, ''.join(str(x) for x in models)))
-
-from .mock import model9700
-mock_models = [model9700]
-log.debug('Found mock models for "{0}": {1}'.format(name, ''.join(str(x) for x in mock_models)))
+drivers = [
+	('Model 9700 Temperature Controller', 'model9700', 'mock.model9700'),
+]
@@ -1,5 +1,6 @@
 from packaging import version
 from spacq.tool.box import Enum, Synchronized
+from .tools import split_responses
 from time import time
 from threading import RLock
 import logging
@@ -221,6 +222,14 @@ class AbstractDevice(SuperDevice):
         self.multi_command = []
         self.responses_expected = 0
 
+    def multi_command_cancel(self):
+        """
+        Discard the buffered commands without sending them.
+        """
+
+        self.multi_command = None
+        self.responses_expected = 0
+
     @Synchronized()
     def multi_command_stop(self):
         """
@@ -249,19 +258,37 @@ class AbstractDevice(SuperDevice):
         if self.responses_expected:
             result = self.ask(message)
 
-            # FIXME: What if the response contains a meaningful ";" somewhere?
-            return result.split(';', self.responses_expected - 1)
+            return split_responses(result, self.responses_expected)
         else:
             self.write(message)
 
             return []
 
+    @Synchronized()
+    def multi_ask(self, messages):
+        """
+        Send several queries as a single multi-command message.
+
+        Returns the response to each query.
+        """
+
+        self.multi_command_start()
+
+        try:
+            for message in messages:
+                self.ask(message)
+        except Exception:
+            self.multi_command_cancel()
+            raise
+
+        return self.multi_command_stop()
+
     @Synchronized()
     def write(self, message):
         """
         Write to the device.
 
-        Supports multi-command.
+        Supports multi-command. Messages given as bytes are sent without any conversion.
         """
 
         if self.multi_command is not None:
@@ -271,11 +298,19 @@ class AbstractDevice(SuperDevice):
             self.multi_command.append(message)
             return
 
-        log.debug('Writing to device "{0}": {1!r}'.format(self.name, message))
+        if isinstance(message, bytes):
+            # Binary messages, such as those containing block data, can be very large.
+            log.debug('Writing {1} bytes to device "{0}": {2!r}...'.format(
+                self.name, len(message), message[:64]))
+        else:
+            log.debug('Writing to device "{0}": {1!r}'.format(self.name, message))
 
         if self.driver == drivers.pyvisa:
             try:
-                self.device.write(message)
+                if isinstance(message, bytes):
+                    self.device.write_raw(message)
+                else:
+                    self.device.write(message)
             except pyvisa.VisaIOError as e:
                 if e.error_code == pyvisa.errors.VI_ERROR_TMO:
                     raise DeviceTimeout(e)
@@ -320,7 +355,10 @@ class AbstractDevice(SuperDevice):
                 else:
                     raise
 
-        log.debug('Read from device "{0}": {1!r}'.format(self.name, buf))
+        if len(buf) > 1024:
+            log.debug('Read {1} bytes from device "{0}": {2!r}...'.format(self.name, len(buf), buf[:64]))
+        else:
+            log.debug('Read from device "{0}": {1!r}'.format(self.name, buf))
 
         return buf
 
@@ -2,6 +2,7 @@ from ..tools import quantity_wrapped
 from ..abstract_device import AbstractDevice
 from spacq.tool.box import Synchronized
 from spacq.interface.resources import Resource
+from spacq.interface.units import Quantity
 import logging
 log = logging.getLogger(__name__)
 
@@ -40,6 +41,12 @@ class DM34401A(AbstractDevice):
         self.resources['integration_time'].allowed_values = self.allowed_nplc
         self.resources['auto_zero'].allowed_values = self.allowed_auto_zero
 
+        # Allow readings to be combined into a single message.
+        self.resources['reading'].query = (
+            'read?', lambda x: Quantity(float(x), 'V'))
+        self.resources['integration_time'].query = (
+            'sense:voltage:dc:nplc?', float)
+
     @Synchronized()
     def _connected(self):
         AbstractDevice._connected(self)
@@ -0,0 +1,276 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+import logging
+log = logging.getLogger(__name__)
+
+from .abstract_device import AbstractDevice, DeviceTimeout
+
+
+"""
+Asynchronous (asyncio) access to devices.
+
+Many devices can be driven concurrently from a single event loop, and synchronous callers can use the same devices
+through SyncAdapter.
+"""
+
+
+class SocketTransport(object):
+    """
+    A raw socket (eg. telnet) connection to a device.
+    """
+
+    def __init__(self, host, port=23, read_termination='\r\n', write_termination=''):
+        self.host = host
+        self.port = port
+        self.read_termination = read_termination.encode('ascii')
+        self.write_termination = write_termination.encode('ascii')
+
+        self.reader = self.writer = None
+
+    async def connect(self):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def write(self, message):
+        await self.connect()
+
+        if not isinstance(message, bytes):
+            message = message.encode('ascii')
+
+        self.writer.write(message + self.write_termination)
+        await self.writer.drain()
+
+    async def read_raw(self):
+        """
+        Read a single response, as bytes; it may be binary block data.
+        """
+
+        await self.connect()
+
+        return await self.reader.readuntil(self.read_termination)
+
+    async def ask(self, message):
+        await self.write(message)
+
+        return (await self.read_raw()).decode('ascii')
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+            self.reader = self.writer = None
+
+    async def reset(self):
+        """
+        Drop the connection after a timeout, along with any late response, and reconnect on the next command.
+        """
+
+        writer, self.reader, self.writer = self.writer, None, None
+
+        if writer is not None:
+            writer.close()
+
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+class VisaShim(object):
+    """
+    Run a blocking, VISA-like object (with write and read_raw) without blocking the event loop.
+
+    All calls are made from a single worker thread, since VISA sessions need not be thread-safe. This also allows
+    wrapping an AbstractDevice (including mock devices) which is still used synchronously elsewhere: a query holds the
+    lock of the device from the write until the read, so that no synchronous caller can take its response.
+    """
+
+    def __init__(self, resource):
+        self.resource = resource
+
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    async def _run(self, f, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, f, *args)
+
+    async def write(self, message):
+        if isinstance(message, bytes) and hasattr(self.resource, 'write_raw'):
+            await self._run(self.resource.write_raw, message)
+        else:
+            await self._run(self.resource.write, message)
+
+    async def read_raw(self):
+        return await self._run(self.resource.read_raw)
+
+    def _ask(self, message):
+        lock = getattr(self.resource, 'lock', None)
+
+        if lock is None:
+            self.resource.write(message)
+            return self.resource.read_raw()
+
+        with lock:
+            self.resource.write(message)
+            return self.resource.read_raw()
+
+    async def ask(self, message):
+        return await self._run(self._ask, message)
+
+    async def reset(self):
+        # A call which timed out is still running in the worker, and will consume its own response before the next
+        # call starts.
+        pass
+
+    async def close(self):
+        # The resource is owned elsewhere.
+        self.executor.shutdown(wait=False)
+
+
+class AsyncDevice(object):
+    """
+    Coroutines for talking to a device over a transport.
+
+    Commands to the same device are queued in the order in which they are issued, so that the response to a query
+    always belongs to it; commands to different devices run concurrently.
+    """
+
+    def __init__(self, transport, timeout=AbstractDevice.max_timeout, name=None):
+        """
+        transport: A SocketTransport, VisaShim, or anything else with the same coroutines (write, read_raw, ask,
+            reset, close).
+        timeout: Seconds to wait for any one operation before giving up with DeviceTimeout.
+        """
+
+        self.transport = transport
+        self.timeout = timeout
+        self.name = name if name is not None else transport.__class__.__name__
+
+        self.queue = asyncio.Lock()
+
+    @classmethod
+    def from_device(cls, device, *args, **kwargs):
+        """
+        Wrap an existing (synchronous) device.
+        """
+
+        kwargs.setdefault('name', device.name)
+
+        return cls(VisaShim(device), *args, **kwargs)
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(self.__class__.__name__, self.name)
+
+    async def _timed(self, coroutine):
+        try:
+            return await asyncio.wait_for(coroutine, self.timeout)
+        except asyncio.TimeoutError as e:
+            # A late response must not be taken as the answer to the next query.
+            await self.transport.reset()
+
+            raise DeviceTimeout('No response from device "{0}" within {1} s.'.format(self.name, self.timeout), e)
+
+    async def write(self, message):
+        async with self.queue:
+            log.debug('Writing to device "{0}": {1!r}'.format(self.name, message))
+
+            await self._timed(self.transport.write(message))
+
+    async def read_raw(self):
+        async with self.queue:
+            return await self._timed(self.transport.read_raw())
+
+    async def read(self):
+        """
+        Read from the device, but strip terminating whitespace.
+        """
+
+        return (await self.read_raw()).rstrip()
+
+    async def ask(self, message):
+        """
+        Write, then read, without letting any other command in between.
+        """
+
+        async with self.queue:
+            log.debug('Asking device "{0}": {1!r}'.format(self.name, message))
+
+            result = await self._timed(self.transport.ask(message))
+
+        return result.rstrip()
+
+    async def close(self):
+        async with self.queue:
+            await self.transport.close()
+
+
+async def ask_all(queries):
+    """
+    Ask several devices at once.
+
+    queries: Pairs of (AsyncDevice, message).
+
+    Returns the responses in the same order.
+    """
+
+    return await asyncio.gather(*[device.ask(message) for device, message in queries])
+
+
+class EventLoopThread(Thread):
+    """
+    An event loop running in the background, for use from synchronous code.
+    """
+
+    def __init__(self):
+        Thread.__init__(self)
+
+        self.daemon = True
+
+        self.loop = asyncio.new_event_loop()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run_coroutine(self, coroutine, timeout=None):
+        """
+        Run the coroutine in the loop, blocking until it is done.
+        """
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.join()
+        self.loop.close()
+
+
+class SyncAdapter(object):
+    """
+    The blocking write, read and ask of AbstractDevice, on top of an AsyncDevice.
+    """
+
+    def __init__(self, device, loop_thread):
+        """
+        device: The AsyncDevice.
+        loop_thread: A running EventLoopThread.
+        """
+
+        self.device = device
+        self.loop_thread = loop_thread
+
+    def write(self, message):
+        self.loop_thread.run_coroutine(self.device.write(message))
+
+    def read_raw(self):
+        return self.loop_thread.run_coroutine(self.device.read_raw())
+
+    def read(self):
+        return self.loop_thread.run_coroutine(self.device.read())
+
+    def ask(self, message):
+        return self.loop_thread.run_coroutine(self.device.ask(message))
+
+    def close(self):
+        self.loop_thread.run_coroutine(self.device.close())
@@ -1,3 +1,4 @@
+from importlib import import_module
 from spacq.tool.box import Enum
 
 from .abstract_device import DeviceNotFoundError
@@ -7,49 +8,102 @@ Device configuration.
 """
 
 
-cached_tree = None
+class DriverInfo(object):
+    """
+    What is known about a device model without importing its driver.
+
+    Each manufacturer package lists its models in "drivers", as tuples of (name, real module, mock module), with
+    the modules relative to the package; either module may be None.
+    """
 
+    def __init__(self, manufacturer, name, package, real=None, mock=None):
+        self.manufacturer = manufacturer
+        self.name = name
+        self.package = package
 
-def device_tree():
+        self.modules = {}
+        if real is not None:
+            self.modules['real'] = real
+        if mock is not None:
+            self.modules['mock'] = mock
+
+    def __repr__(self):
+        return '<{0} {1} {2}>'.format(self.__class__.__name__, self.manufacturer, self.name)
+
+    def __contains__(self, kind):
+        return kind in self.modules
+
+    @property
+    def kinds(self):
+        return sorted(self.modules)
+
+    def implementation(self, kind):
+        """
+        Import the driver of the given kind ("real" or "mock"), and return the device class.
+        """
+
+        module = import_module('.' + self.modules[kind], self.package)
+
+        if module.name != self.name:
+            raise ValueError('Different device names: "{0}" and "{1}".'.format(self.name, module.name))
+
+        return module.implementation
+
+
+cached_registry = None
+
+
+def driver_registry():
     """
-    Build a device tree from the existing devices.
+    All the known device models, as DriverInfo objects by manufacturer and model name.
+
+    None of the drivers are imported.
     """
 
-    global cached_tree
+    global cached_registry
 
-    if cached_tree is not None:
-        return cached_tree
+    if cached_registry is not None:
+        return cached_registry
 
     from .. import devices
 
-    tree = {}
+    registry = {}
 
     for manufacturer in devices.manufacturers:
         subtree = {}
 
-        for model, mock_model in zip(manufacturer.models, manufacturer.mock_models):
-            if model is None and mock_model is None:
+        for name, real, mock in manufacturer.drivers:
+            if real is None and mock is None:
                 continue
-            elif model is not None and mock_model is None:
-                name = model.name
-            elif model is None and mock_model is not None:
-                name = mock_model.name
-            elif model is not None and mock_model is not None:
-                if model.name != mock_model.name:
-                    raise ValueError('Different device names: "{0}" and '
-                                     '"{1}".'.format(model.name, mock_model.name))
 
-                name = model.name
+            subtree[name] = DriverInfo(manufacturer.name, name, manufacturer.__name__, real, mock)
+
+        registry[manufacturer.name] = subtree
+
+    cached_registry = registry
+    return cached_registry
+
 
-            subtree[name] = {}
+cached_tree = None
 
-            if model is not None:
-                subtree[name]['real'] = model.implementation
 
-            if mock_model is not None:
-                subtree[name]['mock'] = mock_model.implementation
+def device_tree():
+    """
+    Build a device tree from the existing devices.
 
-        tree[manufacturer.name] = subtree
+    This imports every driver; use driver_registry to find out what is available.
+    """
+
+    global cached_tree
+
+    if cached_tree is not None:
+        return cached_tree
+
+    tree = {}
+
+    for manufacturer, models in driver_registry().items():
+        tree[manufacturer] = dict((name, dict((kind, info.implementation(kind)) for kind in info.kinds))
+                                  for name, info in models.items())
 
     cached_tree = tree
     return cached_tree
@@ -205,26 +259,30 @@ class DeviceConfig(object):
 
                 address['usb_resource'] = self.usb_resource
 
-        tree = device_tree()
+        registry = driver_registry()
 
         try:
-            subtree = tree[self.manufacturer]
+            subtree = registry[self.manufacturer]
         except KeyError:
             raise ConnectionError(
                 'Unknown manufacturer: {0}'.format(self.manufacturer))
 
         try:
-            subtree = subtree[self.model]
+            info = subtree[self.model]
         except KeyError:
             raise ConnectionError('Unknown model: {0}'.format(self.model))
 
         kind = 'mock' if self.mock else 'real'
 
-        try:
-            implementation = subtree[kind]
-        except KeyError:
+        if kind not in info:
             raise ConnectionError('Unknown kind: {0}'.format(kind))
 
+        # Only the driver which is actually used gets imported.
+        try:
+            implementation = info.implementation(kind)
+        except ImportError as e:
+            raise ConnectionError('Unable to load driver.', e)
+
         try:
             device = implementation(autoconnect=False, **address)
         except (ValueError, NotImplementedError) as e:
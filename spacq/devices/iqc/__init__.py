@@ -1,13 +1,7 @@
-import logging
-log = logging.getLogger(__name__)
-
-
 name = 'IQC'
 
-from . import voltage_source, ch6_voltage_source, ch4_voltage_source
-models = [voltage_source, ch6_voltage_source, ch4_voltage_source]
-log.debug('Found models for "{0}": {1}'.format(name, ''.join(str(x) for x in models)))
-
-from .mock import mock_voltage_source, mock_ch6_voltage_source, mock_ch4_voltage_source
-mock_models = [mock_voltage_source, mock_ch6_voltage_source, mock_ch4_voltage_source]
-log.debug('Found mock models for "{0}": {1}'.format(name, ''.join(str(x) for x in mock_models)))
+drivers = [
+    ('Voltage source', 'voltage_source', 'mock.mock_voltage_source'),
+    ('Six channel voltage source', 'ch6_voltage_source', 'mock.mock_ch6_voltage_source'),
+    ('Four channel voltage source', 'ch4_voltage_source', 'mock.mock_ch4_voltage_source'),
+]
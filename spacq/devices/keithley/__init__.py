@@ -1,13 +1,7 @@
-import logging
-log = logging.getLogger(__name__)
-
-
 name = 'Keithley'
 
-from . import voltagesource230, sourceMeter2450, sourceMeter2401
-models = [voltagesource230, sourceMeter2450, sourceMeter2401]
-log.debug('Found models for "{0}": {1}'.format(name, ''.join(str(x) for x in models)))
-
-from .mock import mock_voltagesource230, mock_sourceMeter2450, mock_sourceMeter2401
-mock_models = [mock_voltagesource230, mock_sourceMeter2450, mock_sourceMeter2401]
-log.debug('Found mock models for "{0}": {1}'.format(name, ''.join(str(x) for x in mock_models)))
+drivers = [
+    ('230 Programmable Voltage Source', 'voltagesource230', 'mock.mock_voltagesource230'),
+    ('sourceMeter 2450', 'sourceMeter2450', 'mock.mock_sourceMeter2450'),
+    ('sourceMeter 2401', 'sourceMeter2401', 'mock.mock_sourceMeter2401'),
+]
@@ -19,13 +19,21 @@ class MockAbstractDevice(AbstractDevice):
 	def _split_message(message):
 		"""
 		Split a message into usable components.
+
+		The arguments of binary messages are left as bytes, and are not stripped at the end.
 		"""
 
 		message = message.split(None, 1)
 		try:
-			cmd, args = message[0], message[1].strip()
+			if isinstance(message[1], bytes):
+				cmd, args = message[0].decode('ascii'), message[1].lstrip()
+			else:
+				cmd, args = message[0], message[1].strip()
 		except IndexError:
-			cmd, args = message[0], ''
+			if isinstance(message[0], bytes):
+				cmd, args = message[0].decode('ascii'), b''
+			else:
+				cmd, args = message[0], ''
 
 		if cmd[-1] == '?':
 			query = True
@@ -46,6 +54,10 @@ class MockAbstractDevice(AbstractDevice):
 		self.multi_command_responses = None
 		self.mock_state = {}
 
+		# Traffic to the fake device.
+		self.messages_written = 0
+		self.bytes_written = 0
+
 		try:
 			self._reset()
 			self.mocking._setup(self)
@@ -90,12 +102,25 @@ class MockAbstractDevice(AbstractDevice):
 
 		return responses
 
+	def multi_command_cancel(self):
+		"""
+		Discard buffered responses.
+		"""
+
+		self.multi_command_responses = None
+
 	def write(self, message, result=None, done=False):
 		"""
 		Act on what is being written.
 		"""
 
-		log.debug('Writing to device: {0!r}'.format(message))
+		if isinstance(message, bytes):
+			log.debug('Writing {0} bytes to device.'.format(len(message)))
+		else:
+			log.debug('Writing to device: {0!r}'.format(message))
+
+		self.messages_written += 1
+		self.bytes_written += len(message)
 
 		if not done:
 			if message == '*idn?':
@@ -116,6 +141,8 @@ class MockAbstractDevice(AbstractDevice):
 
 		if result is None:
 			self.output = None
+		elif isinstance(result, bytes):
+			self.output = result + b'\n'
 		else:
 			self.output = str(result) + '\n'
 
@@ -124,7 +151,10 @@ class MockAbstractDevice(AbstractDevice):
 		Return the result of the last write operation.
 		"""
 
-		log.debug('Read from device: {0!r}'.format(self.output))
+		if isinstance(self.output, bytes):
+			log.debug('Read {0} bytes from device.'.format(len(self.output)))
+		else:
+			log.debug('Read from device: {0!r}'.format(self.output))
 
 		return self.output
 
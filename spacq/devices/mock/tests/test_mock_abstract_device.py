@@ -52,6 +52,20 @@ class MockAbstractDeviceTest(TestCase):
 
 		eq_(result, expected)
 
+	def testMultiAsk(self):
+		"""
+		Ask several queries in one message.
+		"""
+
+		dev = mock_abstract_device.MockAbstractDevice()
+
+		eq_(dev.multi_ask(['system:version?', '*idn?']), ['42', 'MockAbstractDevice'])
+
+		assert_raises(NotImplementedError, dev.multi_ask, ['system:version?', 'nonsense?'])
+
+		# Nothing is left buffered after a failure.
+		eq_(dev.ask('*idn?'), 'MockAbstractDevice')
+
 
 if __name__ == '__main__':
 	main()
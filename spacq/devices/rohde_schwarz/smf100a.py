@@ -35,6 +35,10 @@ class SMF100A(AbstractDevice):
 		self.resources['power'].units = 'V'
 		self.resources['frequency'].units = 'Hz'
 
+		# The setters only write, so they can be combined when ramping.
+		for name in read_write:
+			self.resources[name].combinable_write = True
+
 	@Synchronized()
 	def _connected(self):
 		AbstractDevice._connected(self)
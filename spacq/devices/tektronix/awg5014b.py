@@ -1,7 +1,8 @@
 import logging
 log = logging.getLogger(__name__)
 
-import struct
+import hashlib
+from numpy import absolute, asarray, frombuffer, uint16
 
 from spacq.interface.resources import Resource
 from spacq.interface.units import Quantity
@@ -167,31 +168,33 @@ class Channel(AbstractSubdevice):
 		Set the waveform on this channel.
 
 		The waveform data should be in V.
+
+		Returns False if identical data was already on the AWG, so nothing was sent.
 		"""
 
 		if name is None:
 			name = 'Channel {0}'.format(self.channel)
 
-		# Clear existing.
-		if name in self.device.waveform_names:
-			self.device.delete_waveform(name)
+		waveform = asarray(waveform, dtype=float)
 
 		# Normalize waveform.
-		max_amp = max(abs(x) for x in waveform)
+		max_amp = absolute(waveform).max() if len(waveform) > 0 else 0
 		if max_amp > self.max_amplitude:
 			raise ValueError('Amplitude {0} V exceeds maximum of {1} V'.format(max_amp, self.max_amplitude))
 		elif max_amp > 0:
 			if max_amp < self.min_amplitude:
 				max_amp = self.min_amplitude
 
-			waveform = [x / max_amp for x in waveform]
+			waveform = waveform / max_amp
 
 			self.amplitude = Quantity(max_amp, 'V')
 
-		# Create new.
-		self.device.create_waveform(name, waveform, markers)
+		# Replace existing, unless it is identical.
+		uploaded = self.device.upload_waveform(name, waveform, markers)
 		self.waveform_name = name
 
+		return uploaded
+
 
 class AWG5014B(AbstractDevice):
 	"""
@@ -218,6 +221,9 @@ class AWG5014B(AbstractDevice):
 		self.resources['run_mode'].allowed_values = self.allowed_run_modes
 		self.resources['enabled'].converter = str_to_bool
 
+		# Digests of the packed data of waveforms uploaded through this object, by name.
+		self.uploaded_waveforms = {}
+
 	@Synchronized()
 	def reset(self):
 		"""
@@ -227,6 +233,8 @@ class AWG5014B(AbstractDevice):
 		log.info('Resetting "{0}".'.format(self.name))
 		self.write('*rst')
 
+		self.uploaded_waveforms = {}
+
 	@property
 	def data_bits(self):
 		"""
@@ -313,21 +321,74 @@ class AWG5014B(AbstractDevice):
 			log.debug('Getting waveform "{0}" from device "{1}".'.format(name, self.name))
 
 			block_data = self.ask_raw('wlist:waveform:data? "{0}"'.format(name))
+			if isinstance(block_data, str):
+				block_data = block_data.encode('latin-1')
+
 			packed_data = BlockData.from_block_data(block_data)
-			waveform_length = len(packed_data) / 2
-			data = struct.unpack('<{0}H'.format(waveform_length), packed_data)
-			data = [x & 2 ** 14 - 1 for x in data] # Filter out marker data.
+			data = frombuffer(packed_data, dtype='<u2') & (2 ** 14 - 1) # Filter out marker data.
 
 			min_value, max_value = self.value_range
 			range_diff = max_value - min_value
-			data = [2.0 * (x - min_value) / range_diff - 1.0 for x in data]
+			data = 2.0 * (data - min_value) / range_diff - 1.0
 
-			log.debug('Got waveform "{0}" from device "{1}": {2!r}'.format(name, self.name, data))
+			log.debug('Got waveform "{0}" from device "{1}" with {2} points.'.format(name, self.name, len(data)))
 
 			return data
 		finally:
 			self.status.pop()
 
+	def _pack_waveform(self, name, data, markers=None):
+		"""
+		Pack waveform data on [-1, 1] and its markers into an array in the binary format used by the AWG.
+		"""
+
+		min_value, max_value = self.value_range
+		range_diff = max_value - min_value
+
+		# Truncate like int() would.
+		data = (range_diff * (asarray(data, dtype=float) + 1.0) / 2.0).astype(int) + min_value
+
+		if len(data) > 0 and (data.min() < min_value or data.max() > max_value):
+			raise ValueError('Waveform data for "{0}" must be on [-1, 1]'.format(name))
+
+		# Always 16-bit, unsigned, little-endian.
+		data = data.astype('<u2')
+
+		if markers:
+			# The markers are in the top 2 bits.
+			for marker_num, marker_bit in zip([1, 2], [1 << 14, 1 << 15]):
+				try:
+					marker_data = asarray(markers[marker_num], dtype=bool)
+				except KeyError:
+					continue
+
+				if len(marker_data) > len(data):
+					raise ValueError('Marker {0} for "{1}" is longer than the waveform'.format(marker_num, name))
+
+				data[:len(marker_data)] |= marker_data.astype(uint16) * uint16(marker_bit)
+
+				log.debug('Added marker {0} to waveform "{1}" device "{2}".'.format(marker_num, name, self.name))
+
+			extra_markers = set(markers) - set([1, 2])
+			for extra in extra_markers:
+				log.warning('Marker {0} ignored: {1!r}'.format(extra, markers[extra]))
+
+		return data
+
+	def _send_waveform(self, name, packed_data):
+		"""
+		Create a new waveform on the AWG from packed data.
+		"""
+
+		self.write('wlist:waveform:new "{0}", {1}, integer'.format(name, len(packed_data)))
+
+		log.debug('Sending packed block waveform data for "{0}" on device "{1}".'.format(name, self.name))
+
+		command = 'wlist:waveform:data "{0}", '.format(name).encode('ascii')
+		self.write(command + BlockData.to_block_data(packed_data))
+
+		self.uploaded_waveforms[name] = hashlib.sha1(packed_data).hexdigest()
+
 	@Synchronized()
 	def create_waveform(self, name, data, markers=None):
 		"""
@@ -339,42 +400,46 @@ class AWG5014B(AbstractDevice):
 		self.status.append('Creating waveform "{0}"'.format(name))
 
 		try:
-			log.debug('Creating waveform "{0}" on device "{1}" with data: {2!r}'.format(name, self.name, data))
+			log.debug('Creating waveform "{0}" on device "{1}" with {2} points.'.format(name, self.name, len(data)))
 
-			min_value, max_value = self.value_range
-			range_diff = max_value - min_value
-			data = [min_value + int(range_diff * (x + 1.0) / 2.0) for x in data]
-
-			waveform_length = len(data)
-			self.write('wlist:waveform:new "{0}", {1}, integer'.format(name, waveform_length))
-
-			if markers:
-				# The markers are in the top 2 bits.
-				for marker_num, marker_bit in zip([1, 2], [1 << 14, 1 << 15]):
-					try:
-						for i, marker_datum in enumerate(markers[marker_num]):
-							if marker_datum:
-								data[i] += marker_bit
-						log.debug('Added marker {0} to waveform "{1}" device "{1}": {2!r}'.format(marker_num,
-								name, self.name, markers[marker_num]))
-					except KeyError:
-						pass
-
-				extra_markers = set(markers) - set([1, 2])
-				for extra in extra_markers:
-					log.warning('Marker {0} ignored: {1!r}'.format(extra, markers[extra]))
-
-			# Always 16-bit, unsigned, little-endian.
-			packed_data = struct.pack('<{0}H'.format(waveform_length), *data)
-			block_data = BlockData.to_block_data(packed_data)
-
-			log.debug('Sending packed block waveform data for "{0}" on device "{1!r}": {2}'.format(name,
-					self.name, block_data))
-
-			self.write('wlist:waveform:data "{0}", {1}'.format(name, block_data))
+			self._send_waveform(name, self._pack_waveform(name, data, markers))
+		finally:
+			self.status.pop()
+
+	@Synchronized()
+	def upload_waveform(self, name, data, markers=None):
+		"""
+		Create or replace a waveform on the AWG, unless a waveform with identical content was already uploaded under
+		the same name.
+
+		The waveform data should be on [-1, 1].
+
+		Returns True if the waveform was sent, and False if it was skipped.
+		"""
+
+		packed_data = self._pack_waveform(name, data, markers)
+
+		if self.uploaded_waveforms.get(name) == hashlib.sha1(packed_data).hexdigest():
+			log.debug('Waveform "{0}" on device "{1}" is unchanged.'.format(name, self.name))
+
+			return False
+
+		self.status.append('Creating waveform "{0}"'.format(name))
+
+		try:
+			# Clear existing; waveforms uploaded by us are known to exist without asking.
+			if name in self.uploaded_waveforms:
+				self.write('wlist:waveform:delete "{0}"'.format(name))
+				del self.uploaded_waveforms[name]
+			elif name in self.waveform_names:
+				self.delete_waveform(name)
+
+			self._send_waveform(name, packed_data)
 		finally:
 			self.status.pop()
 
+		return True
+
 	def delete_waveform(self, name):
 		"""
 		Remove a waveform on the AWG.
@@ -384,6 +449,7 @@ class AWG5014B(AbstractDevice):
 			raise ValueError('No such waveform "{0}"'.format(name))
 
 		self.write('wlist:waveform:delete "{0}"'.format(name))
+		self.uploaded_waveforms.pop(name, None)
 
 	@property
 	def enabled(self):
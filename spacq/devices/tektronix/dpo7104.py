@@ -2,8 +2,7 @@ import logging
 log = logging.getLogger(__name__)
 
 from math import ceil
-from numpy import linspace
-import struct
+from numpy import column_stack, empty, frombuffer, linspace
 
 from spacq.interface.resources import Resource
 from spacq.tool.box import Synchronized
@@ -61,6 +60,8 @@ class Channel(AbstractSubdevice):
 	def transform_waveform(self, waveform):
 		"""
 		Transform some curve data onto the true amplitude interval in V, and intermix time values in s.
+
+		The result is an array of (time, value) rows.
 		"""
 
 		value_min, value_max = self.device.value_range
@@ -70,8 +71,9 @@ class Channel(AbstractSubdevice):
 		real_diff = real_max - real_min
 
 		times = linspace(0, self.device.time_scale.value, len(waveform))
+		values = real_diff * (waveform - float(value_min)) / value_diff + real_min
 
-		return [(time, real_diff * float(x - value_min) / value_diff + real_min) for time, x in zip(times, waveform)]
+		return column_stack((times, values))
 
 	@property
 	def enabled(self):
@@ -92,7 +94,7 @@ class Channel(AbstractSubdevice):
 		"""
 		A waveform acquired by the scope.
 
-		Values are returned in the format [(time1, value1), (time2, value2), ...].
+		Values are returned as an array of rows in the format [(time1, value1), (time2, value2), ...].
 		"""
 
 		self.device.status.append('Getting waveform for channel {0}'.format(self.channel))
@@ -109,24 +111,35 @@ class Channel(AbstractSubdevice):
 			self.device.fastframe_start = frame
 			self.device.fastframe_stop = frame
 
-			# Receive in chunks.
+			# Big-endian, signed.
+			dtype = '>' + self.device.byte_format_letters[self.device.waveform_bytes]
+
+			# Receive in chunks, straight into the resulting array.
 			num_data_points = self.device.record_length
 			num_transmissions = int(ceil(num_data_points / self.device.max_receive_samples))
 
-			curve = []
+			curve = empty(num_data_points, dtype=dtype)
+			received = 0
 			for i in range(num_transmissions):
 				self.device.data_start = int(i * self.device.max_receive_samples) + 1
 				self.device.data_stop = int((i + 1) * self.device.max_receive_samples)
 
 				curve_raw = self.device.ask_raw('curve?')
-				curve.append(BlockData.from_block_data(curve_raw))
+				if isinstance(curve_raw, str):
+					curve_raw = curve_raw.encode('latin-1')
+
+				chunk = frombuffer(BlockData.from_block_data(curve_raw), dtype=dtype)
+
+				if received + len(chunk) > num_data_points:
+					raise ValueError('Received more than {0} data points'.format(num_data_points))
 
-			curve = ''.join(curve)
+				curve[received:received + len(chunk)] = chunk
+				received += len(chunk)
 
-			format_code = self.device.byte_format_letters[self.device.waveform_bytes]
-			curve_data = struct.unpack('!{0}{1}'.format(num_data_points, format_code), curve)
+			if received != num_data_points:
+				raise ValueError('Expected {0} data points, but received {1}'.format(num_data_points, received))
 
-			return self.transform_waveform(curve_data)
+			return self.transform_waveform(curve)
 		finally:
 			self.device.status.pop()
 
@@ -0,0 +1,76 @@
+from numpy import linspace, sin
+from time import time
+
+from .mock_awg5014b import MockAWG5014B
+
+"""
+Measure the traffic caused by uploading waveforms at every point of a sweep, with and without skipping unchanged
+waveforms.
+"""
+
+
+def make_waveforms(num_channels, length, variant):
+	"""
+	Waveforms and markers for every channel, which differ between variants.
+	"""
+
+	xs = linspace(0, 1, length)
+
+	result = []
+	for channel in range(num_channels):
+		waveform = 0.5 * sin(2 * 3.14159 * (channel + 1) * xs + 0.1 * variant)
+		markers = {1: [i < length // 2 for i in range(length)]}
+
+		result.append((waveform, markers))
+
+	return result
+
+
+def run(points=20, changes_every=5, num_channels=2, length=2000, skip_unchanged=True):
+	"""
+	Upload the waveforms for each point of a fake sweep whose waveforms change every few points.
+
+	Returns a dictionary of statistics.
+	"""
+
+	awg = MockAWG5014B()
+
+	messages, bytes = awg.messages_written, awg.bytes_written
+	uploads = 0
+
+	start_time = time()
+
+	for point in range(points):
+		if not skip_unchanged:
+			# Forget everything, as if nothing had been uploaded.
+			awg.uploaded_waveforms = {}
+
+		awg.clear_channels()
+
+		waveforms = make_waveforms(num_channels, length, point // changes_every)
+		for number, (waveform, markers) in enumerate(waveforms, 1):
+			if awg.channels[number].set_waveform(waveform, markers, name='f{0}'.format(number)):
+				uploads += 1
+
+	return {
+		'points': points,
+		'uploads': uploads,
+		'messages': awg.messages_written - messages,
+		'bytes': awg.bytes_written - bytes,
+		'seconds': time() - start_time,
+	}
+
+
+def main():
+	naive = run(skip_unchanged=False)
+	skipping = run(skip_unchanged=True)
+
+	for label, result in [('Always upload', naive), ('Skip unchanged', skipping)]:
+		print('{0}: {uploads} uploads, {messages} messages, {bytes} bytes in {seconds:.3f} s'.format(label, **result))
+
+	print('Saved {0} messages and {1} bytes'.format(naive['messages'] - skipping['messages'],
+			naive['bytes'] - skipping['bytes']))
+
+
+if __name__ == '__main__':
+	main()
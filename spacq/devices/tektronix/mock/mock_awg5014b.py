@@ -1,4 +1,4 @@
-import struct
+from numpy import frombuffer, zeros
 
 from ...mock.mock_abstract_device import MockAbstractDevice
 from ...tools import BlockData
@@ -19,7 +19,10 @@ class Waveform(object):
 	def __init__(self, name, length):
 		self.name = name
 		self.length = length
-		self._data = [0] * length
+		self._data = zeros(length, dtype='<u2')
+
+		self.marker1 = zeros(length, dtype='<u2')
+		self.marker2 = zeros(length, dtype='<u2')
 
 	@property
 	def data(self):
@@ -80,7 +83,7 @@ class MockAWG5014B(MockAbstractDevice, AWG5014B):
 
 		self.mock_state['wlist'] = []
 		self.mock_state['wlist'].append(Waveform('"predefined waveform"', 5))
-		self.mock_state['wlist'][0].data = list(range(5))
+		self.mock_state['wlist'][0].data = range(5)
 
 		self.mock_state['channels'] = [None] # There is no channel 0.
 		for _ in range(1, 5):
@@ -150,25 +153,19 @@ class MockAWG5014B(MockAbstractDevice, AWG5014B):
 
 						wave = self.find_wave(name)
 
-						data = wave.data
-						data = [datum + marker * 2 ** 14 for (datum, marker) in zip(data, wave.marker1)]
-						data = [datum + marker * 2 ** 15 for (datum, marker) in zip(data, wave.marker2)]
-
-						waveform_length = len(data)
-						packed_data = struct.pack('<{0}H'.format(waveform_length), *data)
-						result = BlockData.to_block_data(packed_data)
+						data = wave.data + wave.marker1 * 2 ** 14 + wave.marker2 * 2 ** 15
+						result = BlockData.to_block_data(data.astype('<u2'))
 					else:
-						name, block_data = args.split(',', 1)
-						name = name.strip()
+						name, block_data = args.split(b',', 1)
+						name = name.strip().decode('ascii')
 						block_data = block_data.lstrip()
 						packed_data = BlockData.from_block_data(block_data)
-						waveform_length = len(packed_data) / 2
-						data = struct.unpack('<{0}H'.format(waveform_length), packed_data)
+						data = frombuffer(packed_data, dtype='<u2')
 
 						wave = self.find_wave(name)
-						wave.data = [x & 2 ** 14 - 1 for x in data]
-						wave.marker1 = [1 if x & 2 ** 14 else 0 for x in data]
-						wave.marker2 = [1 if x & 2 ** 15 else 0 for x in data]
+						wave.data = data & 2 ** 14 - 1
+						wave.marker1 = (data >> 14) & 1
+						wave.marker2 = (data >> 15) & 1
 
 					done = True
 				elif cmd[1] == 'waveform' and cmd[2] == 'delete':
@@ -1,4 +1,7 @@
-from unittest import main
+from nose.tools import eq_
+from numpy import linspace
+from numpy.testing import assert_array_almost_equal
+from unittest import main, TestCase
 
 from ... import awg5014b
 from .. import mock_awg5014b
@@ -22,5 +25,49 @@ def teardown():
 	AWG5014BTest.mock = is_mock
 
 
+class MockAWG5014BTest(TestCase):
+	def testSkipUnchanged(self):
+		"""
+		Identical waveforms are not uploaded again.
+		"""
+
+		awg = mock_awg5014b.MockAWG5014B()
+
+		data = linspace(-1.0, 1.0, 21)
+		markers = {1: [True] * 10 + [False] * 11}
+
+		assert awg.channels[1].set_waveform(data, markers, name='Test')
+		messages = awg.messages_written
+
+		awg.clear_channels()
+		assert not awg.channels[1].set_waveform(data, markers, name='Test')
+		assert not awg.channels[2].set_waveform(data, markers, name='Test')
+		# Clearing the channels, setting the amplitudes, and pointing the channels at the waveform.
+		eq_(awg.messages_written - messages, 4 + 2 + 2)
+		eq_(awg.channels[1].waveform_name, 'Test')
+		eq_(awg.channels[2].waveform_name, 'Test')
+
+		assert awg.channels[1].set_waveform(data, {1: [False] * 21}, name='Test')
+		eq_(awg.waveform_names.count('Test'), 1)
+
+	def testLongWaveform(self):
+		"""
+		Send and receive a long waveform with markers.
+		"""
+
+		awg = mock_awg5014b.MockAWG5014B()
+
+		data = linspace(-1.0, 1.0, 100000)
+		markers = {1: [True, False] * 50000, 2: [False] * 99999 + [True]}
+
+		awg.create_waveform('Long', data, markers)
+
+		assert_array_almost_equal(awg.get_waveform('Long'), data, 3)
+
+		wave = awg.find_wave('"Long"')
+		eq_(list(wave.marker1[:4]), [1, 0, 1, 0])
+		eq_(wave.marker2.sum(), 1)
+
+
 if __name__ == '__main__':
 	main()
@@ -0,0 +1,267 @@
+import asyncio
+from nose.tools import assert_raises, eq_
+from threading import Event, RLock, Thread
+import time
+from unittest import main, TestCase
+
+from ..abstract_device import DeviceTimeout
+from ..mock.mock_abstract_device import MockAbstractDevice
+
+from .. import async_transport
+
+
+class SlowDevice(object):
+	"""
+	A blocking, VISA-like device which takes a while to answer.
+	"""
+
+	def __init__(self, delay):
+		self.delay = delay
+		self.output = None
+
+	def write(self, message):
+		self.output = message.upper() + '\n'
+
+	def read_raw(self):
+		time.sleep(self.delay)
+
+		return self.output
+
+
+class SharedDevice(object):
+	"""
+	A blocking, VISA-like device which is also asked synchronously from another thread.
+	"""
+
+	def __init__(self):
+		self.lock = RLock()
+		self.output = None
+
+		self.written = Event()
+
+	def write(self, message):
+		with self.lock:
+			self.output = message.upper() + '\n'
+			self.written.set()
+
+	def read_raw(self):
+		with self.lock:
+			time.sleep(0.05)
+
+			return self.output
+
+	def ask(self, message):
+		with self.lock:
+			self.write(message)
+
+			return self.read_raw()
+
+
+class AsyncDeviceTest(TestCase):
+	def testMockDevice(self):
+		"""
+		Talk to a mock device through the VISA shim.
+		"""
+
+		dev = async_transport.AsyncDevice.from_device(MockAbstractDevice())
+
+		async def run():
+			return await dev.ask('*idn?'), await dev.ask('system:version?')
+
+		eq_(asyncio.run(run()), ('MockAbstractDevice', '42'))
+
+	def testConcurrent(self):
+		"""
+		Many slow devices are asked at once.
+		"""
+
+		delay = 0.1
+		devs = [async_transport.AsyncDevice(async_transport.VisaShim(SlowDevice(delay))) for _ in range(10)]
+
+		start_time = time.time()
+		result = asyncio.run(async_transport.ask_all([(dev, 'dev{0}'.format(i)) for i, dev in enumerate(devs)]))
+		elapsed = time.time() - start_time
+
+		eq_(result, ['DEV{0}'.format(i) for i in range(10)])
+		assert elapsed < 5 * delay, elapsed
+
+	def testQueued(self):
+		"""
+		Queries to a single device do not interleave.
+		"""
+
+		dev = async_transport.AsyncDevice(async_transport.VisaShim(SlowDevice(0.01)))
+
+		async def run():
+			return await asyncio.gather(*[dev.ask(x) for x in 'abcde'])
+
+		eq_(asyncio.run(run()), list('ABCDE'))
+
+	def testShared(self):
+		"""
+		A synchronous caller cannot take the response to a query.
+		"""
+
+		shared = SharedDevice()
+		dev = async_transport.AsyncDevice(async_transport.VisaShim(shared))
+
+		other = []
+
+		def sync_ask():
+			shared.written.wait()
+			other.append(shared.ask('other'))
+
+		thr = Thread(target=sync_ask)
+		thr.start()
+
+		eq_(asyncio.run(dev.ask('mine')), 'MINE')
+
+		thr.join()
+		eq_(other, ['OTHER\n'])
+
+	def testTimeout(self):
+		"""
+		A device which is too slow.
+		"""
+
+		dev = async_transport.AsyncDevice(async_transport.VisaShim(SlowDevice(0.5)), timeout=0.05)
+
+		assert_raises(DeviceTimeout, asyncio.run, dev.ask('x'))
+
+	def testSocket(self):
+		"""
+		Talk to a line-based server over a socket.
+		"""
+
+		async def handle(reader, writer):
+			while True:
+				line = await reader.readline()
+				if not line:
+					break
+
+				writer.write(line.strip().upper() + b'\r\n')
+				await writer.drain()
+
+			writer.close()
+
+		async def run():
+			server = await asyncio.start_server(handle, '127.0.0.1', 0)
+			port = server.sockets[0].getsockname()[1]
+
+			transport = async_transport.SocketTransport('127.0.0.1', port, write_termination='\n')
+			dev = async_transport.AsyncDevice(transport)
+
+			try:
+				return [await dev.ask('first'), await dev.ask('second')]
+			finally:
+				await dev.close()
+				server.close()
+				await server.wait_closed()
+
+		eq_(asyncio.run(run()), ['FIRST', 'SECOND'])
+
+	def testSocketBinary(self):
+		"""
+		Binary block data is returned as it is.
+		"""
+
+		block = b'#14\xff\x00\x80\x7f\r\n'
+
+		async def handle(reader, writer):
+			await reader.readline()
+
+			writer.write(block)
+			await writer.drain()
+
+			writer.close()
+
+		async def run():
+			server = await asyncio.start_server(handle, '127.0.0.1', 0)
+			port = server.sockets[0].getsockname()[1]
+
+			transport = async_transport.SocketTransport('127.0.0.1', port, write_termination='\n')
+			dev = async_transport.AsyncDevice(transport)
+
+			try:
+				await dev.write('curve?')
+
+				return await dev.read_raw()
+			finally:
+				await dev.close()
+				server.close()
+				await server.wait_closed()
+
+		eq_(asyncio.run(run()), block)
+
+	def testSocketLate(self):
+		"""
+		A response which arrives after the timeout is not taken as the answer to the next query.
+		"""
+
+		async def handle(reader, writer):
+			try:
+				while True:
+					line = await reader.readline()
+					if not line:
+						break
+
+					if line.strip() == b'slow':
+						await asyncio.sleep(0.2)
+
+					writer.write(line.strip().upper() + b'\r\n')
+					await writer.drain()
+			except ConnectionError:
+				pass
+
+			writer.close()
+
+		async def run():
+			server = await asyncio.start_server(handle, '127.0.0.1', 0)
+			port = server.sockets[0].getsockname()[1]
+
+			transport = async_transport.SocketTransport('127.0.0.1', port, write_termination='\n')
+			dev = async_transport.AsyncDevice(transport, timeout=0.1)
+
+			try:
+				try:
+					await dev.ask('slow')
+				except DeviceTimeout:
+					pass
+				else:
+					assert False, 'Expected DeviceTimeout'
+
+				# Give the late response time to arrive.
+				await asyncio.sleep(0.3)
+
+				return await dev.ask('second')
+			finally:
+				await dev.close()
+				server.close()
+				await server.wait_closed()
+
+		eq_(asyncio.run(run()), 'SECOND')
+
+
+class SyncAdapterTest(TestCase):
+	def testAdapter(self):
+		"""
+		Use an asynchronous device synchronously.
+		"""
+
+		loop_thread = async_transport.EventLoopThread()
+		loop_thread.start()
+
+		try:
+			dev = async_transport.SyncAdapter(async_transport.AsyncDevice.from_device(MockAbstractDevice()),
+					loop_thread)
+
+			eq_(dev.ask('*idn?'), 'MockAbstractDevice')
+
+			dev.write('*opc?')
+			eq_(dev.read(), '1')
+		finally:
+			loop_thread.stop()
+
+
+if __name__ == '__main__':
+	main()
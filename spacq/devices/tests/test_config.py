@@ -1,4 +1,7 @@
 from nose.tools import eq_
+import json
+import subprocess
+import sys
 from unittest import main, TestCase
 
 from ..mock.mock_abstract_device import MockAbstractDevice
@@ -37,6 +40,67 @@ class DeviceTreeTest(TestCase):
 		eq_(awg['mock'], MockAWG5014B)
 
 
+class DriverRegistryTest(TestCase):
+	def testRegistry(self):
+		"""
+		The registry matches the tree.
+		"""
+
+		registry = config.driver_registry()
+		tree = config.device_tree()
+
+		eq_(sorted(registry), sorted(tree))
+
+		for manufacturer, models in registry.items():
+			eq_(sorted(models), sorted(tree[manufacturer]))
+
+			for name, info in models.items():
+				eq_(info.kinds, sorted(tree[manufacturer][name]))
+
+		dm = registry['Agilent']['34410A']
+		assert 'real' in dm and 'mock' in dm
+
+		from ..agilent.mock.mock_dm34410a import MockDM34410A
+		eq_(dm.implementation('mock'), MockDM34410A)
+
+	def testLazy(self):
+		"""
+		Drivers are only imported when a device is connected.
+		"""
+
+		script = '''
+import json, sys, time
+
+start_time = time.time()
+from spacq.devices.config import driver_registry, DeviceConfig
+registry = driver_registry()
+import_time = time.time() - start_time
+
+modules = set(info.package + '.' + module for models in registry.values() for info in models.values()
+		for module in info.modules.values())
+
+def drivers():
+	return sorted(modules.intersection(sys.modules))
+before = drivers()
+
+cfg = DeviceConfig(name='Test')
+cfg.address_mode = cfg.address_modes.ethernet
+cfg.manufacturer, cfg.model, cfg.mock = 'Rohde & Schwarz', 'SMF100A', True
+cfg.connect()
+
+print(json.dumps([import_time, before, drivers()]))
+'''
+
+		output = subprocess.check_output([sys.executable, '-c', script])
+		import_time, before, after = json.loads(output.decode('ascii').splitlines()[-1])
+
+		eq_(before, [])
+		eq_(after, ['spacq.devices.rohde_schwarz.mock.mock_smf100a', 'spacq.devices.rohde_schwarz.smf100a'])
+
+		# Startup does not pay for every driver.
+		assert import_time < 5, import_time
+
+
 class DeviceConfigTest(TestCase):
 	def testMockConnect(self):
 		"""
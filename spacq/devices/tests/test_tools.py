@@ -1,4 +1,5 @@
-from nose.tools import eq_
+from nose.tools import assert_raises, eq_
+import numpy
 from unittest import main, TestCase
 
 from spacq.tests.tool.box import AssertHandler
@@ -41,6 +42,25 @@ class BlockDataTest(TestCase):
 			eq_(tools.BlockData.to_block_data(d), b)
 			eq_(tools.BlockData.from_block_data(b), d)
 
+	def testBinaryBlockData(self):
+		"""
+		Bytes and arrays.
+		"""
+
+		binary_data = bytes(range(256))
+
+		eq_(tools.BlockData.to_block_data(b''), b'#10')
+		eq_(tools.BlockData.to_block_data(binary_data), b'#3256' + binary_data)
+		eq_(tools.BlockData.to_block_data(numpy.array([1, 2], dtype='<u2')), b'#14\x01\x00\x02\x00')
+
+		eq_(bytes(tools.BlockData.from_block_data(b'#3256' + binary_data)), binary_data)
+		eq_(bytes(tools.BlockData.from_block_data(b'#3256' + binary_data + b'\n')), binary_data)
+		eq_(bytes(tools.BlockData.from_block_data(b'#0' + binary_data + b'\n')), binary_data)
+		assert_raises(tools.BlockDataError, tools.BlockData.from_block_data, b'#44444Too short.')
+
+		data = tools.BlockData.from_block_data(tools.BlockData.to_block_data(numpy.arange(5, dtype='>i2')))
+		eq_(list(numpy.frombuffer(data, dtype='>i2')), list(range(5)))
+
 	def testFromIndefiniteBlockData(self):
 		"""
 		Indefinite inputs.
@@ -91,6 +111,27 @@ class BlockDataTest(TestCase):
 				assert False, 'Expected BlockDataError.'
 
 
+class SplitResponsesTest(TestCase):
+	def testSplit(self):
+		"""
+		Plain and tricky responses.
+		"""
+
+		eq_(tools.split_responses('1.0', 1), ['1.0'])
+		eq_(tools.split_responses('1.0;2.0;3', 3), ['1.0', '2.0', '3'])
+		eq_(tools.split_responses('"a;b";2', 2), ['"a;b"', '2'])
+		eq_(tools.split_responses("'a;b;c'", 1), ["'a;b;c'"])
+		eq_(tools.split_responses('#13;;;;1', 2), ['#13;;;', '1'])
+
+	def testWrongCount(self):
+		"""
+		The number of responses must be as expected.
+		"""
+
+		assert_raises(ValueError, tools.split_responses, '1;2', 3)
+		assert_raises(ValueError, tools.split_responses, '"1;2";3', 3)
+
+
 class BinaryBinaryEncoderTest(TestCase):
 	def testEncodeDecode(self):
 		"""
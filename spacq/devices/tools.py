@@ -61,15 +61,7 @@ def converted_quantity_unwrapped(units, multiplier=1.0):
     def wrap(f):
         @wraps(f)
         def wrapped(self, value):
-            value.assert_dimensions(units)
-
-            # Perform conversion. Note that this is a bit of a trick. We must use a value of 1.0 because
-            # normalization messes up for Quantities with 0 magnitude.
-            new_value = Quantity(1.0, units)
-            new_value += value
-            new_value -= Quantity(1.0, units)
-
-            return f(self, new_value.original_value * multiplier)
+            return f(self, value.value_in(units) * multiplier)
 
         return wrapped
 
@@ -110,21 +102,59 @@ def dynamic_converted_quantity_unwrapped(units_attr_string, multiplier=1.0):
             # units = getattr(self, units_attr_string)
             units = reduce(getattr, units_attr_string.split('.'), self)
 
-            value.assert_dimensions(units)
-
-            # Perform conversion. Note that this is a bit of a trick. We must use a value of 1.0 because
-            # normalization messes up for Quantities with 0 magnitude.
-            new_value = Quantity(1.0, units)
-            new_value += value
-            new_value -= Quantity(1.0, units)
-
-            return f(self, new_value.original_value * multiplier)
+            return f(self, value.value_in(units) * multiplier)
 
         return wrapped
 
     return wrap
 
 
+def split_responses(response, count):
+    """
+    Split the response to a multi-command message into the individual responses.
+
+    Separators inside quoted strings and definite-length block data are not treated as separators.
+    """
+
+    responses = []
+    start = 0
+    quote = None
+    i = 0
+
+    while i < len(response) and len(responses) < count - 1:
+        c = response[i]
+
+        if quote is not None:
+            if c == quote:
+                quote = None
+        elif c in '"\'':
+            quote = c
+        elif c == '#' and i + 1 < len(response) and response[i + 1] in '123456789':
+            # Skip over definite-length block data.
+            length_length = int(response[i + 1])
+            try:
+                length = int(response[i + 2:i + 2 + length_length])
+            except ValueError:
+                raise ValueError(
+                    'Invalid block data in response: {0!r}'.format(response))
+
+            i += 2 + length_length + length
+            continue
+        elif c == ';':
+            responses.append(response[start:i])
+            start = i + 1
+
+        i += 1
+
+    responses.append(response[start:])
+
+    if len(responses) != count:
+        raise ValueError('Expected {0} responses, not {1}: {2!r}'.format(
+            count, len(responses), response))
+
+    return responses
+
+
 class BlockDataError(Exception):
     """
     Problem reading block data.
@@ -136,6 +166,10 @@ class BlockDataError(Exception):
 class BlockData(object):
     """
     Utility methods for conversion between binary and 488.2 block data.
+
+    Strings are converted to and from strings. Anything else is treated as binary data: bytes, or any object which
+    supports the buffer protocol (such as a numpy array) are converted to bytes, and bytes are converted to a
+    memoryview of the original data, without copying it.
     """
 
     @staticmethod
@@ -148,12 +182,23 @@ class BlockData(object):
         Note: Does not produce indefinitely-formatted block data.
         """
 
-        log.debug('Converting to block data: {0!r}'.format(data))
+        if isinstance(data, str):
+            log.debug('Converting to block data: {0!r}'.format(data))
+
+            length = len(data)
+            length_length = len(str(length))
+
+            return '#{0}{1}{2}'.format(length_length, length, data)
 
-        length = len(data)
+        data = memoryview(data)
+        length = data.nbytes
         length_length = len(str(length))
 
-        return '#{0}{1}{2}'.format(length_length, length, data)
+        log.debug('Converting {0} bytes to block data.'.format(length))
+
+        header = '#{0}{1}'.format(length_length, length).encode('ascii')
+
+        return b''.join([header, data.cast('B')])
 
     @staticmethod
     def from_block_data(block_data):
@@ -163,32 +208,45 @@ class BlockData(object):
         As per section 7.7.6 of IEEE Std 488.2-1992.
         """
 
-        log.debug('Converting from block data: {0!r}'.format(block_data))
+        if isinstance(block_data, str):
+            log.debug('Converting from block data: {0!r}'.format(block_data))
+
+            hash, newline = '#', '\n'
+        else:
+            log.debug('Converting from {0} bytes of block data.'.format(len(block_data)))
+
+            hash, newline = b'#', b'\n'
 
         # Must have at least "#0\n" or "#XX".
         if len(block_data) < 3:
             raise BlockDataError('Not enough data.')
 
-        if block_data[0] != '#':
+        if block_data[0:1] != hash:
             raise BlockDataError(
-                'Leading character is "{0}", not "#".'.format(block_data[0]))
+                'Leading character is "{0}", not "#".'.format(block_data[0:1]))
+
+        if not isinstance(block_data, str):
+            # Slices of the data itself should not be copies.
+            data = memoryview(block_data).cast('B')
+        else:
+            data = block_data
 
-        if block_data[1] == '0':
+        if block_data[1:2] in ['0', b'0']:
             log.debug('Indefinite format.')
 
-            if block_data[-1] != '\n':
+            if block_data[-1:] != newline:
                 raise BlockDataError(
-                    'Final character is "{0}", not NL.'.format(block_data[-1]))
+                    'Final character is "{0}", not NL.'.format(block_data[-1:]))
 
-            return block_data[2:-1]
+            return data[2:-1]
         else:
             log.debug('Definite format.')
 
             try:
-                length_length = int(block_data[1])
+                length_length = int(block_data[1:2])
             except ValueError:
                 raise BlockDataError(
-                    'Length length incorrectly specified: {0}'.format(block_data[1]))
+                    'Length length incorrectly specified: {0}'.format(block_data[1:2]))
 
             data_start = 2 + length_length
 
@@ -206,11 +264,11 @@ class BlockData(object):
             if data_end > len(block_data):
                 raise BlockDataError('Not enough data.')
             elif data_end < len(block_data):
-                if block_data[data_end:] != '\n':
+                if block_data[data_end:] != newline:
                     log.warning('Extra data ignored: {0!r}'.format(
                         block_data[data_end:]))
 
-            return block_data[data_start:data_end]
+            return data[data_start:data_end]
 
 
 class BinaryEncoder(object):
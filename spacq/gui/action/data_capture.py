@@ -1,6 +1,10 @@
+import logging
+log = logging.getLogger(__name__)
+
 import csv
 from datetime import timedelta
 from functools import partial
+from numpy import ndarray
 import os
 from threading import Lock, Thread
 from time import localtime, sleep, time
@@ -8,8 +12,11 @@ import wx
 from wx.lib.filebrowsebutton import DirBrowseButton
 from pubsub import pub
 
+from spacq.interface import capture
+from spacq.interface.list_columns import format_list
 from spacq.interface.pulse.parser import PulseError
 from spacq.interface.units import IncompatibleDimensions
+from spacq.iteration.profiling import SweepProfiler
 from spacq.iteration.sweep import PulseConfiguration, SweepController
 from spacq.iteration.variables import sort_output_variables, sort_condition_variables, InputVariable, OutputVariable, ConditionVariable
 from spacq.tool.box import flatten, sift
@@ -55,6 +62,9 @@ class DataCaptureDialog(Dialog, SweepController):
 
         self.parent = parent
 
+        # Prevent the GUI from locking up, even when there is nothing to wait for.
+        self.min_dwell = 0.005
+
         # Show only elapsed time in continuous mode.
         self.show_remaining_time = not self.continuous
 
@@ -203,14 +213,6 @@ class DataCaptureDialog(Dialog, SweepController):
 
         self.timer.Start(self.timer_delay)
 
-    def dwell(self):
-        result = SweepController.dwell(self)
-
-        # Prevent the GUI from locking up.
-        sleep(0.005)
-
-        return result
-
     def end(self):
         try:
             SweepController.end(self)
@@ -293,6 +295,10 @@ class DataCapturePanel(wx.Panel):
     A panel to start the data capture process, optionally exporting the results to a file.
     """
 
+    # Export formats and their file extensions.
+    export_formats = ['CSV', 'Binary']
+    export_extensions = {'CSV': 'csv', 'Binary': capture.extension}
+
     def __init__(self, parent, global_store, *args, **kwargs):
         wx.Panel.__init__(self, parent, *args, **kwargs)
 
@@ -337,6 +343,16 @@ class DataCapturePanel(wx.Panel):
             self, labelText='Directory:')
         export_path_box.Add(self.directory_browse_button, flag=wx.EXPAND)
 
+        # Format.
+        format_box = wx.BoxSizer(wx.HORIZONTAL)
+        export_path_box.Add(format_box, flag=wx.EXPAND)
+
+        format_box.Add(wx.StaticText(self, label='Format: '),
+                       flag=wx.ALIGN_CENTER_VERTICAL)
+        self.export_format = wx.Choice(self, choices=self.export_formats)
+        self.export_format.SetSelection(0)
+        format_box.Add(self.export_format)
+
         # Last file.
         last_file_box = wx.BoxSizer(wx.HORIZONTAL)
         export_path_box.Add(last_file_box, flag=wx.EXPAND)
@@ -591,9 +607,10 @@ class DataCapturePanel(wx.Panel):
         exporting = False
         if self.export_enabled.Value:
             dir = self.directory_browse_button.GetValue()
-            # YYYY-MM-DD_HH-MM-SS.csv
-            name = '{0:04}-{1:02}-{2:02}_{3:02}-{4:02}-{5:02}.csv'.format(
-                *localtime())
+            export_format = self.export_formats[self.export_format.GetSelection()]
+            # YYYY-MM-DD_HH-MM-SS.<extension>
+            name = '{0:04}-{1:02}-{2:02}_{3:02}-{4:02}-{5:02}.{6}'.format(
+                *(localtime()[:6] + (self.export_extensions[export_format],)))
 
             if not dir:
                 MessageDialog(self, 'No directory selected.',
@@ -610,27 +627,47 @@ class DataCapturePanel(wx.Panel):
                 MessageDialog(self, file_path, 'File exists').Show()
                 return
 
+            headings = (['Time (s)'] +
+                        ['{0.name} ({0.units})'.format(var) if var.units is not None else var.name
+                         for var in flatten(output_variables)] +
+                        ['{0.name} ({1})'.format(var, units) if units is not None else var.name
+                         for var, units in zip(input_variables, measurement_units)])
+
             # Everything looks alright, so open the file.
-            export_file = open(file_path, 'w')
-            export_csv = csv.writer(export_file, lineterminator='\n')
+            if export_format == 'Binary':
+                export_units = ([None] + [var.units for var in flatten(output_variables)] +
+                                [None if units is None else str(units) for units in measurement_units])
+                metadata = {
+                    'outputs': [{'name': var.name, 'order': var.order, 'resource': var.resource_name}
+                                for var in flatten(output_variables)],
+                    'inputs': [{'name': var.name, 'resource': var.resource_name} for var in input_variables],
+                }
+
+                export_capture = capture.CaptureWriter(
+                    file_path, headings, export_units, metadata)
+            else:
+                export_file = open(file_path, 'w')
+                export_csv = csv.writer(export_file, lineterminator='\n')
+
+                # Write the header.
+                export_csv.writerow(headings)
+
             exporting = True
 
             # Show the path in the GUI.
             self.last_file_name.Value = file_path
 
-            # Write the header.
-            export_csv.writerow(['Time (s)'] +
-                                ['{0.name} ({0.units})'.format(var) if var.units is not None else var.name
-                                for var in flatten(output_variables)] +
-                                ['{0.name} ({1})'.format(var, units) if units is not None else var.name
-                                for var, units in zip(input_variables, measurement_units)])
-
         self.capture_dialogs += 1
 
         dlg = DataCaptureDialog(self, resources, output_variables, num_items, measurement_resources,
                                 input_variables, condition_resources, condition_variables, pulse_config, continuous=continuous)
         dlg.SetMinSize((500, -1))
 
+        if exporting:
+            # Keep the timings of the sweep next to its data.
+            dlg.profiler = SweepProfiler()
+            profile_path = os.path.splitext(file_path)[0] + '.profile.json'
+
         for name in measurement_resource_names:
             wx.CallAfter(pub.sendMessage, 'data_capture.start', name=name)
 
@@ -640,8 +677,13 @@ class DataCapturePanel(wx.Panel):
         buf_lock = Lock()
 
         def flush():
-            export_csv.writerows(buf)
-            export_file.flush()
+            if export_format == 'Binary':
+                # The capture writer does its own buffering in large blocks.
+                export_capture.write_rows(buf)
+            else:
+                # Waveforms are written in full, as lists of (time, value) pairs.
+                export_csv.writerows([[format_list(x) if isinstance(x, ndarray) else x for x in row] for row in buf])
+                export_file.flush()
 
             while buf:
                 buf.pop()
@@ -651,6 +693,11 @@ class DataCapturePanel(wx.Panel):
                 wx.CallAfter(pub.sendMessage, 'data_capture.data',
                              name=name, value=value)
 
+            # Spare anything else watching these resources from reading them again; a failed read leaves None.
+            for (_, resource), value in zip(measurement_resources, measurement_values):
+                if value is not None:
+                    self.global_store.acquisition_hub.feed(resource, value)
+
             # Extract values out of quantities, since the units have already been taken care of in the header.
             values = [x.original_value if hasattr(
                 x, 'original_value') else x for x in values]
@@ -670,7 +717,16 @@ class DataCapturePanel(wx.Panel):
             if exporting:
                 with buf_lock:
                     flush()
-                    export_file.close()
+
+                    if export_format == 'Binary':
+                        export_capture.close()
+                    else:
+                        export_file.close()
+
+                try:
+                    dlg.profiler.save(profile_path)
+                except IOError as e:
+                    log.warning('Could not save the profile of the sweep: {0!r}'.format(e))
 
             for name in measurement_resource_names:
                 wx.CallAfter(pub.sendMessage, 'data_capture.stop', name=name)
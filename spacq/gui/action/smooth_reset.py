@@ -2,6 +2,8 @@ from functools import partial
 from threading import Thread
 import wx
 
+from spacq.interface.ramp import Ramp
+from spacq.iteration.pool import DevicePool
 from spacq.iteration.variables import OutputVariable
 from spacq.tool.box import sift
 
@@ -94,8 +96,12 @@ class SmoothResetPanel(wx.Panel):
             MessageDialog(self, str(e), 'Error writing to resource').Show()
 
         def sweep_all_vars():
+            # Writes to different devices are made in parallel.
+            pool = DevicePool(self.global_store.resources[var.resource_name] for var in vars)
+
             try:
-                thrs = []
+                # Step all the resources together.
+                ramp = Ramp(run_tasks=pool.run)
                 for var in vars:
                     resource = self.global_store.resources[var.resource_name]
 
@@ -107,16 +113,13 @@ class SmoothResetPanel(wx.Panel):
                         value_from, value_to = resource.value, var.with_type(
                             var.const)
 
-                    thr = Thread(target=resource.sweep, args=(value_from, value_to, self.reset_steps_input.Value), kwargs={
-                                 'exception_callback': partial(wx.CallAfter, exception_callback)})
-                    thr.daemon = True
-                    thrs.append(thr)
+                    ramp.add(resource, value_from, value_to, self.reset_steps_input.Value, name=var.resource_name,
+                             exception_callback=partial(wx.CallAfter, exception_callback))
 
-                for thr in thrs:
-                    thr.start()
-                for thr in thrs:
-                    thr.join()
+                ramp.run()
             finally:
+                pool.close()
+
                 if self:
                     wx.CallAfter(self.to_button.Enable)
                     wx.CallAfter(self.from_button.Enable)
@@ -1,7 +1,7 @@
 import wx
 from wx.lib.masked.ipaddrctrl import IpAddrCtrl
 
-from spacq.devices.config import device_tree, ConnectionError, DeviceConfig
+from spacq.devices.config import driver_registry, ConnectionError, DeviceConfig
 
 from ...tool.box import load_pickled, save_pickled, Dialog, MessageDialog
 from .resource_tree import DeviceResourcesPanel
@@ -22,8 +22,8 @@ class DeviceConfigPanel(wx.Panel):
 		self.connection_callback = connection_callback
 
 		# Implementation info.
-		## Find all the available devices.
-		self.device_tree = device_tree()
+		## Find all the available devices, without loading their drivers.
+		self.device_tree = driver_registry()
 		self.manufacturers = [''] + sorted(self.device_tree.keys())
 		self.models = ['']
 
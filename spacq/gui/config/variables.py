@@ -1,6 +1,6 @@
 import wx
 
-from numpy import array
+from spacq.interface.columns import ColumnStore
 from spacq.interface.units import Quantity
 from spacq.iteration.variables import OutputVariable, LinSpaceConfig, ArbitraryConfig
 from spacq.iteration.variables import ConditionVariable, Condition
@@ -184,7 +184,7 @@ class FileConfigPanel(wx.Panel):
 
         # Ensure the values are sane, because types is only determined off first entries.
         try:
-            self.values_input = [float(x) for x in rows[:, resultIndex]]
+            self.values_input = [float(x) for x in rows.column(resultIndex)]
         except ValueError as e:
             # not really working
             MessageDialog(self.parent, str(
@@ -213,9 +213,9 @@ class FileConfigPanel(wx.Panel):
         # If has_header is True, the first row becomes column names
 
         if has_header:
-            headers, rows = values[0], array(values[1:])
+            headers, rows = values[0], values[1:]
         else:
-            headers, rows = [''] * len(values[0]), array(values)
+            headers, rows = [''] * len(values[0]), values
         # Ensure that all columns have a header.
         for i, header in enumerate(headers):
             if not header:
@@ -228,7 +228,7 @@ class FileConfigPanel(wx.Panel):
         self.variable_list.Set(self.column_names)
 
         # put header names and data in the self.table for VirtualListCtrl
-        self.table.SetValue(headers, rows)
+        self.table.SetValue(headers, ColumnStore.from_rows(headers, rows))
     ###############################################
 
     # Regular Get and Set that finally set variables
@@ -9,7 +9,6 @@ from time import localtime
 import wx
 from wx.lib.agw import floatspin
 
-from spacq.interface.resources import AcquisitionThread
 from spacq.interface.units import Quantity
 
 from ....config.measurement import MeasurementConfigPanel
@@ -186,12 +185,10 @@ class ListLiveViewPanel(wx.Panel):
 
 		self.SetSizer(display_box)
 
-		# Acquisition thread.
+		# Acquisition, shared with anything else watching the same resource.
 		callback = functools.partial(wx.CallAfter, self.add_values)
-		self.acq_thread = AcquisitionThread(self.plot_settings.delay, callback,
-				running_lock=self.running_lock)
-		self.acq_thread.daemon = True
-		self.acq_thread.start()
+		self.acq_subscription = self.global_store.acquisition_hub.subscribe(self.plot_settings.delay,
+				callback, running_lock=self.running_lock)
 
 		# Wait for a resource to begin capturing.
 		self.OnPause()
@@ -210,7 +207,7 @@ class ListLiveViewPanel(wx.Panel):
 
 	@property
 	def resource(self):
-		return self.acq_thread.resource
+		return self.acq_subscription.resource
 
 	@resource.setter
 	def resource(self, value):
@@ -225,7 +222,7 @@ class ListLiveViewPanel(wx.Panel):
 		else:
 			running = False
 
-		self.acq_thread.resource = value
+		self.acq_subscription.resource = value
 
 		self.run_button.Enable(value is not None)
 
@@ -310,13 +307,9 @@ class ListLiveViewPanel(wx.Panel):
 		pub.unsubscribe(self.msg_data_capture_data, 'data_capture.data')
 		pub.unsubscribe(self.msg_data_capture_stop, 'data_capture.stop')
 
-		# Ensure the thread exits.
-		self.acq_thread.resource = None
-		self.acq_thread.done = True
-		if not self.running:
-			self.running_lock.release()
-		self.acq_thread.join()
-		del self.acq_thread
+		# Stop acquiring.
+		self.acq_subscription.close()
+		del self.acq_subscription
 
 	def onSave(self, evt=None):
 		"""
@@ -334,12 +327,12 @@ class ListLiveViewPanel(wx.Panel):
 
 	def OnRun(self, evt=None):
 		"""
-		Let the acquisition thread run.
+		Let the acquisition run.
 		"""
 
 		self.run_button.Disable()
 
-		if self.acq_thread.resource is None:
+		if self.acq_subscription.resource is None:
 			return
 
 		self.running_lock.release()
@@ -348,7 +341,7 @@ class ListLiveViewPanel(wx.Panel):
 
 	def OnPause(self, evt=None):
 		"""
-		Block the acquisition thread.
+		Block the acquisition.
 		"""
 
 		if not self.running:
@@ -356,7 +349,7 @@ class ListLiveViewPanel(wx.Panel):
 
 		self.running_lock.acquire()
 
-		if self.acq_thread.resource is not None:
+		if self.acq_subscription.resource is not None:
 			self.run_button.Enable()
 		self.pause_button.Disable()
 
@@ -2,7 +2,7 @@ from ....tool.box import Dialog, MessageDialog
 from ....config.measurement import MeasurementConfigPanel
 import wx
 from pubsub import pub
-import numpy
+from spacq.tool.box import RingBuffer
 import logging
 log = logging.getLogger(__name__)
 
@@ -96,6 +96,9 @@ class ListLiveViewPanel(wx.Panel):
     A panel to display a live view plot of a list resource.
     """
 
+    # Minimum time between redraws, in ms.
+    redraw_interval = 100
+
     def __init__(self, parent, global_store, *args, **kwargs):
         wx.Panel.__init__(self, parent, *args, **kwargs)
 
@@ -152,6 +155,11 @@ class ListLiveViewPanel(wx.Panel):
 
         self.SetSizer(display_box)
 
+        # Redraw at most once per interval, no matter how quickly lines arrive.
+        self.redraw_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.OnRedrawTimer, self.redraw_timer)
+        self.redraw_timer.Start(self.redraw_interval)
+
         # Subscriptions.
         pub.subscribe(self.msg_data_capture_start, 'data_capture.start')
         pub.subscribe(self.msg_data_capture_data, 'data_capture.data')
@@ -181,20 +189,27 @@ class ListLiveViewPanel(wx.Panel):
         Clear captured values.
         """
 
-        self._lines = None
+        # The width of the lines is set by the first one.
+        self._lines = RingBuffer(self.plot_settings.num_lines, 0)
         self.time_range = (0.0, 0.0)
 
+        # Whether there are new lines which have not been drawn.
+        self.dirty = False
+
     def update_plot(self):
         """
         Redraw the plot.
         """
 
+        self.dirty = False
+
         # Wait for at least one line.
-        if self._lines is None:
+        if len(self._lines) == 0:
             self.plot.surface_data = None
         else:
+            # The plot keeps the data, so it must not change underneath it.
             self.plot.surface_data = (
-                self._lines, self.time_range, (1, len(self._lines)))
+                self._lines.data.copy(), self.time_range, (1, len(self._lines)))
 
         wx.CallAfter(self.plot.redraw)
 
@@ -211,10 +226,10 @@ class ListLiveViewPanel(wx.Panel):
         time_range = min(times), max(times)
 
         # Sanity check, since the new values must match existing ones.
-        if self._lines is not None:
-            if len(self._lines[-1]) != len(values):
+        if len(self._lines) > 0:
+            if self._lines.width != len(values):
                 log.warning('Data length mismatch: was {0}, became {1}'.format(
-                    len(self._lines[-1]), len(values)))
+                    self._lines.width, len(values)))
                 self.init_values()
             elif self.time_range != time_range:
                 log.warning('Time range mismatch: was {0}, became {1}'.format(
@@ -222,18 +237,16 @@ class ListLiveViewPanel(wx.Panel):
                 self.init_values()
 
         # Update values.
-        if self._lines is None:
-            self._lines = numpy.array([values])
+        if len(self._lines) == 0:
             self.time_range = time_range
-        else:
-            self._lines = numpy.append(self._lines, [values], 0)
+        self._lines.append(values)
 
-        cut_idx = len(self._lines) - self.plot_settings.num_lines
-        if cut_idx > 0:
-            self._lines = self._lines[cut_idx:]
+        # Plot on the next tick of the redraw timer.
+        self.dirty = True
 
-        # Plot.
-        self.update_plot()
+    def OnRedrawTimer(self, evt=None):
+        if self.dirty:
+            self.update_plot()
 
     def close(self):
         """
@@ -245,6 +258,8 @@ class ListLiveViewPanel(wx.Panel):
         pub.unsubscribe(self.msg_data_capture_data, 'data_capture.data')
         pub.unsubscribe(self.msg_data_capture_stop, 'data_capture.stop')
 
+        self.redraw_timer.Stop()
+
     def OnReset(self, evt=None):
         self.init_values()
         self.update_plot()
@@ -256,6 +271,7 @@ class ListLiveViewPanel(wx.Panel):
 
         def ok_callback(dlg):
             self.plot_settings = dlg.GetValue()
+            self._lines.resize(self.plot_settings.num_lines)
 
         dlg = PlotSettingsDialog(self, ok_callback)
         dlg.SetValue(self.plot_settings)
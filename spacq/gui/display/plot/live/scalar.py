@@ -10,8 +10,8 @@ import time
 import wx
 from wx.lib.agw import floatspin
 
-from spacq.interface.resources import AcquisitionThread
 from spacq.interface.units import Quantity
+from spacq.tool.box import RingBuffer
 
 from ....config.measurement import MeasurementConfigPanel
 from ....tool.box import Dialog, MessageDialog
@@ -194,6 +194,9 @@ class ScalarLiveViewPanel(wx.Panel):
 	A panel to display a live view plot of a scalar resource.
 	"""
 
+	# Minimum time between redraws, in ms.
+	redraw_interval = 100
+
 	def __init__(self, parent, global_store, *args, **kwargs):
 		wx.Panel.__init__(self, parent, *args, **kwargs)
 
@@ -269,12 +272,15 @@ class ScalarLiveViewPanel(wx.Panel):
 
 		self.SetSizer(display_box)
 
-		# Acquisition thread.
+		# Redraw at most once per interval, no matter how quickly values arrive.
+		self.redraw_timer = wx.Timer(self)
+		self.Bind(wx.EVT_TIMER, self.OnRedrawTimer, self.redraw_timer)
+		self.redraw_timer.Start(self.redraw_interval)
+
+		# Acquisition, shared with anything else watching the same resource.
 		callback = functools.partial(wx.CallAfter, self.add_value)
-		self.acq_thread = AcquisitionThread(self.plot_settings.delay, callback,
-				running_lock=self.running_lock)
-		self.acq_thread.daemon = True
-		self.acq_thread.start()
+		self.acq_subscription = self.global_store.acquisition_hub.subscribe(self.plot_settings.delay,
+				callback, running_lock=self.running_lock)
 
 		# Wait for a resource to begin capturing.
 		self.OnPause()
@@ -293,7 +299,7 @@ class ScalarLiveViewPanel(wx.Panel):
 
 	@property
 	def resource(self):
-		return self.acq_thread.resource
+		return self.acq_subscription.resource
 
 	@resource.setter
 	def resource(self, value):
@@ -308,7 +314,7 @@ class ScalarLiveViewPanel(wx.Panel):
 		else:
 			running = False
 
-		self.acq_thread.resource = value
+		self.acq_subscription.resource = value
 
 		self.run_button.Enable(value is not None)
 
@@ -340,42 +346,47 @@ class ScalarLiveViewPanel(wx.Panel):
 		Clear captured values.
 		"""
 
-		self._points = numpy.array([])
-		self._times = numpy.array([])
-		self._values = numpy.array([])
+		# Rows of (time, value).
+		self._samples = RingBuffer(self.plot_settings.num_points, 2)
+		# The total number of values, including discarded ones.
+		self._num_samples = 0
 
 		self.current_value = None
 
 		self.start_time = None
 
+		# Whether there are new values which have not been drawn.
+		self.dirty = False
+
 	def update_plot(self):
 		"""
 		Redraw the plot.
 		"""
 
-		if not len(self._points) > 0:
+		self.dirty = False
+
+		if not len(self._samples) > 0:
 			display_time = [0]
 			display_values = [0]
 		else:
+			times, values = self._samples.data.T
+
 			if self.plot_settings.time_value == 0: # Time.
-				display_time = self._times
+				display_time = times
 
 				if self.plot_settings.time_mode == 0: # Relative.
 					# Calculate the number of seconds passed since each point.
-					max_time = self._times[-1]
-					display_time = [x - max_time for x in display_time]
+					display_time = times - times[-1]
 				elif self.plot_settings.time_mode == 1: # Absolute.
-					display_time = [x - self.start_time for x in display_time]
+					display_time = times - self.start_time
 			elif self.plot_settings.time_value == 1: # Points.
-				display_time = self._points
+				display_time = numpy.arange(self._num_samples - len(self._samples), self._num_samples)
 
 				if self.plot_settings.time_mode == 0: # Relative.
 					# Calculate the number of seconds passed since each point.
-					max_point = self._points[-1]
-					display_time = [x - max_point for x in display_time]
+					display_time = display_time - display_time[-1]
 
-			display_values = [x * 10 ** (self.plot_settings.y_scale + self.unit_conversion) for
-					x in self._values]
+			display_values = values * 10 ** (self.plot_settings.y_scale + self.unit_conversion)
 
 		if self.plot_settings.update_x:
 			self.plot.x_autoscale()
@@ -402,25 +413,27 @@ class ScalarLiveViewPanel(wx.Panel):
 			pass
 
 		# Update values.
-		try:
-			self._points = numpy.append(self._points, self._points[-1] + 1)
-		except IndexError:
-			self._points = numpy.append(self._points, 0)
 		cur_time = time.time()
-		self._times = numpy.append(self._times, cur_time)
-		self._values = numpy.append(self._values, value)
+		self._samples.append((cur_time, value))
+		self._num_samples += 1
 
 		if self.start_time is None:
 			self.start_time = cur_time
 
-		cut_idx = len(self._points) - int(self.plot_settings.num_points)
-		if cut_idx > 0:
-			self._points = self._points[cut_idx:]
-			self._times = self._times[cut_idx:]
-			self._values = self._values[cut_idx:]
+		self.current_value = value * 10 ** (self.plot_settings.y_scale + self.unit_conversion)
+
+		# Plot on the next tick of the redraw timer.
+		self.dirty = True
+
+	def OnRedrawTimer(self, evt=None):
+		"""
+		Show any new values.
+		"""
+
+		if not self.dirty:
+			return
 
 		# Set number display.
-		self.current_value = value * 10 ** (self.plot_settings.y_scale + self.unit_conversion)
 		self.numeric_display.Value = '{0:.6g}'.format(self.current_value)
 
 		# Plot.
@@ -438,22 +451,20 @@ class ScalarLiveViewPanel(wx.Panel):
 		pub.unsubscribe(self.msg_data_capture_data, 'data_capture.data')
 		pub.unsubscribe(self.msg_data_capture_stop, 'data_capture.stop')
 
-		# Ensure the thread exits.
-		self.acq_thread.resource = None
-		self.acq_thread.done = True
-		if not self.running:
-			self.running_lock.release()
-		self.acq_thread.join()
-		del self.acq_thread
+		self.redraw_timer.Stop()
+
+		# Stop acquiring.
+		self.acq_subscription.close()
+		del self.acq_subscription
 
 	def OnRun(self, evt=None):
 		"""
-		Let the acquisition thread run.
+		Let the acquisition run.
 		"""
 
 		self.run_button.Disable()
 
-		if self.acq_thread.resource is None:
+		if self.acq_subscription.resource is None:
 			return
 
 		self.running_lock.release()
@@ -462,7 +473,7 @@ class ScalarLiveViewPanel(wx.Panel):
 
 	def OnPause(self, evt=None):
 		"""
-		Block the acquisition thread.
+		Block the acquisition.
 		"""
 
 		if not self.running:
@@ -470,7 +481,7 @@ class ScalarLiveViewPanel(wx.Panel):
 
 		self.running_lock.acquire()
 
-		if self.acq_thread.resource is not None:
+		if self.acq_subscription.resource is not None:
 			self.run_button.Enable()
 		self.pause_button.Disable()
 
@@ -485,6 +496,7 @@ class ScalarLiveViewPanel(wx.Panel):
 
 		def ok_callback(dlg):
 			self.plot_settings = dlg.GetValue()
+			self._samples.resize(self.plot_settings.num_points)
 
 			if self.plot_settings.units_from and self.plot_settings.units_to:
 				try:
@@ -499,7 +511,7 @@ class ScalarLiveViewPanel(wx.Panel):
 			else:
 				self.unit_conversion = 0
 
-			self.acq_thread.delay = self.plot_settings.delay
+			self.acq_subscription.delay = self.plot_settings.delay
 
 			if self.plot_settings.time_value == 0:
 				self.plot.x_label = 'Time (s)'
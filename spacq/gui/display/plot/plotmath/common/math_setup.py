@@ -1,5 +1,7 @@
 import wx
 
+from spacq.tool.plotmath import methods
+
 from .....tool.box import Dialog
 
 class AxisSelectionPanel(wx.Panel):
@@ -53,6 +55,7 @@ class MathSetupDialog_Derivative(Dialog):
 		self.axes = [None for _ in axis_names]
 		
 		self.step_size = 1
+		self.method = methods[0]
 
 		# Dialog.
 		dialog_box = wx.BoxSizer(wx.VERTICAL)
@@ -75,6 +78,17 @@ class MathSetupDialog_Derivative(Dialog):
 		self.Bind(wx.EVT_SCROLL, self.OnSliderScroll, self.step_slider)
 		slider_box.Add(self.step_slider)
 
+		# Difference method.
+		method_box = wx.BoxSizer(wx.HORIZONTAL)
+		dialog_box.Add(method_box, flag=wx.CENTER)
+
+		method_box.Add(wx.StaticText(self, label='Differences:'), flag=wx.ALIGN_CENTER_VERTICAL)
+
+		self.method_input = wx.Choice(self, choices=methods)
+		self.method_input.StringSelection = self.method
+		self.Bind(wx.EVT_CHOICE, self.OnMethod, self.method_input)
+		method_box.Add(self.method_input)
+
 		## End buttons.
 		button_box = wx.BoxSizer(wx.HORIZONTAL)
 		dialog_box.Add(button_box, flag=wx.CENTER)
@@ -99,8 +113,15 @@ class MathSetupDialog_Derivative(Dialog):
 
 		self.reading.SetLabel(str(self.step_size))
 
+	def OnMethod(self, evt=None):
+		self.method = self.method_input.StringSelection
+
 	def OnOk(self, evt=None):
-		title, d_data = self.calculate()
+		result = self.calculate()
+		if result is None:
+			return
+
+		title, d_data = result
 		self.dheading = title
 		self.ddata = d_data
 		self.Destroy()
@@ -153,7 +174,11 @@ class MathSetupDialog_Function(Dialog):
 		self.ok_button.Enable(all(axis is not None for axis in self.axes))
 
 	def OnOk(self, evt=None):
-		title, d_data = self.calculate()
+		result = self.calculate()
+		if result is None:
+			return
+
+		title, d_data = result
 		self.dheading = title
 		self.ddata = d_data
 		self.Destroy()
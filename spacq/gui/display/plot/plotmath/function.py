@@ -1,8 +1,18 @@
-import wx
+from numpy import asarray, broadcast_to
+
+from spacq.interface.expression import Expression
 
 from ....tool.box import MessageDialog
 from .common.math_setup import MathSetupDialog_Function
-from numpy import *
+
+def evaluate(text, names, columns):
+	"""
+	Evaluate the function text of the named columns, as a column.
+	"""
+
+	result = asarray(Expression(text, names)(**dict(zip(names, columns))), dtype=float)
+
+	return broadcast_to(result, columns[0].shape)
 
 class FunctionMathSetupDialog(MathSetupDialog_Function):
 
@@ -16,19 +26,16 @@ class FunctionMathSetupDialog(MathSetupDialog_Function):
 		self.headings = headings
 		self.data = data
 
-
-		def calculate(self):
-			try:
-				y_data = [self.data[:,x].astype(float) for x in self.axes]
-				y_name = [self.headings[x] for x in self.axes]
-			except ValueError as e:
-				MessageDialog(self, str(e), 'Invalid value').Show()
-				return
+	def calculate(self):
+		try:
+			y_data = [self.data.column(x) for x in self.axes]
+			y_name = [self.headings[x] for x in self.axes]
+			d_data = evaluate(self.function_input.Value, ['X'], y_data)
+		except ValueError as e:
+			MessageDialog(self, str(e), 'Invalid value').Show()
+			return
 
 		title = 'y = {0}'.format(self.function_input.Value.replace('X',y_name[0]))
-		y_data = y_data[0]
-		d_data = eval(self.function_input.Value.replace('X','y_data'))
-		d_data = d_data.reshape(d_data.size,1)
 		return(title,d_data)
 
 
@@ -44,20 +51,14 @@ class FunctionMathSetupDialog2arg(MathSetupDialog_Function):
 		self.headings = headings
 		self.data = data
 
-
-		def calculate(self):
-			try:
-				f_data = [self.data[:,x].astype(float) for x in self.axes]
-				y_name = [self.headings[x] for x in self.axes]
-			except ValueError as e:
-					MessageDialog(self, str(e), 'Invalid value').Show()
-					return
+	def calculate(self):
+		try:
+			f_data = [self.data.column(x) for x in self.axes]
+			y_name = [self.headings[x] for x in self.axes]
+			d_data = evaluate(self.function_input.Value, ['X', 'Y'], f_data)
+		except ValueError as e:
+			MessageDialog(self, str(e), 'Invalid value').Show()
+			return
 
 		title = 'z = {0}'.format(self.function_input.Value.replace('X',y_name[0]).replace('Y',y_name[1]))
-		x_data = f_data[0]
-		y_data = f_data[1]
-		d_data = eval(self.function_input.Value.replace('X','x_data').replace('Y','y_data'))
-		d_data = d_data.reshape(d_data.size,1)
 		return(title,d_data)
-
-
@@ -103,7 +103,7 @@ class ColormappedPlotSetupDialog(PlotSetupDialog):
 
 	def make_plot(self):
 		try:
-			x_data, y_data, z_data = [self.data[:,axis].astype(float) for axis in self.axes]
+			x_data, y_data, z_data = [self.data.column(axis) for axis in self.axes]
 		except ValueError as e:
 			MessageDialog(self, str(e), 'Invalid value').Show()
 			return
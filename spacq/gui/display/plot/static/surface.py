@@ -61,7 +61,7 @@ class SurfacePlotSetupDialog(PlotSetupDialog):
 
 	def make_plot(self):
 		try:
-			x_data, y_data, z_data = [self.data[:,axis].astype(float) for axis in self.axes]
+			x_data, y_data, z_data = [self.data.column(axis) for axis in self.axes]
 		except ValueError as e:
 			MessageDialog(self, str(e), 'Invalid value').Show()
 			return
@@ -96,12 +96,12 @@ class WaveformsPlotSetupDialog(PlotSetupDialog):
 		lp = ListParser()
 
 		try:
-			surface_data = array([[x[1] for x in lp(row)] for row in self.data[:,axis]])
+			surface_data = array([[x[1] for x in lp(row)] for row in self.data.column(axis)])
 		except ValueError as e:
 			MessageDialog(self, str(e), 'Invalid value').Show()
 			return
 
-		x_axis = [x[0] for x in lp(self.data[:,axis][0])]
+		x_axis = [x[0] for x in lp(self.data.column(axis)[0])]
 		x_bounds = (x_axis[0], x_axis[-1])
 
 		x_label, y_label, z_label = 'Waveform (s)', 'History', self.headings[axis]
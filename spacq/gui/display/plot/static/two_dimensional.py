@@ -48,7 +48,7 @@ class TwoDimensionalPlotSetupDialog(PlotSetupDialog):
 
 	def make_plot(self):
 		try:
-			x_data, y_data = [self.data[:,axis].astype(float) for axis in self.axes]
+			x_data, y_data = [self.data.column(axis) for axis in self.axes]
 		except ValueError as e:
 			MessageDialog(self, str(e), 'Invalid value').Show()
 			return
@@ -1,6 +1,8 @@
 from functools import partial
 import wx
 
+from spacq.interface.filters import ColumnFilter
+
 from ...tool.box import Dialog, MessageDialog
 
 """
@@ -115,20 +117,7 @@ class FilterListDialog(Dialog):
         Create a filter out of text.
         """
 
-        col_idx = self.table.headings.index(col)
-
-        return lambda i, x: eval(f_text.replace('#', 'float(x[{0}])'.format(col_idx)))
-
-    @property
-    def meta_filter(self):
-        """
-        Create a meta-filter out of all the filters.
-        """
-
-        filters = [self.create_filter(f, col) for f, col in
-                   zip(list(self.filters.values()), list(self.filter_columns.values()))]
-
-        return lambda i, x: all([f(i, x) for f in filters])
+        return ColumnFilter(f_text, self.table.headings.index(col))
 
     def edit_ok_callback(self, dlg, selection=None):
         col, f = dlg.GetValue()
@@ -147,13 +136,12 @@ class FilterListDialog(Dialog):
         f_function = self.create_filter(f, col)
 
         try:
-            self.table.apply_filter(f_function)
+            self.table.apply_filter(name, f_function)
         except Exception as e:
             raise ValueError(e)
 
         if selection is not None:
             self.OnRemoveFilter(selection=selection)
-            self.table.apply_filter(f_function)
 
         self.filters[name] = f
         self.filter_columns[name] = col
@@ -194,7 +182,7 @@ class FilterListDialog(Dialog):
         self.filter_list.Items = [
             x for x in self.filter_list.Items if x != selection]
 
-        self.table.apply_filter(self.meta_filter, afresh=True)
+        self.table.remove_filter(selection)
 
     def OnClose(self, evt):
         self.close_callback(self)
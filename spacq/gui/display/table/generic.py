@@ -1,8 +1,8 @@
-from numpy import array, compress, zeros
 import wx
 from wx.lib.mixins.listctrl import ListCtrlAutoWidthMixin
 
-from spacq.interface.list_columns import ListParser
+from spacq.interface.columns import ColumnStore
+from spacq.interface.filters import FilterStack
 
 
 """
@@ -17,30 +17,6 @@ class VirtualListCtrl(wx.ListCtrl, ListCtrlAutoWidthMixin):
 
 	max_value_len = 10 # Characters.
 
-	@staticmethod
-	def find_type(value):
-		"""
-		Determine the type of a column based on a single value.
-
-		The type is one of: scalar, list, string.
-		"""
-
-		try:
-			float(value)
-		except ValueError:
-			pass
-		else:
-			return 'scalar'
-
-		try:
-			ListParser()(value)
-		except ValueError:
-			pass
-		else:
-			return 'list'
-
-		return 'string'
-
 	def __init__(self, parent, *args, **kwargs):
 		wx.ListCtrl.__init__(self, parent,
 				style=wx.LC_REPORT|wx.LC_VIRTUAL|wx.LC_HRULES|wx.LC_VRULES,
@@ -52,44 +28,44 @@ class VirtualListCtrl(wx.ListCtrl, ListCtrlAutoWidthMixin):
 
 	def reset(self):
 		self.headings = []
-		self.data = array([])
+		self.data = ColumnStore([], [], [])
+		self.filters = FilterStack(self.data)
 		self.filtered_data = None
-		self.display_data = array([])
 
 		self.types = []
 
-	def refresh_with_values(self, data):
-		self.ItemCount = len(data)
+	@property
+	def current_data(self):
+		"""
+		The data as displayed, after any filters.
+		"""
 
-		if self.ItemCount > 0:
-			self.display_data = zeros(data.shape, dtype='|S{0}'.format(self.max_value_len))
+		if self.filtered_data is not None:
+			return self.filtered_data
+		else:
+			return self.data
 
-			for i, _ in enumerate(self.headings):
-				# Truncate for display.
-				self.display_data[:,i] = [str(x)[:self.max_value_len] for x in data[:,i]]
+	def refresh_with_values(self, data):
+		# Cells are formatted only as they are displayed.
+		self.ItemCount = len(data)
 
 		self.Refresh()
 
-	def apply_filter(self, f, afresh=False):
+	def apply_filter(self, name, f):
 		"""
-		Set the data to be the old data, along with the application of a filter.
-
-		f is a function of two parameters: the index of the row and the row itself.
-		f must return True if the row is to be kept and False otherwise.
+		Filter the data, adding the named filter or replacing one of the same name.
 
-		If afresh is True, all old filtered data is discarded.
-		Otherwise, a new filter can be quickly applied.
+		f is a function of a ColumnStore, which returns a boolean mask of the rows to keep.
 		"""
 
-		if afresh:
-			self.filtered_data = None
+		self.filters.set(name, f)
+		self.filtered_data = self.filters.filtered()
 
-		if self.filtered_data is not None:
-			original_set = self.filtered_data
-		else:
-			original_set = self.data
+		self.refresh_with_values(self.filtered_data)
 
-		self.filtered_data = compress([f(i, x) for i, x in enumerate(original_set)], original_set, axis=0)
+	def remove_filter(self, name):
+		self.filters.remove(name)
+		self.filtered_data = self.filters.filtered()
 
 		self.refresh_with_values(self.filtered_data)
 
@@ -103,24 +79,20 @@ class VirtualListCtrl(wx.ListCtrl, ListCtrlAutoWidthMixin):
 		# Find column indices of the correct type.
 		idxs = [i for i, t in enumerate(self.types) if t in types]
 
-		if self.filtered_data is not None:
-			data = self.filtered_data
-		else:
-			data = self.data
-
-		return ([self.headings[i] for i in idxs], data[:,idxs], [self.types[i] for i in idxs])
+		return ([self.headings[i] for i in idxs], self.current_data.select(idxs), [self.types[i] for i in idxs])
 
 	def SetValue(self, headings, data):
 		"""
 		headings: A list of strings.
-		data: A 2D NumPy array.
+		data: A ColumnStore, or a 2D NumPy array.
 		"""
 
 		self.ClearAll()
 		self.reset()
 
-		self.headings = headings
-		self.data = data
+		self.data = ColumnStore.from_array(headings, data)
+		self.filters = FilterStack(self.data)
+		self.headings = list(headings)
 
 		self.refresh_with_values(self.data)
 
@@ -132,15 +104,32 @@ class VirtualListCtrl(wx.ListCtrl, ListCtrlAutoWidthMixin):
 			for i, heading in enumerate(self.headings):
 				self.InsertColumn(i, heading, width=col_width)
 
-				type = self.find_type(data[0,i])
-				self.types.append(type)
+			self.types = list(self.data.types)
+
+	def update_data(self, data):
+		"""
+		Show more rows of the same columns, as they are loaded.
+
+		Any filters are discarded.
+		"""
+
+		if self.GetColumnCount() == 0:
+			self.SetValue(data.headings, data)
+			return
+
+		self.data = data
+		self.filters = FilterStack(self.data)
+		self.filtered_data = None
+		self.types = list(self.data.types)
+
+		self.refresh_with_values(self.data)
 
 	def OnGetItemText(self, item, col):
 		"""
 		Return cell value for LC_VIRTUAL.
 		"""
 
-		return self.display_data[item,col]
+		return self.current_data.format_cell(item, col, self.max_value_len)
 
 
 class TabularDisplayPanel(wx.Panel):
@@ -172,16 +161,28 @@ class TabularDisplayPanel(wx.Panel):
 		"""
 
 		if has_header:
-			headers, rows = values[0], array(values[1:])
+			headers, rows = values[0], values[1:]
 		else:
-			headers, rows = [''] * len(values[0]), array(values)
+			headers, rows = [''] * len(values[0]), values
 
-		# Ensure that all columns have a header.
-		for i, header in enumerate(headers):
-			if not header:
-				headers[i] = 'Column {0}'.format(i + 1)
+		headers = self.name_headings(headers)
+
+		# Each column is parsed once, here.
+		self.SetValue(headers, ColumnStore.from_rows(headers, rows))
+
+	def name_headings(self, headings):
+		"""
+		Ensure that all columns have a header.
+		"""
+
+		return [heading or 'Column {0}'.format(i + 1) for i, heading in enumerate(headings)]
+
+	def update_data(self, data):
+		"""
+		Show the rows loaded so far, from a TableLoader.
+		"""
 
-		self.SetValue(headers, rows)
+		self.table.update_data(ColumnStore(self.name_headings(data.headings), data.columns, data.types))
 
 	def GetValue(self, *args, **kwargs):
 		return self.table.GetValue(*args, **kwargs)
@@ -3,6 +3,7 @@ from threading import RLock
 from pubsub import pub
 import wx
 
+from spacq.interface.resources import AcquisitionHub
 from spacq.tool.box import PubDict
 
 """
@@ -25,3 +26,6 @@ class GlobalStore(object):
 		self.variables = PubDict(self.lock, send, 'variable')
 
 		self.pulse_program = None
+
+		# Periodic acquisition of resource values.
+		self.acquisition_hub = AcquisitionHub()
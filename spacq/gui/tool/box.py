@@ -3,6 +3,8 @@ from os.path import basename
 import pickle
 import wx
 
+from spacq.interface import capture
+
 
 OK_BACKGROUND_COLOR = 'PALE GREEN'
 
@@ -75,24 +77,48 @@ def save_pickled(parent, values, extension=None, file_type=None):
 				raise IOError('Could not save data.', e)
 
 
-def load_csv(parent, extension='csv', file_type='CSV'):
+def choose_csv_path(parent, extension='csv', file_type='CSV'):
 	"""
-	Load data from a CSV file based on a file dialog.
+	Ask for a CSV or binary capture file to load.
 
-	ZParrott: has_header functions partially in that it removes a blank first
-	row, but hte has_header boolean then fails in subsequent dependicies where
-	it has meaning of having a column title or not.
+	Returns the path, or None if the dialog is cancelled.
 	"""
 
 	wildcard = determine_wildcard(extension, file_type)
+	# Offer capture files just before "All files".
+	capture_wildcard = determine_wildcard(capture.extension, capture.file_type)
+	wildcard = wildcard[:-len('All files|*')] + capture_wildcard
+
 	dlg = wx.FileDialog(parent=parent, message='Load...', wildcard=wildcard,
 			style=wx.FD_OPEN)
 
 	if dlg.ShowModal() == wx.ID_OK:
-		path = dlg.GetPath()
+		return dlg.GetPath()
+
+
+def load_csv(parent, extension='csv', file_type='CSV'):
+	"""
+	Load data from a CSV file based on a file dialog.
 
+	ZParrott: has_header functions partially in that it removes a blank first
+	row, but hte has_header boolean then fails in subsequent dependicies where
+	it has meaning of having a column title or not.
+
+	Binary capture files are also accepted, and are converted to the same form.
+	"""
+
+	path = choose_csv_path(parent, extension, file_type)
+
+	if path is not None:
 		filename = basename(path)
 
+		if path.endswith('.' + capture.extension):
+			try:
+				return (True, list(capture.capture_to_rows(path)), filename)
+			except Exception as e:
+				# Wrap all problems.
+				raise IOError('Could not load data.', e)
+
 		with open(path, 'r') as f:
 			try:
 				result = list(csv.reader(f))
@@ -0,0 +1,392 @@
+import csv
+import json
+from numbers import Number
+import numpy
+from numpy.lib import format as npy_format
+
+from .list_columns import format_list
+
+
+"""
+Columnar binary capture files.
+
+A capture file is a sequence of .npy records. The first record is a 0-d string array containing a JSON header;
+every following record is a block of rows. Scalar columns are stored together as a single float64 array per block,
+and any list-valued columns are stored immediately after it as a fixed-width string array, each value in the same
+text as it would have in a CSV file. No record is ever pickled, so that reading a capture file cannot run any code.
+
+If a scalar column later receives a value which is not a number, the column is stored with the list-valued columns
+from then on; a 0-d string array with the new layout, as JSON, precedes the blocks which use it.
+"""
+
+
+extension = 'spacq'
+file_type = 'Capture'
+
+format_version = 3
+
+
+def is_scalar(value):
+	"""
+	Whether the value fits in a float64 column.
+	"""
+
+	return isinstance(value, (Number, numpy.number, numpy.bool_)) and not isinstance(value, complex)
+
+
+class CaptureWriter(object):
+	"""
+	Append rows to a capture file in large preallocated blocks.
+	"""
+
+	def __init__(self, path, headings, units=None, metadata=None, block_size=4096):
+		"""
+		path: Location of the file to create.
+		headings: Display name of each column, as it would appear in a CSV header.
+		units: Units of each column, or None for unitless columns.
+		metadata: Additional JSON-serializable information about the capture.
+		block_size: Number of rows to buffer before writing a block.
+		"""
+
+		if units is None:
+			units = [None] * len(headings)
+
+		if len(units) != len(headings):
+			raise ValueError('Expected {0} units, not {1}'.format(len(headings), len(units)))
+
+		self.path = path
+		self.headings = list(headings)
+		self.units = list(units)
+		self.metadata = metadata if metadata is not None else {}
+		self.block_size = block_size
+
+		self.file = open(self.path, 'wb')
+
+		# Determined from the first row.
+		self.scalar_columns = None
+		self.list_columns = None
+
+		self.scalar_buf = None
+		self.list_buf = None
+		self.buf_len = 0
+
+		self.num_rows = 0
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+		return False
+
+	def _write_header(self):
+		header = {
+			'version': format_version,
+			'headings': self.headings,
+			'units': self.units,
+			'scalar_columns': self.scalar_columns,
+			'list_columns': self.list_columns,
+			'metadata': self.metadata,
+		}
+
+		npy_format.write_array(self.file, numpy.array(json.dumps(header)))
+
+	def _allocate(self):
+		self.scalar_buf = numpy.empty((self.block_size, len(self.scalar_columns)), dtype=numpy.float64)
+		if self.list_columns:
+			# Holds the values as text, until they are written out together.
+			self.list_buf = numpy.empty((self.block_size, len(self.list_columns)), dtype=object)
+		else:
+			self.list_buf = None
+
+	def _start(self, row):
+		"""
+		Determine the column layout from the first row, and allocate the buffers.
+		"""
+
+		self.scalar_columns = [i for i, x in enumerate(row) if is_scalar(x)]
+		self.list_columns = [i for i, x in enumerate(row) if not is_scalar(x)]
+
+		self._write_header()
+		self._allocate()
+
+	def _relayout(self, row):
+		"""
+		Move the scalar columns which no longer hold numbers in this row to the list-valued columns.
+		"""
+
+		self.flush()
+
+		moved = [i for i in self.scalar_columns if not is_scalar(row[i])]
+
+		self.scalar_columns = [i for i in self.scalar_columns if i not in moved]
+		self.list_columns = sorted(self.list_columns + moved)
+
+		layout = {
+			'scalar_columns': self.scalar_columns,
+			'list_columns': self.list_columns,
+		}
+
+		npy_format.write_array(self.file, numpy.array(json.dumps(layout)))
+
+		self._allocate()
+
+	def write_row(self, row):
+		"""
+		Add a single row of values.
+		"""
+
+		if len(row) != len(self.headings):
+			raise ValueError('Expected {0} values, not {1}'.format(len(self.headings), len(row)))
+
+		if self.scalar_columns is None:
+			self._start(row)
+		elif not all(is_scalar(row[i]) for i in self.scalar_columns):
+			# Such as a status string, or None, in place of a reading.
+			self._relayout(row)
+
+		self.scalar_buf[self.buf_len] = [row[i] for i in self.scalar_columns]
+		if self.list_buf is not None:
+			for j, i in enumerate(self.list_columns):
+				self.list_buf[self.buf_len, j] = format_value(row[i])
+
+		self.buf_len += 1
+		self.num_rows += 1
+
+		if self.buf_len >= self.block_size:
+			self.flush()
+
+	def write_rows(self, rows):
+		for row in rows:
+			self.write_row(row)
+
+	def flush(self):
+		"""
+		Write out all buffered rows as a block.
+		"""
+
+		if not self.buf_len:
+			return
+
+		npy_format.write_array(self.file, self.scalar_buf[:self.buf_len])
+		if self.list_buf is not None:
+			npy_format.write_array(self.file, numpy.array(self.list_buf[:self.buf_len].tolist(), dtype=str),
+					allow_pickle=False)
+
+		self.buf_len = 0
+
+		self.file.flush()
+
+	def close(self):
+		if self.file.closed:
+			return
+
+		if self.scalar_columns is None:
+			# No rows at all; assume that every column is scalar.
+			self.scalar_columns = list(range(len(self.headings)))
+			self.list_columns = []
+			self._write_header()
+
+		self.flush()
+		self.file.close()
+
+
+def at_end(f):
+	pos = f.tell()
+	result = not f.read(1)
+	f.seek(pos)
+
+	return result
+
+
+def format_strings(values):
+	"""
+	Values from a block as a string column.
+	"""
+
+	if values.dtype.kind == 'U':
+		return values
+
+	return numpy.array([format_value(x) for x in values.tolist()], dtype=str)
+
+
+class CaptureReader(object):
+	"""
+	Read a capture file one block at a time.
+	"""
+
+	def __init__(self, path):
+		self.path = path
+
+		self.file = open(self.path, 'rb')
+
+		try:
+			self.header = self._read_header()
+		except Exception:
+			self.file.close()
+			raise
+
+		self.data_start = self.file.tell()
+
+		# Every layout seen so far, as (scalar columns, list columns).
+		self.layouts = [(self.header['scalar_columns'], self.header['list_columns'])]
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+		return False
+
+	def _read_header(self):
+		try:
+			header = json.loads(str(npy_format.read_array(self.file, allow_pickle=False)))
+		except ValueError as e:
+			raise ValueError('Not a capture file: {0}'.format(self.path), e)
+
+		if header['version'] > format_version:
+			raise ValueError('Unsupported capture file version: {0}'.format(header['version']))
+
+		return header
+
+	def close(self):
+		self.file.close()
+
+	def count_rows(self):
+		"""
+		The number of rows in the file, from the record headers alone.
+		"""
+
+		f = self.file
+		f.seek(self.data_start)
+
+		result = 0
+		while not at_end(f):
+			version = npy_format.read_magic(f)
+			if version == (1, 0):
+				shape, _, dtype = npy_format.read_array_header_1_0(f)
+			else:
+				shape, _, dtype = npy_format.read_array_header_2_0(f)
+
+			# Every block of rows has its scalar record, even without any scalar columns.
+			if dtype == numpy.float64:
+				result += shape[0]
+
+			size = dtype.itemsize
+			for x in shape:
+				size *= x
+			f.seek(size, 1)
+
+		f.seek(self.data_start)
+
+		return result
+
+	def blocks(self):
+		"""
+		Generate the blocks of rows, each as a list of columns.
+
+		Columns which are scalar in the block are float64 arrays; the others are string arrays.
+		"""
+
+		f = self.file
+		f.seek(self.data_start)
+
+		self.layouts = self.layouts[:1]
+		scalar_columns, list_columns = self.layouts[0]
+
+		while not at_end(f):
+			record = npy_format.read_array(f, allow_pickle=False)
+
+			if record.ndim == 0:
+				layout = json.loads(str(record))
+				scalar_columns, list_columns = layout['scalar_columns'], layout['list_columns']
+				self.layouts.append((scalar_columns, list_columns))
+
+				continue
+
+			if list_columns:
+				list_block = npy_format.read_array(f, allow_pickle=False)
+
+			columns = []
+			for i in range(len(self.header['headings'])):
+				if i in scalar_columns:
+					columns.append(record[:,scalar_columns.index(i)])
+				else:
+					columns.append(list_block[:,list_columns.index(i)])
+
+			yield columns
+
+
+def read_capture(path):
+	"""
+	Read an entire capture file.
+
+	The returned values are:
+		the header, as a dictionary
+		a list of columns, with scalar columns as float64 arrays and list columns as string arrays
+	"""
+
+	with CaptureReader(path) as reader:
+		header = reader.header
+		blocks = list(reader.blocks())
+		layouts = reader.layouts
+
+	num_columns = len(header['headings'])
+
+	# A column is scalar only if it was throughout.
+	scalar_columns = [i for i in range(num_columns) if all(i in x[0] for x in layouts)]
+	list_columns = [i for i in range(num_columns) if i not in scalar_columns]
+
+	header['scalar_columns'], header['list_columns'] = scalar_columns, list_columns
+
+	columns = []
+	for i in range(num_columns):
+		if i in scalar_columns:
+			pieces = [block[i] for block in blocks]
+		else:
+			pieces = [format_strings(block[i]) for block in blocks]
+
+		if pieces:
+			columns.append(numpy.concatenate(pieces))
+		elif i in scalar_columns:
+			columns.append(numpy.empty(0))
+		else:
+			columns.append(numpy.empty(0, dtype=str))
+
+	return header, columns
+
+
+def format_value(value):
+	"""
+	A single value as CSV text.
+	"""
+
+	if isinstance(value, (numpy.ndarray, list, tuple)):
+		return format_list(value)
+
+	return str(value)
+
+
+def capture_to_rows(path):
+	"""
+	Read a capture file into the same form as a CSV file: a header row followed by rows of strings.
+	"""
+
+	header, columns = read_capture(path)
+
+	yield list(header['headings'])
+
+	if columns:
+		for row in zip(*columns):
+			yield [format_value(x) for x in row]
+
+
+def capture_to_csv(path, csv_path):
+	"""
+	Convert a capture file to a CSV file.
+	"""
+
+	with open(csv_path, 'w') as f:
+		csv.writer(f, lineterminator='\n').writerows(capture_to_rows(path))
@@ -0,0 +1,199 @@
+from numpy import array, asarray, empty, issubdtype, number
+
+from .list_columns import ListParser
+
+"""
+Typed, column-oriented storage for tabular data.
+"""
+
+
+def find_type(value):
+	"""
+	Determine the type of a column based on a single value.
+
+	The type is one of: scalar, list, string.
+	"""
+
+	try:
+		float(value)
+	except ValueError:
+		pass
+	else:
+		return 'scalar'
+
+	try:
+		ListParser()(value)
+	except ValueError:
+		pass
+	else:
+		return 'list'
+
+	return 'string'
+
+
+class ColumnStore(object):
+	"""
+	A table kept as one array per column.
+
+	Scalar columns are parsed once into float64 arrays; list and string columns keep their original strings.
+
+	Indexing follows NumPy for the common cases: data[:,i] is a column, data[:,[i, j]] and data[rows] are tables.
+	"""
+
+	def __init__(self, headings, columns, types):
+		if not len(headings) == len(columns) == len(types):
+			raise ValueError('Mismatched number of headings, columns and types: {0}, {1}, {2}'.format(
+					len(headings), len(columns), len(types)))
+
+		lengths = set(len(column) for column in columns)
+		if len(lengths) > 1:
+			raise ValueError('Columns have different lengths: {0}'.format(sorted(lengths)))
+
+		self.headings = list(headings)
+		self.columns = list(columns)
+		self.types = list(types)
+
+	@staticmethod
+	def parse_column(values):
+		"""
+		Parse a column of strings, based on its first value.
+
+		Returns the column and its type.
+		"""
+
+		type = find_type(values[0]) if len(values) > 0 else 'string'
+
+		if type == 'scalar':
+			try:
+				return array(values, dtype=float), type
+			except ValueError:
+				# Not every value is a number.
+				type = 'string'
+
+		column = empty(len(values), dtype=object)
+		column[:] = values
+
+		return column, type
+
+	@classmethod
+	def from_rows(cls, headings, rows):
+		"""
+		Build a table out of rows of strings, such as those from a CSV file.
+		"""
+
+		if len(rows) > 0:
+			parsed = [cls.parse_column(values) for values in zip(*rows)]
+		else:
+			parsed = [(empty(0), 'string') for _ in headings]
+
+		return cls(headings, [column for column, _ in parsed], [type for _, type in parsed])
+
+	@classmethod
+	def from_array(cls, headings, data):
+		"""
+		Build a table out of a 2D array, or another ColumnStore.
+		"""
+
+		if isinstance(data, cls):
+			return data
+
+		data = asarray(data)
+
+		if data.size == 0:
+			return cls([], [], [])
+
+		if issubdtype(data.dtype, number):
+			return cls(headings, [data[:,i].astype(float) for i in range(data.shape[1])],
+					['scalar'] * data.shape[1])
+
+		return cls.from_rows(headings, data.tolist())
+
+	def __len__(self):
+		if not self.columns:
+			return 0
+
+		return len(self.columns[0])
+
+	@property
+	def shape(self):
+		return (len(self), len(self.columns))
+
+	def column(self, idx):
+		"""
+		A single column, as an array.
+		"""
+
+		return self.columns[idx]
+
+	def select(self, idxs):
+		"""
+		A table of only the given columns.
+		"""
+
+		return self.__class__([self.headings[i] for i in idxs], [self.columns[i] for i in idxs],
+				[self.types[i] for i in idxs])
+
+	def take(self, rows):
+		"""
+		A table of only the given rows, as indices, a boolean mask, or a slice.
+		"""
+
+		if not isinstance(rows, slice):
+			rows = asarray(rows)
+
+			if rows.dtype == bool:
+				rows = rows.nonzero()[0]
+			else:
+				rows = rows.astype(int)
+
+		return self.__class__(self.headings, [column[rows] for column in self.columns], self.types)
+
+	def __getitem__(self, key):
+		if not isinstance(key, tuple):
+			return self.take(key)
+
+		rows, cols = key
+		result = self if isinstance(rows, slice) and rows == slice(None) else self.take(rows)
+
+		if isinstance(cols, slice):
+			return result.select(list(range(len(self.columns)))[cols])
+		elif hasattr(cols, '__len__'):
+			return result.select(cols)
+		else:
+			return result.column(cols)
+
+	def with_column(self, heading, values, type='scalar'):
+		"""
+		A table with an extra column at the end.
+		"""
+
+		column = asarray(values, dtype=float if type == 'scalar' else object).reshape(-1)
+
+		return self.__class__(self.headings + [heading], self.columns + [column], self.types + [type])
+
+	def row(self, idx):
+		return tuple(column[idx] for column in self.columns)
+
+	def rows(self):
+		"""
+		Iterate over the rows as tuples.
+		"""
+
+		return zip(*self.columns)
+
+	def format_cell(self, row, col, max_len=None):
+		"""
+		The text for a single cell, possibly truncated.
+		"""
+
+		value = self.columns[col][row]
+
+		if self.types[col] == 'scalar':
+			text = '{0!r}'.format(float(value))
+		else:
+			text = str(value)
+
+		if max_len is not None:
+			text = text[:max_len]
+
+		return text
@@ -0,0 +1,176 @@
+import ast
+import operator
+from numpy import errstate, logical_and, logical_not, logical_or
+import numpy
+
+"""
+Safe evaluation of arithmetic expressions over NumPy arrays.
+"""
+
+
+binary_operators = {
+	ast.Add: operator.add,
+	ast.Sub: operator.sub,
+	ast.Mult: operator.mul,
+	ast.Div: operator.truediv,
+	ast.FloorDiv: operator.floordiv,
+	ast.Mod: operator.mod,
+	ast.Pow: operator.pow,
+}
+
+unary_operators = {
+	ast.UAdd: operator.pos,
+	ast.USub: operator.neg,
+	ast.Not: logical_not,
+}
+
+comparisons = {
+	ast.Eq: operator.eq,
+	ast.NotEq: operator.ne,
+	ast.Lt: operator.lt,
+	ast.LtE: operator.le,
+	ast.Gt: operator.gt,
+	ast.GtE: operator.ge,
+}
+
+boolean_operators = {
+	ast.And: logical_and,
+	ast.Or: logical_or,
+}
+
+functions = dict((name, getattr(numpy, name)) for name in ['abs', 'sqrt', 'exp', 'log', 'log2', 'log10', 'sin',
+		'cos', 'tan', 'arcsin', 'arccos', 'arctan', 'arctan2', 'sinh', 'cosh', 'tanh', 'hypot', 'power', 'sign',
+		'floor', 'ceil', 'round', 'isnan', 'isfinite', 'minimum', 'maximum', 'where'])
+
+constants = {
+	'pi': numpy.pi,
+	'e': numpy.e,
+	'inf': numpy.inf,
+	'nan': numpy.nan,
+}
+
+
+def compile_node(node, names):
+	"""
+	Turn a node of the syntax tree into a function of a dictionary of values.
+
+	Only arithmetic, comparisons, boolean logic, the given names, and a few NumPy functions and constants are
+	allowed.
+	"""
+
+	if isinstance(node, ast.Expression):
+		return compile_node(node.body, names)
+
+	elif isinstance(node, ast.Constant) and isinstance(node.value, (bool, int, float)):
+		if isinstance(node.value, bool):
+			value = node.value
+		else:
+			# Floats overflow to inf, where Python integers would grow without bound (as in 9 ** 9 ** 9).
+			try:
+				value = numpy.float64(node.value)
+			except OverflowError:
+				value = numpy.inf
+
+		return lambda values: value
+
+	elif isinstance(node, ast.Name):
+		name = node.id
+
+		if name in names:
+			return lambda values: values[name]
+		elif name in constants:
+			value = constants[name]
+			return lambda values: value
+
+		raise ValueError('Unknown name "{0}"'.format(name))
+
+	elif isinstance(node, ast.BinOp) and type(node.op) in binary_operators:
+		op = binary_operators[type(node.op)]
+		left, right = compile_node(node.left, names), compile_node(node.right, names)
+
+		return lambda values: op(left(values), right(values))
+
+	elif isinstance(node, ast.UnaryOp) and type(node.op) in unary_operators:
+		op = unary_operators[type(node.op)]
+		operand = compile_node(node.operand, names)
+
+		return lambda values: op(operand(values))
+
+	elif isinstance(node, ast.BoolOp) and type(node.op) in boolean_operators:
+		op = boolean_operators[type(node.op)]
+		operands = [compile_node(x, names) for x in node.values]
+
+		def f(values):
+			result = operands[0](values)
+
+			for operand in operands[1:]:
+				result = op(result, operand(values))
+
+			return result
+
+		return f
+
+	elif isinstance(node, ast.Compare):
+		ops = []
+		for op in node.ops:
+			try:
+				ops.append(comparisons[type(op)])
+			except KeyError:
+				raise ValueError('Unsupported comparison: {0}'.format(type(op).__name__))
+
+		operands = [compile_node(x, names) for x in [node.left] + node.comparators]
+
+		def f(values):
+			results = [operand(values) for operand in operands]
+
+			# Chained comparisons hold only if every link does.
+			result = ops[0](results[0], results[1])
+			for op, left, right in zip(ops[1:], results[1:], results[2:]):
+				result = logical_and(result, op(left, right))
+
+			return result
+
+		return f
+
+	elif isinstance(node, ast.Call):
+		if not isinstance(node.func, ast.Name) or node.func.id not in functions:
+			raise ValueError('Unknown function: {0}'.format(ast.dump(node.func)))
+
+		if node.keywords:
+			raise ValueError('Keyword arguments are not supported')
+
+		func = functions[node.func.id]
+		args = [compile_node(x, names) for x in node.args]
+
+		return lambda values: func(*[arg(values) for arg in args])
+
+	raise ValueError('Unsupported expression: {0}'.format(type(node).__name__))
+
+
+class Expression(object):
+	"""
+	An expression in the given variable names, such as "sqrt(X ** 2 + Y ** 2)".
+
+	The text is parsed and checked once; calling the expression with arrays for the variables evaluates it over
+	whole arrays at once.
+	"""
+
+	def __init__(self, text, names):
+		self.text = text
+		self.names = list(names)
+
+		try:
+			tree = ast.parse(text.strip(), mode='eval')
+		except SyntaxError as e:
+			raise ValueError('Invalid expression "{0}": {1}'.format(text, e.msg))
+
+		self.f = compile_node(tree, set(self.names))
+
+	def __call__(self, **values):
+		missing = set(self.names) - set(values)
+		if missing:
+			raise ValueError('Missing values for: {0}'.format(', '.join(sorted(missing))))
+
+		# Division by zero and the like give inf and nan, as elsewhere in NumPy.
+		with errstate(all='ignore'):
+			return self.f(values)
@@ -0,0 +1,105 @@
+from numpy import arange, asarray, broadcast_to, ones
+
+from .expression import Expression
+
+"""
+Row filters for columnar data, as NumPy boolean masks.
+"""
+
+
+# The placeholder for the data in the filter text.
+DATA = '#'
+DATA_NAME = '__data__'
+
+
+class ColumnFilter(object):
+	"""
+	A filter on a single column, given as text in which # stands for the value in the column, and i for the row
+	number. For example: "# > 0 and abs(#) < 1e-3".
+
+	The text is parsed once; calling the filter on a ColumnStore evaluates it over the whole column at once.
+	"""
+
+	def __init__(self, text, column):
+		self.text = text
+		self.column = column
+
+		self.f = Expression(text.replace(DATA, DATA_NAME), [DATA_NAME, 'i'])
+
+	def __call__(self, data):
+		"""
+		The boolean mask of the rows of data which pass the filter.
+		"""
+
+		try:
+			values = asarray(data.column(self.column), dtype=float)
+		except ValueError:
+			raise ValueError('Column "{0}" is not numeric'.format(data.headings[self.column]))
+
+		result = asarray(self.f(i=arange(len(data)), **{DATA_NAME: values}))
+
+		return broadcast_to(result.astype(bool), (len(data),))
+
+
+class FilterStack(object):
+	"""
+	Named filters, all of which a row must pass.
+
+	The mask of each filter is kept, so that adding, changing, or removing one filter does not evaluate the others
+	again.
+	"""
+
+	def __init__(self, data):
+		self.data = data
+
+		self.masks = {}
+		self.mask = ones(len(data), dtype=bool)
+
+	def __len__(self):
+		return len(self.masks)
+
+	def combine(self):
+		mask = ones(len(self.data), dtype=bool)
+
+		for x in self.masks.values():
+			mask &= x
+
+		self.mask = mask
+
+	def set(self, name, f):
+		"""
+		Add the filter f under the given name, replacing any filter of the same name.
+
+		f is a function of a ColumnStore, returning a boolean mask of its rows.
+		"""
+
+		mask = asarray(f(self.data), dtype=bool)
+
+		if mask.shape != (len(self.data),):
+			raise ValueError('Filter mask has shape {0}, not {1}'.format(mask.shape, (len(self.data),)))
+
+		replacing = name in self.masks
+		self.masks[name] = mask
+
+		if replacing:
+			self.combine()
+		else:
+			self.mask = self.mask & mask
+
+	def remove(self, name):
+		try:
+			del self.masks[name]
+		except KeyError:
+			return
+
+		self.combine()
+
+	def filtered(self):
+		"""
+		The data, without the rows which fail any filter.
+		"""
+
+		if not self.masks:
+			return self.data
+
+		return self.data.take(self.mask)
@@ -1,3 +1,4 @@
+from numpy import ndarray
 from pyparsing import (delimitedList, ParseBaseException, Regex, Suppress)
 from re import IGNORECASE
 
@@ -27,3 +28,16 @@ def ListParser():
 			raise ValueError(e)
 
 	return parse
+
+
+def format_list(value):
+	"""
+	Format a list value, such as a waveform of (time, value) rows, in the form which ListParser reads.
+
+	Arrays are written out in full; NumPy would otherwise abbreviate long ones.
+	"""
+
+	if isinstance(value, ndarray):
+		value = value.tolist()
+
+	return str([tuple(x) for x in value])
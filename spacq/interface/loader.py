@@ -0,0 +1,300 @@
+import csv
+from itertools import islice
+import numpy
+from tempfile import TemporaryFile
+from threading import Event, Lock, Thread
+import logging
+log = logging.getLogger(__name__)
+
+from . import capture
+from .columns import ColumnStore, find_type
+
+"""
+Loading large tables in the background.
+"""
+
+
+def count_lines(f, block_size=1 << 20):
+	"""
+	The number of lines in a binary file, without reading it all into memory.
+	"""
+
+	count, last = 0, b'\n'
+
+	while True:
+		block = f.read(block_size)
+		if not block:
+			break
+
+		count += block.count(b'\n')
+		last = block[-1:]
+
+	# The last line need not end in a newline.
+	if last != b'\n':
+		count += 1
+
+	return count
+
+
+def format_scalars(values):
+	"""
+	Scalar values as the strings of a string column.
+	"""
+
+	column = numpy.empty(len(values), dtype=object)
+	column[:] = ['{0!r}'.format(x) for x in values.tolist()]
+
+	return column
+
+
+class TableLoader(Thread):
+	"""
+	Load a CSV or capture file in chunks, in a separate thread.
+
+	Scalar columns are parsed a chunk at a time into float64 arrays which are preallocated in a memory-mapped
+	temporary file, so that a large table is kept out of memory; other columns keep their strings. A capture file is
+	read one block at a time in the same way. The rows loaded
+	so far are available from data at any time, before the whole file is done.
+
+	Callbacks are made from the loading thread:
+		progress_callback(loaded, total): After every chunk, with the number of rows so far and the (estimated)
+			total.
+		done_callback(): Once the whole file is loaded, or loading is cancelled.
+		exception_callback(e): If the file cannot be loaded; e is an IOError.
+	"""
+
+	def __init__(self, path, chunk_size=50000, progress_callback=None, done_callback=None,
+			exception_callback=None):
+		Thread.__init__(self)
+
+		self.path = path
+		self.chunk_size = chunk_size
+		self.progress_callback = progress_callback
+		self.done_callback = done_callback
+		self.exception_callback = exception_callback
+
+		self.daemon = True
+
+		self.has_header = False
+		self.headings = []
+		self.types = []
+		self.columns = []
+
+		self.loaded = 0
+		self.total = 0
+
+		self.lock = Lock()
+		self.cancel_event = Event()
+
+	@property
+	def cancelled(self):
+		return self.cancel_event.is_set()
+
+	def cancel(self):
+		"""
+		Stop loading after the current chunk, keeping the rows loaded so far.
+		"""
+
+		self.cancel_event.set()
+
+	@property
+	def data(self):
+		"""
+		The rows loaded so far, as a ColumnStore.
+		"""
+
+		with self.lock:
+			return ColumnStore(self.headings, [column[:self.loaded] for column in self.columns], self.types)
+
+	def allocate(self, types, num_rows):
+		"""
+		Empty columns of the given types, with room for num_rows rows.
+		"""
+
+		num_scalars = types.count('scalar')
+
+		if num_scalars > 0 and num_rows > 0:
+			scalars = numpy.memmap(TemporaryFile(), dtype=float, mode='w+', shape=(num_scalars, num_rows))
+		else:
+			scalars = numpy.empty((num_scalars, num_rows))
+
+		columns = []
+		scalar_idx = 0
+		for type in types:
+			if type == 'scalar':
+				# Each column is contiguous.
+				columns.append(scalars[scalar_idx])
+				scalar_idx += 1
+			else:
+				columns.append(numpy.empty(num_rows, dtype=object))
+
+		return columns
+
+	def grow(self, num_rows):
+		"""
+		Make room for at least num_rows rows, if the estimate was short.
+		"""
+
+		columns = self.allocate(self.types, max(num_rows, 2 * len(self.columns[0])))
+
+		for old, new in zip(self.columns, columns):
+			new[:self.loaded] = old[:self.loaded]
+
+		with self.lock:
+			self.columns = columns
+
+	def store(self, rows):
+		"""
+		Parse a chunk of rows into the columns.
+		"""
+
+		for i, row in enumerate(rows, self.loaded + 1):
+			if len(row) != len(self.columns):
+				raise ValueError('Row {0} has {1} values instead of {2}'.format(i, len(row), len(self.columns)))
+
+		self.store_columns(list(zip(*rows)), len(rows))
+
+	def store_columns(self, values, num_rows):
+		"""
+		Parse a chunk of num_rows rows, given as one sequence of values per column, into the columns.
+		"""
+
+		start, end = self.loaded, self.loaded + num_rows
+
+		if end > len(self.columns[0]):
+			self.grow(end)
+
+		for i, column_values in enumerate(values):
+			if self.types[i] == 'scalar':
+				try:
+					self.columns[i][start:end] = numpy.array(column_values, dtype=float)
+				except ValueError:
+					# Not every value is a number, so the column holds strings after all.
+					with self.lock:
+						column = numpy.empty(len(self.columns[i]), dtype=object)
+						column[:start] = format_scalars(self.columns[i][:start])
+
+						self.columns[i] = column
+						self.types[i] = 'string'
+
+			if self.types[i] != 'scalar':
+				if isinstance(column_values, numpy.ndarray) and column_values.dtype == float:
+					# Numbers in a column which already holds strings.
+					column_values = format_scalars(column_values)
+
+				self.columns[i][start:end] = column_values
+
+		with self.lock:
+			self.loaded = end
+
+	def load_csv(self):
+		with open(self.path, 'rb') as f:
+			self.total = count_lines(f)
+
+		with open(self.path, 'r', newline='') as f:
+			reader = csv.reader(f)
+
+			try:
+				first = next(reader)
+			except StopIteration:
+				return
+
+			# An empty first row is dropped, and means that there are no headings.
+			self.has_header = len(first) > 0
+			self.total -= 1
+
+			# Blank lines are skipped.
+			rows = (row for row in reader if row)
+
+			chunk = list(islice(rows, self.chunk_size))
+
+			if self.has_header:
+				headings = list(first)
+			else:
+				headings = [''] * (len(chunk[0]) if chunk else 0)
+
+			if chunk:
+				if len(headings) != len(chunk[0]):
+					raise ValueError('Row 1 has {0} values instead of {1}'.format(len(chunk[0]), len(headings)))
+
+				types = [find_type(value) for value in chunk[0]]
+			else:
+				types = ['string'] * len(headings)
+
+			columns = self.allocate(types, self.total if chunk else 0)
+
+			with self.lock:
+				self.headings, self.types, self.columns = headings, types, columns
+
+			while chunk:
+				self.store(chunk)
+
+				if self.progress_callback is not None:
+					self.progress_callback(self.loaded, self.total)
+
+				if self.cancelled:
+					return
+
+				chunk = list(islice(rows, self.chunk_size))
+
+	def load_capture(self):
+		with capture.CaptureReader(self.path) as reader:
+			self.total = reader.count_rows()
+			self.has_header = True
+
+			headings = list(reader.header['headings'])
+			blocks = reader.blocks()
+
+			block = next(blocks, None)
+
+			# Other columns are shown and parsed as strings, as if they came from a CSV file.
+			if block is not None:
+				types = []
+				for column in block:
+					if column.dtype == float:
+						types.append('scalar')
+					else:
+						type = find_type(column[0]) if len(column) > 0 else 'list'
+						# Numbers mixed with other values, as in a column which changed type part of the way through.
+						types.append('string' if type == 'scalar' else type)
+			else:
+				types = ['scalar' if i in reader.header['scalar_columns'] else 'string' for i in range(len(headings))]
+
+			columns = self.allocate(types, self.total if block is not None else 0)
+
+			with self.lock:
+				self.headings, self.types, self.columns = headings, types, columns
+
+			while block:
+				self.store_columns(block, len(block[0]))
+
+				if self.progress_callback is not None:
+					self.progress_callback(self.loaded, self.total)
+
+				if self.cancelled:
+					return
+
+				block = next(blocks, None)
+
+	def run(self):
+		try:
+			if self.path.endswith('.' + capture.extension):
+				self.load_capture()
+			else:
+				self.load_csv()
+		except Exception as e:
+			# Wrap all problems.
+			error = IOError('Could not load data.', e)
+
+			if self.exception_callback is not None:
+				self.exception_callback(error)
+			else:
+				log.error('Could not load "{0}": {1!r}'.format(self.path, e))
+
+			return
+
+		# The estimate may have counted blank lines.
+		self.total = self.loaded
+
+		if self.done_callback is not None:
+			self.done_callback()
@@ -1,5 +1,5 @@
 from copy import copy, deepcopy
-from os.path import basename, dirname
+from os.path import basename, dirname, getmtime
 
 from ..units import Quantity
 from .parser import Parser, PulseError, PulseSyntaxError
@@ -73,6 +73,9 @@ class Program(object):
 		self.times_average = 1
 		self.acq_delay = Quantity(0, 's')
 
+		# The values on which the last generated waveforms depend, for deciding what needs to be regenerated.
+		self._waveform_state = None
+
 	@property
 	def all_values(self):
 		return self._env.all_values
@@ -104,21 +107,88 @@ class Program(object):
 
 		self._env.values[parameter] = value
 
+	def _snapshot(self, keys):
+		"""
+		The current values for the given keys, in a form which can be compared exactly.
+		"""
+
+		result = {}
+
+		for key in keys:
+			value = self._env.values.get(key)
+
+			if isinstance(value, Quantity):
+				value = (value.original_value, value.original_units)
+
+			result[key] = value
+
+		return result
+
+	def _shape_snapshot(self, paths):
+		"""
+		The current modification times of the given shape files, or None for those which are gone.
+		"""
+
+		result = {}
+
+		for p in paths:
+			try:
+				result[p] = getmtime(p)
+			except OSError:
+				result[p] = None
+
+		return result
+
 	def generate_waveforms(self, dry_run=False):
 		"""
 		Generate the waveforms, given that the values are all filled in.
+
+		Outputs whose values have not changed since the last generation are not regenerated; if nothing relevant has
+		changed, the previous waveforms are returned as they are.
 		"""
 
-		self._env.stage = self._env.stages.waveforms
-		self._env.dry_run = dry_run
-		self._env.missing_shapes = set()
-		self._env.errors = []
-		self._env.traverse_tree(self._ast)
+		env = self._env
+
+		env.skip_outputs = set()
+
+		if not dry_run and self._waveform_state is not None:
+			frequency, global_values, output_values, shape_files = self._waveform_state
+
+			# An edited shape file changes the pulses which use it, even though none of the values have changed.
+			if frequency == (env.frequency.original_value, env.frequency.original_units) and \
+					global_values == self._snapshot(env.dependencies) and \
+					shape_files == self._shape_snapshot(shape_files):
+				changed = set(output for output, values in output_values.items()
+						if values != self._snapshot(env.output_dependencies[output]))
+
+				if not changed:
+					return env.waveforms
+
+				env.skip_outputs = set(env.waveforms) - changed
+
+		env.stage = env.stages.waveforms
+		env.dry_run = dry_run
+		env.missing_shapes = set()
+		env.shape_files = {}
+		env.errors = []
+
+		try:
+			env.traverse_tree(self._ast)
+		finally:
+			env.skip_outputs = set()
+
+		if env.errors or dry_run:
+			self._waveform_state = None
+		else:
+			self._waveform_state = ((env.frequency.original_value, env.frequency.original_units),
+					self._snapshot(env.dependencies),
+					dict((output, self._snapshot(keys)) for output, keys in env.output_dependencies.items()),
+					dict(env.shape_files))
 
-		if self._env.errors:
-			raise PulseError(self._env.format_errors())
+		if env.errors:
+			raise PulseError(env.format_errors())
 
-		return self._env.waveforms
+		return env.waveforms
 
 	@property
 	def with_resources(self):
@@ -132,6 +202,7 @@ class Program(object):
 
 		# We plan to modify the values in the Environment.
 		result._env = deepcopy(self._env)
+		result._waveform_state = None
 
 		for parameter, label in list(self.resource_labels.items()):
 			def setter(x, parameter=parameter):
@@ -1,4 +1,6 @@
-from os import path
+from os import path, utime
+from shutil import copy, rmtree
+from tempfile import mkdtemp
 from nose.tools import assert_raises, eq_
 from numpy.testing import assert_array_almost_equal, assert_array_equal
 from unittest import main, TestCase
@@ -117,6 +119,80 @@ error: File "this-shape-doesn't-exist" (due to "wobble") not found at column 17
 		end = manipulator + [0.0] * 15
 		assert_array_almost_equal(f2.data, [0.0] * 10 + wobble + loop * 2 + [0.0] * 20 + end * 2, 2)
 
+	def testRegenerateWaveforms(self):
+		"""
+		Only regenerate the waveforms which are affected by changed values.
+		"""
+
+		p = program.Program.from_file(path.join(resource_dir, '01.pulse'))
+
+		for name, value in self.missing:
+			p.set_value(name, value)
+
+		p.set_value(('wobble', 'shape'), 'non-square')
+		p.frequency = Quantity(1, 'GHz')
+
+		waveforms = p.generate_waveforms()
+		f1, f2 = waveforms['f1'], waveforms['f2']
+
+		# Nothing has changed.
+		waveforms = p.generate_waveforms()
+		assert waveforms['f1'] is f1
+		assert waveforms['f2'] is f2
+
+		# Only f1 is affected.
+		p.set_value(('first_square', 'amplitude'), Quantity(0.25, 'V'))
+		waveforms = p.generate_waveforms()
+		assert waveforms['f2'] is f2
+		assert_array_equal(waveforms['f1'].data[10:12], [0.25, 0.0])
+
+		# Both are affected.
+		p.set_value(('settle',), Quantity(10, 'ns'))
+		waveforms = p.generate_waveforms()
+		assert waveforms['f2'] is not f2
+		eq_(len(waveforms['f1'].data), len(f1.data) - 10)
+		eq_(len(waveforms['f2'].data), len(f2.data) - 10)
+
+	def testRegenerateWaveformsShape(self):
+		"""
+		Regenerate the waveforms when a shape file is modified.
+		"""
+
+		tmp_dir = mkdtemp()
+
+		try:
+			copy(path.join(resource_dir, '01.pulse'), tmp_dir)
+			copy(path.join(resource_dir, 'non-square'), tmp_dir)
+
+			p = program.Program.from_file(path.join(tmp_dir, '01.pulse'))
+
+			for name, value in self.missing:
+				p.set_value(name, value)
+
+			p.set_value(('wobble', 'shape'), 'non-square')
+			p.frequency = Quantity(1, 'GHz')
+
+			waveforms = p.generate_waveforms()
+			f1, f2 = waveforms['f1'], waveforms['f2']
+
+			shape_path = path.join(tmp_dir, 'non-square')
+			with open(shape_path, 'w') as f:
+				f.write('1.0, 2.0, 3.0\n')
+			# Make sure that the modification is noticed, however coarse the timestamps.
+			mtime = path.getmtime(shape_path) + 10
+			utime(shape_path, (mtime, mtime))
+
+			waveforms = p.generate_waveforms()
+			assert waveforms['f2'] is not f2
+			assert_array_equal(waveforms['f1'].data, f1.data)
+
+			# Nothing else has changed.
+			f2 = waveforms['f2']
+			waveforms = p.generate_waveforms()
+			assert waveforms['f2'] is f2
+		finally:
+			rmtree(tmp_dir)
+
 	def testWaveformsDryRun(self):
 		"""
 		Run through waveform generation, but don't actually generate anything.
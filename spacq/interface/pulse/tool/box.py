@@ -1,4 +1,5 @@
 import csv
+from os import path
 
 from spacq.tool.box import flatten
 
@@ -63,3 +64,31 @@ def load_values(f):
 
 	# Ignore blank lines.
 	return [float(x) for x in flatten(reader) if not x.isspace()]
+
+
+# Values loaded from shape files, keyed by the absolute path of the file.
+shape_cache = {}
+
+
+def load_shape(p):
+	"""
+	Load data points from a shape file, reusing the previous result for as long as the file is unmodified.
+	"""
+
+	key = path.abspath(p)
+	mtime = path.getmtime(key)
+
+	try:
+		cached_mtime, data = shape_cache[key]
+	except KeyError:
+		pass
+	else:
+		if cached_mtime == mtime:
+			return data
+
+	with open(key) as f:
+		data = load_values(f)
+
+	shape_cache[key] = (mtime, data)
+
+	return data
@@ -7,7 +7,7 @@ from spacq.tool.box import Enum
 
 from ..units import IncompatibleDimensions, Quantity
 from ..waveform import Generator
-from .tool.box import find_location, format_error, load_values
+from .tool.box import find_location, format_error, load_shape
 
 """
 Abstract syntax tree bits for pulse programs.
@@ -77,12 +77,23 @@ class Environment(object):
 		# Generated waveforms.
 		self.waveforms = {}
 
+		# Outputs whose waveforms should not be regenerated; their previous waveforms are kept.
+		self.skip_outputs = set()
+
+		# Values used while generating the waveforms. Only the values in output_dependencies affect the content of
+		# a single output; all the values in dependencies affect the timing of every output.
+		self.dependencies = set()
+		self.output_dependencies = {}
+
 		# Where to look for shapes.
 		self.cwd = None
 
 		# Shapes that could not be found.
 		self.missing_shapes = set()
 
+		# Shape files which were loaded, with their modification times.
+		self.shape_files = {}
+
 		# Default frequency.
 		self.frequency = Quantity(1, 'Hz')
 
@@ -110,9 +121,13 @@ class Environment(object):
 
 				raise ValueError('Cannot generate waveforms while values are missing: {0}'.format(values))
 
-			# Set up output waveform generators.
+			# Set up output waveform generators. Skipped outputs only keep track of their lengths.
 			for output in self.waveforms:
-				self.generators[output] = Generator(frequency=self.frequency, dry_run=self.dry_run)
+				dry_run = self.dry_run or output in self.skip_outputs
+				self.generators[output] = Generator(frequency=self.frequency, dry_run=dry_run)
+
+			self.dependencies = set()
+			self.output_dependencies = dict((output, set()) for output in self.waveforms)
 
 	def post_stage(self):
 		"""
@@ -139,7 +154,22 @@ class Environment(object):
 		elif self.stage == self.stages.waveforms:
 			# Finalize waveform creation.
 			for output in self.generators:
-				self.waveforms[output] = self.generators[output].waveform
+				if output not in self.skip_outputs:
+					self.waveforms[output] = self.generators[output].waveform
+
+	def get_value(self, target, output=None):
+		"""
+		Get a value while generating waveforms, recording the dependency on it.
+
+		If output is given, the value only affects the content of that output.
+		"""
+
+		if output is None:
+			self.dependencies.add(target)
+		else:
+			self.output_dependencies[output].add(target)
+
+		return self.values[target]
 
 	def set_value(self, target, value):
 		"""
@@ -270,8 +300,8 @@ class Acquire(ASTNode):
 			else:
 				env.acquisition = True
 		elif env.stage == env.stages.waveforms:
-			acq_marker = env.values[('_acq_marker', 'marker_num')]
-			acq_output = env.values[('_acq_marker', 'output')]
+			acq_marker = env.get_value(('_acq_marker', 'marker_num'))
+			acq_output = env.get_value(('_acq_marker', 'output'))
 
 			env.generators[acq_output].marker(acq_marker, True)
 
@@ -417,7 +447,7 @@ class Delay(ASTNode):
 					env.add_error('Delay must be a time value', self.location)
 		if env.stage == env.stages.waveforms:
 			if isinstance(self.length, str):
-				length = env.values[(self.length,)]
+				length = env.get_value((self.length,))
 			else:
 				length = self.length
 
@@ -469,7 +499,7 @@ class Loop(ASTNode):
 
 		if env.stage == env.stages.waveforms:
 			if isinstance(self.times, str):
-				times = env.values[(self.times,)]
+				times = env.get_value((self.times,))
 			else:
 				times = self.times
 
@@ -496,11 +526,11 @@ class ParallelPulses(ASTNode):
 		env.stack.pop()
 
 		if env.stage == env.stages.waveforms:
-			max_length = max(len(waveform._wave) for waveform in list(env.generators.values()))
+			max_length = max(waveform.length for waveform in list(env.generators.values()))
 
 			for waveform in list(env.generators.values()):
-				if len(waveform._wave) < max_length:
-					waveform.append([0.0] * (max_length - len(waveform._wave)))
+				if waveform.length < max_length:
+					waveform.append_constant(0.0, max_length - waveform.length)
 
 
 class Pulse(ASTNode):
@@ -545,7 +575,8 @@ class PulseSequence(ASTNode):
 					if type not in ['delay', 'pulse']:
 						env.add_error('Invalid command "{0}"'.format(item), self.location)
 		elif env.stage == env.stages.waveforms:
-			target = env.generators[env.stack[-1].target]
+			output = env.stack[-1].target
+			target = env.generators[output]
 
 			for item in self.items:
 				if isinstance(item, str):
@@ -553,11 +584,12 @@ class PulseSequence(ASTNode):
 
 					if type == 'delay':
 						target.set_next(0.0)
-						target.delay(env.values[(item,)])
+						target.delay(env.get_value((item,)))
 					elif type == 'pulse':
-						amplitude = float(env.values[(item, 'amplitude')].value)
-						length = env.values[(item, 'length')]
-						shape = env.values[(item, 'shape')]
+						# The length and shape of a pulse determine its duration, so they affect all the outputs.
+						amplitude = float(env.get_value((item, 'amplitude'), output).value)
+						length = env.get_value((item, 'length'))
+						shape = env.get_value((item, 'shape'))
 
 						if shape not in env.missing_shapes:
 							if shape == 'square':
@@ -571,8 +603,8 @@ class PulseSequence(ASTNode):
 								data = None
 								for p in paths:
 									try:
-										with open(p) as f:
-											data = load_values(f)
+										data = load_shape(p)
+										env.shape_files[path.abspath(p)] = path.getmtime(p)
 									except IOError:
 										continue
 									except ValueError:
@@ -0,0 +1,243 @@
+from math import ceil
+from numpy import linspace
+from time import sleep, time
+import logging
+log = logging.getLogger(__name__)
+
+from .units import Quantity, QuantityArray
+
+
+"""
+Slowly move several resources to new values at the same time.
+"""
+
+
+class RampTarget(object):
+    """
+    The values through which a single resource passes.
+    """
+
+    def __init__(self, resource, values, name=None, exception_callback=None):
+        self.resource = resource
+        self.values = values
+        self.name = name
+        self.exception_callback = exception_callback
+
+        # Stop writing once something goes wrong.
+        self.failed = False
+
+    def __len__(self):
+        return len(self.values)
+
+    def fail(self, e):
+        self.failed = True
+
+        if self.exception_callback is not None:
+            self.exception_callback(e)
+        else:
+            log.warning('Ramp of "{0}" failed: {1!r}'.format(self.name, e))
+
+    @property
+    def device(self):
+        """
+        The device which can buffer the writes of this target into a multi-command message, if any.
+        """
+
+        if self.resource.combinable_write and hasattr(self.resource.obj, 'multi_command_start'):
+            return self.resource.obj
+
+
+class Ramp(object):
+    """
+    Steps several resources in lockstep, on a single schedule.
+
+    Every delay, the next value of each resource is written; writes to the same device are combined into a single
+    multi-command message where the resources allow it. The schedule is kept relative to the start of the ramp, so
+    slow writes do not accumulate into drift.
+    """
+
+    def __init__(self, delay=0.1, run_tasks=None):
+        """
+        delay: Seconds between consecutive steps.
+        run_tasks: A function of (stage, tasks) which performs the tasks (tuples of (resource, function, args,
+            kwargs)) in parallel, as SweepController.run_tasks does. Without it, the writes are made in turn.
+        """
+
+        self.delay = delay
+        self.run_tasks = run_tasks
+
+        self.targets = []
+
+        # Devices which have failed to send multi-command messages.
+        self.combine_unsupported = set()
+
+    def __len__(self):
+        """
+        The number of steps in the ramp.
+        """
+
+        return max([len(target) for target in self.targets] + [0])
+
+    @staticmethod
+    def values(value_from, value_to, steps):
+        """
+        The values from value_from to value_to, inclusive, in the given number of steps.
+
+        A bare 0 takes on the units of the other value.
+        """
+
+        if isinstance(value_from, Quantity) or isinstance(value_to, Quantity):
+            if not isinstance(value_from, Quantity):
+                if value_from != 0:
+                    raise TypeError('Expected a Quantity, not "{0}"'.format(value_from))
+
+                value_from = Quantity(0, value_to.original_units)
+            elif not isinstance(value_to, Quantity):
+                if value_to != 0:
+                    raise TypeError('Expected a Quantity, not "{0}"'.format(value_to))
+
+                value_to = Quantity(0, value_from.original_units)
+
+            value_from.assert_dimensions(value_to)
+
+            units = value_from.original_units
+
+            return QuantityArray(linspace(value_from.original_value, value_to.value_in(units), steps), units)
+        else:
+            return linspace(value_from, value_to, steps).tolist()
+
+    def steps_for_rate(self, value_from, value_to, max_rate):
+        """
+        The number of steps needed to go from value_from to value_to without exceeding max_rate per second.
+        """
+
+        if isinstance(value_from, Quantity) or isinstance(value_to, Quantity):
+            values = self.values(value_from, value_to, 2)
+            units = values.original_units
+            distance = abs(values.original_values[1] - values.original_values[0])
+
+            if isinstance(max_rate, Quantity):
+                max_rate = max_rate.value_in('{0}.s-1'.format(units))
+        else:
+            distance = abs(value_to - value_from)
+
+        if max_rate <= 0:
+            raise ValueError('Maximum rate must be positive, not "{0}"'.format(max_rate))
+
+        # Every step but the first moves by at most max_rate * delay.
+        return max(1, int(ceil(distance / (max_rate * self.delay) - 1e-9))) + 1
+
+    def add(self, resource, value_from, value_to, steps=None, max_rate=None, name=None, exception_callback=None):
+        """
+        Ramp the resource from value_from to value_to.
+
+        steps: The number of values to write, including both ends.
+        max_rate: The largest change per second (a Quantity, or a number in the units of the values). Overrides
+            steps; defaults to the max_rate of the resource.
+        exception_callback: Called with any exception raised by writing, after which the resource is left alone.
+        """
+
+        if max_rate is None:
+            max_rate = resource.max_rate
+
+        if max_rate is not None:
+            steps = self.steps_for_rate(value_from, value_to, max_rate)
+        elif steps is None:
+            raise ValueError('Either the steps or the maximum rate must be given.')
+
+        target = RampTarget(resource, self.values(value_from, value_to, steps), name, exception_callback)
+        self.targets.append(target)
+
+        return target
+
+    def write(self, target, value):
+        try:
+            target.resource.value = value
+        except Exception as e:
+            target.fail(e)
+
+    def write_combined(self, device, writes):
+        """
+        Write to several resources of a device with a single message, or individually if the device cannot do so.
+
+        writes: Tuples of (target, value).
+        """
+
+        if device not in self.combine_unsupported:
+            with device.lock:
+                try:
+                    device.multi_command_start()
+                except NotImplementedError:
+                    log.debug('Device does not support combined writes: {0!r}'.format(device))
+
+                    self.combine_unsupported.add(device)
+                else:
+                    for target, value in writes:
+                        self.write(target, value)
+
+                    if any(target.failed for target, _ in writes):
+                        # Send nothing of a message with a failed write in it; the others are written on their own.
+                        device.multi_command_cancel()
+
+                        writes = [(target, value) for target, value in writes if not target.failed]
+                    else:
+                        try:
+                            device.multi_command_stop()
+                        except Exception as e:
+                            for target, _ in writes:
+                                if not target.failed:
+                                    target.fail(e)
+
+                        return
+
+        for target, value in writes:
+            self.write(target, value)
+
+    def step(self, idx):
+        """
+        Write the values of a single step.
+        """
+
+        tasks = []
+        # Writes which can be combined, by device.
+        combined = {}
+
+        for target in self.targets:
+            if target.failed or idx >= len(target):
+                continue
+
+            value = target.values[idx]
+            device = target.device
+
+            if device is not None:
+                combined.setdefault(device, []).append((target, value))
+            else:
+                tasks.append((target.resource, self.write, (target, value), {}))
+
+        for device, writes in combined.items():
+            if len(writes) > 1:
+                tasks.append((writes[0][0].resource, self.write_combined, (device, writes), {}))
+            else:
+                target, value = writes[0]
+                tasks.append((target.resource, self.write, (target, value), {}))
+
+        if self.run_tasks is not None:
+            self.run_tasks('ramp', tasks)
+        else:
+            for _, f, args, kwargs in tasks:
+                f(*args, **kwargs)
+
+    def run(self):
+        """
+        Perform the whole ramp, waiting for a delay after every step.
+        """
+
+        start_time = time()
+
+        for idx in range(len(self)):
+            self.step(idx)
+
+            # Wait until the next step is due, however long this one took.
+            delay = start_time + (idx + 1) * self.delay - time()
+            if delay > 0:
+                sleep(delay)
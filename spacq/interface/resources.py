@@ -1,8 +1,8 @@
 from spacq.tool.box import Without
+from .ramp import Ramp
 from .units import IncompatibleDimensions, Quantity
 import time
-from threading import Thread
-from numpy import linspace
+from threading import Event, RLock, Thread
 from copy import copy
 import logging
 log = logging.getLogger(__name__)
@@ -29,6 +29,54 @@ class NotWritable(Exception):
     pass
 
 
+class ValueCache(object):
+    """
+    The most recent value obtained from a resource, which is reused for up to ttl seconds.
+
+    Hits and misses are counted, for tuning the ttl.
+    """
+
+    def __init__(self, ttl=None):
+        """
+        ttl: Seconds for which a value remains valid, or None to disable caching.
+        """
+
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        self.invalidate()
+
+    def invalidate(self):
+        self._value = None
+        self._time = None
+
+    def store(self, value):
+        self._value = value
+        self._time = time.time()
+
+    def get(self, fetch):
+        """
+        The cached value if it is still valid; otherwise, the result of fetch, which is then cached.
+        """
+
+        if self.ttl is None:
+            return fetch()
+
+        if self._time is not None and time.time() - self._time < self.ttl:
+            self.hits += 1
+
+            return self._value
+
+        self.misses += 1
+
+        value = fetch()
+        self.store(value)
+
+        return value
+
+
 class Resource(object):
     """
     A generic resource which can potentially be read from or written to.
@@ -70,6 +118,37 @@ class Resource(object):
         # Resources marked slow should not be fetched implicitly.
         self.slow = False
 
+        # A query message and a function which parses its response into a value, if the value can be read as part
+        # of a multi-command message.
+        self.query = None
+
+        # Whether the setter does nothing but write to the device, so that writes can be buffered into a
+        # multi-command message.
+        self.combinable_write = False
+
+        # The largest change per second when ramping, if the value must not change any faster.
+        self.max_rate = None
+
+        # A Resource which reads as true once a value written to this resource has settled. If given, the sweep
+        # polls it, and only waits the full settling time if it never becomes true.
+        self.ready = None
+
+        # Values read from the device, shared with all wrapped versions of this resource.
+        self.cache = ValueCache()
+
+    @property
+    def ttl(self):
+        """
+        Seconds for which a value read from the device is reused, or None to always read.
+        """
+
+        return self.cache.ttl
+
+    @ttl.setter
+    def ttl(self, value):
+        self.cache.ttl = value
+        self.cache.invalidate()
+
     @property
     def units(self):
         return self._units
@@ -120,25 +199,20 @@ class Resource(object):
         if self.getter is None:
             raise NotReadable('Resource not readable.')
 
+        return self.filter_value(self.cache.get(self._get))
+
+    def _get(self):
+        """
+        The unfiltered value, straight from the device.
+        """
+
         if callable(self.getter):
-            result = self.getter()
+            return self.getter()
         elif self.obj is not None:
-            result = getattr(self.obj, self.getter)
+            return getattr(self.obj, self.getter)
         else:
             raise NotReadable('Cannot read from resource.')
 
-        self.verify_dimensions(result)
-
-        # Apply the wrappers.
-        for _, getter_filter, _ in self.wrappers:
-            if getter_filter is None:
-                continue
-
-            result = getter_filter(result)
-            self.verify_dimensions(result)
-
-        return result
-
     @value.setter
     def value(self, v):
         if self.setter is None:
@@ -158,12 +232,48 @@ class Resource(object):
             raise ValueError('Given disallowed value: {0}. Allowed values are: {1}'.format(
                 v, self.allowed_values))
 
-        if callable(self.setter):
-            self.setter(v)
-        elif self.obj is not None:
-            setattr(self.obj, self.setter, v)
-        else:
-            raise NotWritable('Cannot write to resource.')
+        try:
+            if callable(self.setter):
+                self.setter(v)
+            elif self.obj is not None:
+                setattr(self.obj, self.setter, v)
+            else:
+                raise NotWritable('Cannot write to resource.')
+        finally:
+            # Even a failed write may have changed the value on the device.
+            self.cache.invalidate()
+
+    def filter_value(self, result):
+        """
+        Verify a value obtained from the device and pass it through the wrappers.
+        """
+
+        self.verify_dimensions(result)
+
+        # Apply the wrappers.
+        for _, getter_filter, _ in self.wrappers:
+            if getter_filter is None:
+                continue
+
+            result = getter_filter(result)
+            self.verify_dimensions(result)
+
+        return result
+
+    def value_from_response(self, response):
+        """
+        The value of the resource, given the response to its query.
+        """
+
+        if self.query is None:
+            raise NotReadable('Resource has no query.')
+
+        _, parse = self.query
+
+        result = parse(response)
+        self.cache.store(result)
+
+        return self.filter_value(result)
 
     def convert(self, value):
         """
@@ -246,28 +356,9 @@ class Resource(object):
         Sweep the Resource slowly over a linear space.
         """
 
-        # Check for dimension mismatches.
-        if isinstance(value_from, Quantity) and not isinstance(value_to, Quantity) and value_to == 0:
-            value_to = Quantity(0, value_from.original_units)
-        elif isinstance(value_to, Quantity) and not isinstance(value_from, Quantity) and value_from == 0:
-            value_from = Quantity(0, value_to.original_units)
-        elif isinstance(value_from, Quantity) and isinstance(value_to, Quantity):
-            value_from.assert_dimensions(value_to)
-
-        # Make list of Quantites to loop over
-        quantites_values = linspace(
-            value_from.original_value, value_to.original_value, steps)
-        quantites_list = [
-            Quantity(value, units=value_from.original_units) for value in quantites_values]
-        for value in quantites_list:
-            try:
-                self.value = value
-            except Exception as e:
-                if exception_callback is not None:
-                    exception_callback(e)
-                return
-
-            time.sleep(delay)
+        ramp = Ramp(delay)
+        ramp.add(self, value_from, value_to, steps, exception_callback=exception_callback)
+        ramp.run()
 
 
 class AcquisitionThread(Thread):
@@ -321,3 +412,241 @@ class AcquisitionThread(Thread):
 
             if not self.done and delay > 0:
                 time.sleep(delay)
+
+
+class AcquisitionSubscription(object):
+    """
+    A request for values from a resource, made through an AcquisitionHub.
+
+    The resource and the delay may be changed at any time.
+    """
+
+    def __init__(self, hub, delay, callback, running_lock=None):
+        delay.assert_dimensions('s')
+
+        self.hub = hub
+        self._resource = None
+        self._delay = delay
+        self.callback = callback
+        self.running_lock = running_lock
+
+        # When a value was last delivered.
+        self.last_time = None
+
+    @property
+    def resource(self):
+        return self._resource
+
+    @resource.setter
+    def resource(self, value):
+        self.hub._move(self, value)
+
+    @property
+    def delay(self):
+        return self._delay
+
+    @delay.setter
+    def delay(self, value):
+        value.assert_dimensions('s')
+
+        self._delay = value
+
+        # Wake the poller so that it notices a shorter delay.
+        self.hub._wake(self._resource)
+
+    @property
+    def paused(self):
+        """
+        Whether the running lock is held elsewhere.
+        """
+
+        if self.running_lock is None:
+            return False
+
+        if self.running_lock.acquire(False):
+            self.running_lock.release()
+            return False
+        else:
+            return True
+
+    def due(self, now):
+        if self.paused:
+            return False
+
+        # Allow for some jitter in the poller.
+        return self.last_time is None or now - self.last_time >= 0.9 * self._delay.value
+
+    def close(self):
+        self.resource = None
+
+
+class ResourcePoller(Thread):
+    """
+    Read a single resource at the rate of its fastest subscriber, and hand the value to every subscriber which is due.
+    """
+
+    def __init__(self, hub, resource):
+        Thread.__init__(self)
+
+        self.daemon = True
+
+        self.hub = hub
+        self.resource = resource
+
+        # A value obtained without the poller, and when it was obtained.
+        self.fed = None
+        self.last_read = None
+
+        self.wake = Event()
+
+        # Allow the thread to be stopped prematurely.
+        self.done = False
+
+    def poll(self):
+        """
+        Deliver a value to every due subscriber, reading it only if necessary.
+
+        Returns the number of seconds until the next subscriber is due.
+        """
+
+        subscriptions = self.hub.subscriptions(self.resource)
+        if not subscriptions:
+            return None
+
+        now = self.hub.clock()
+        due = [x for x in subscriptions if x.due(now)]
+
+        if due:
+            for subscription in due:
+                subscription.last_time = now
+
+            # Prefer a value which arrived since the last read.
+            if self.fed is not None and self.fed[0] is not None and \
+                    (self.last_read is None or self.fed[1] > self.last_read):
+                value, self.last_read = self.fed
+            else:
+                self.last_read = now
+
+                try:
+                    value = self.resource.value
+                except Exception as e:
+                    log.error('Could not obtain resource value: {0!r}'.format(e))
+                    due = []
+
+            with self.hub.lock:
+                for subscription in due:
+                    # Skip anything that has moved on in the meantime.
+                    if subscription.resource is self.resource:
+                        subscription.callback(value)
+
+        return min(x.delay.value for x in subscriptions)
+
+    def run(self):
+        while not self.done:
+            delay = self.poll()
+            if delay is None:
+                return
+
+            self.wake.wait(delay)
+            self.wake.clear()
+
+
+class AcquisitionHub(object):
+    """
+    Share the values of resources between everything that acquires them periodically.
+
+    Each resource is read by a single poller, no matter how many subscribers it has.
+    """
+
+    def __init__(self):
+        self.lock = RLock()
+
+        # Where the pollers get the time.
+        self.clock = time.time
+
+        # Subscriptions and pollers, keyed by resource.
+        self._subscriptions = {}
+        self._pollers = {}
+
+    def subscribe(self, delay, callback, resource=None, running_lock=None):
+        """
+        Call the callback with a fresh value from the resource once every delay.
+
+        An optional running lock pauses the subscription while it is held elsewhere.
+        """
+
+        subscription = AcquisitionSubscription(self, delay, callback, running_lock)
+        subscription.resource = resource
+
+        return subscription
+
+    def subscriptions(self, resource):
+        with self.lock:
+            return list(self._subscriptions.get(resource, []))
+
+    def feed(self, resource, value):
+        """
+        Offer a value of the resource which was obtained elsewhere, so that it need not be read again.
+
+        None, as left by a failed read, is not a value.
+        """
+
+        if value is None:
+            return
+
+        with self.lock:
+            try:
+                self._pollers[resource].fed = (value, self.clock())
+            except KeyError:
+                pass
+
+    def _wake(self, resource):
+        with self.lock:
+            try:
+                self._pollers[resource].wake.set()
+            except KeyError:
+                pass
+
+    def _start_poller(self, poller):
+        poller.start()
+
+    def _move(self, subscription, resource):
+        """
+        Move the subscription from its current resource to the given one.
+        """
+
+        with self.lock:
+            old = subscription.resource
+
+            if old is not None:
+                self._subscriptions[old].remove(subscription)
+
+                if not self._subscriptions[old]:
+                    del self._subscriptions[old]
+
+                    poller = self._pollers.pop(old)
+                    poller.done = True
+                    poller.wake.set()
+
+            subscription._resource = resource
+            subscription.last_time = None
+
+            if resource is not None:
+                self._subscriptions.setdefault(resource, []).append(subscription)
+
+                if resource not in self._pollers:
+                    poller = ResourcePoller(self, resource)
+                    self._pollers[resource] = poller
+                    self._start_poller(poller)
+                else:
+                    self._pollers[resource].wake.set()
+
+    def close(self):
+        """
+        Stop all the pollers.
+        """
+
+        with self.lock:
+            for subscriptions in list(self._subscriptions.values()):
+                for subscription in list(subscriptions):
+                    subscription.close()
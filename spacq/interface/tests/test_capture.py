@@ -0,0 +1,157 @@
+import csv
+from nose.tools import assert_raises, eq_
+from numpy import array, column_stack, linspace
+from numpy.lib import format as npy_format
+from os import path
+import shutil
+import tempfile
+from unittest import main, TestCase
+
+from ..columns import find_type
+from ..list_columns import ListParser
+
+from .. import capture
+
+
+class CaptureTest(TestCase):
+	def setUp(self):
+		self.dir = tempfile.mkdtemp()
+		self.path = path.join(self.dir, 'test.{0}'.format(capture.extension))
+
+	def tearDown(self):
+		shutil.rmtree(self.dir)
+
+	def testRoundTrip(self):
+		"""
+		Write some blocks and read them back.
+		"""
+
+		rows = [[0.5 * i, i, [(1.0, 2.0 * i)]] for i in range(10)]
+
+		with capture.CaptureWriter(self.path, ['Time (s)', 'A (V)', 'B'], [None, 'V', None],
+				metadata={'name': 'test'}, block_size=3) as w:
+			w.write_rows(rows)
+
+		header, columns = capture.read_capture(self.path)
+
+		eq_(header['headings'], ['Time (s)', 'A (V)', 'B'])
+		eq_(header['units'], [None, 'V', None])
+		eq_(header['metadata'], {'name': 'test'})
+		eq_(header['list_columns'], [2])
+
+		eq_(columns[0].dtype.name, 'float64')
+		eq_(columns[0].tolist(), [0.5 * i for i in range(10)])
+		eq_(columns[1].tolist(), list(range(10)))
+		eq_(columns[2].dtype.kind, 'U')
+		eq_(columns[2].tolist(), ['[(1.0, {0!r})]'.format(2.0 * i) for i in range(10)])
+
+	def testTypeChange(self):
+		"""
+		A scalar column which later holds other values.
+		"""
+
+		with capture.CaptureWriter(self.path, ['A', 'Status', 'B'], block_size=2) as w:
+			w.write_rows([[0.0, 1.0, 5.0], [1.0, 2.0, 6.0], [2.0, 3.0, 7.0]])
+			w.write_row([3.0, 'overload', None])
+			w.write_rows([[4.0, 5.0, 8.0], [5.0, 'ok', 9.0]])
+
+		header, columns = capture.read_capture(self.path)
+
+		eq_(header['scalar_columns'], [0])
+		eq_(header['list_columns'], [1, 2])
+
+		eq_(columns[0].dtype.name, 'float64')
+		eq_(columns[0].tolist(), [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+		eq_(columns[1].tolist(), ['1.0', '2.0', '3.0', 'overload', '5.0', 'ok'])
+		eq_(columns[2].tolist(), ['5.0', '6.0', '7.0', 'None', '8.0', '9.0'])
+
+		eq_(list(capture.capture_to_rows(self.path))[4], ['3.0', 'overload', 'None'])
+
+	def testEmpty(self):
+		"""
+		A capture without any rows.
+		"""
+
+		capture.CaptureWriter(self.path, ['A', 'B']).close()
+
+		header, columns = capture.read_capture(self.path)
+
+		eq_(header['headings'], ['A', 'B'])
+		eq_([len(x) for x in columns], [0, 0])
+
+	def testCSV(self):
+		"""
+		Convert to CSV.
+		"""
+
+		with capture.CaptureWriter(self.path, ['A', 'B']) as w:
+			w.write_rows([[1.0, 2.5], [3.0, -4.0]])
+
+		csv_path = path.join(self.dir, 'test.csv')
+		capture.capture_to_csv(self.path, csv_path)
+
+		with open(csv_path) as f:
+			eq_(f.read(), 'A,B\n1.0,2.5\n3.0,-4.0\n')
+
+	def testWaveformCSV(self):
+		"""
+		Long waveforms are written out in full, in a form which can be read back as a list column.
+		"""
+
+		waveform = column_stack((linspace(0, 1e-6, 2000), linspace(-1, 1, 2000)))
+
+		with capture.CaptureWriter(self.path, ['A', 'Waveform']) as w:
+			w.write_rows([[1.0, waveform], [2.0, waveform[:3]]])
+
+		csv_path = path.join(self.dir, 'test.csv')
+		capture.capture_to_csv(self.path, csv_path)
+
+		with open(csv_path) as f:
+			rows = list(csv.reader(f))
+
+		eq_(rows[0], ['A', 'Waveform'])
+		eq_(find_type(rows[1][1]), 'list')
+		eq_(ListParser()(rows[1][1]), [tuple(x) for x in waveform.tolist()])
+		eq_(ListParser()(rows[2][1]), [tuple(x) for x in waveform[:3].tolist()])
+
+	def testNoPickle(self):
+		"""
+		Object arrays are neither written nor read.
+		"""
+
+		with capture.CaptureWriter(self.path, ['A', 'B']) as w:
+			w.write_rows([[1.0, [(0.0, 1.0)]], [2.0, 'text']])
+
+		with capture.CaptureReader(self.path) as r:
+			eq_(r.count_rows(), 2)
+
+			for block in r.blocks():
+				for column in block:
+					assert column.dtype.kind in 'fU'
+
+		# A pickled block, as an object array would be written.
+		with capture.CaptureWriter(self.path, ['A']) as w:
+			w.write_row([1.0])
+
+		with open(self.path, 'ab') as f:
+			npy_format.write_array(f, array([[None]], dtype=object), allow_pickle=True)
+
+		assert_raises(ValueError, capture.read_capture, self.path)
+
+	def testInvalid(self):
+		"""
+		Rows of the wrong size, and files of the wrong type.
+		"""
+
+		with capture.CaptureWriter(self.path, ['A', 'B']) as w:
+			assert_raises(ValueError, w.write_row, [1.0])
+
+		csv_path = path.join(self.dir, 'test.csv')
+		with open(csv_path, 'w') as f:
+			f.write('A,B\n1,2\n')
+
+		assert_raises(ValueError, capture.read_capture, csv_path)
+
+
+if __name__ == '__main__':
+	main()
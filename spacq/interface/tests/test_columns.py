@@ -0,0 +1,116 @@
+from nose.tools import assert_raises, eq_
+from numpy import array
+from numpy.testing import assert_array_equal
+from unittest import main, TestCase
+
+from .. import columns
+
+
+class FindTypeTest(TestCase):
+	def testTypes(self):
+		"""
+		Recognize each type of value.
+		"""
+
+		eq_(columns.find_type('1.5e3'), 'scalar')
+		eq_(columns.find_type('[(1, 2), (3, 4)]'), 'list')
+		eq_(columns.find_type('abc'), 'string')
+
+
+class ColumnStoreTest(TestCase):
+	rows = [
+		['1', '[(0, 1)]', 'a', '5'],
+		['2', '[(0, 2)]', 'b', 'x'],
+		['3.5', '[(0, 3)]', 'c', '7'],
+	]
+
+	def testFromRows(self):
+		"""
+		Columns are parsed once, by type.
+		"""
+
+		data = columns.ColumnStore.from_rows(['A', 'B', 'C', 'D'], self.rows)
+
+		eq_(data.shape, (3, 4))
+		# The last column is not entirely numeric.
+		eq_(data.types, ['scalar', 'list', 'string', 'string'])
+
+		eq_(data.column(0).dtype, float)
+		assert_array_equal(data.column(0), [1, 2, 3.5])
+		eq_(list(data.column(1)), ['[(0, 1)]', '[(0, 2)]', '[(0, 3)]'])
+		eq_(list(data.column(3)), ['5', 'x', '7'])
+
+		empty = columns.ColumnStore.from_rows(['A'], [])
+		eq_(empty.shape, (0, 1))
+
+	def testFromArray(self):
+		"""
+		Numeric arrays become scalar columns.
+		"""
+
+		data = columns.ColumnStore.from_array(['x', 'y'], array([[1, 2], [3, 4]]))
+		eq_(data.types, ['scalar', 'scalar'])
+		assert_array_equal(data.column(1), [2.0, 4.0])
+
+		assert columns.ColumnStore.from_array(['x', 'y'], data) is data
+
+		eq_(columns.ColumnStore.from_array([], []).shape, (0, 0))
+
+		data = columns.ColumnStore.from_array(['x', 'y'], array([['1', 'a'], ['2', 'b']]))
+		eq_(data.types, ['scalar', 'string'])
+
+	def testIndexing(self):
+		"""
+		Select columns and rows.
+		"""
+
+		data = columns.ColumnStore.from_rows(['A', 'B', 'C', 'D'], self.rows)
+
+		assert_array_equal(data[:,0], [1, 2, 3.5])
+
+		subset = data[:,[2, 0]]
+		eq_(subset.headings, ['C', 'A'])
+		eq_(subset.types, ['string', 'scalar'])
+
+		filtered = data.take([True, False, True])
+		eq_(len(filtered), 2)
+		assert_array_equal(filtered.column(0), [1, 3.5])
+		eq_(list(filtered.column(2)), ['a', 'c'])
+
+		assert_array_equal(data[[2, 0]].column(0), [3.5, 1])
+		assert_array_equal(data[1:,0], [2, 3.5])
+
+		eq_(list(data.rows())[1], (2.0, '[(0, 2)]', 'b', 'x'))
+		eq_(data.row(2), (3.5, '[(0, 3)]', 'c', '7'))
+
+	def testWithColumn(self):
+		"""
+		Add a computed column.
+		"""
+
+		data = columns.ColumnStore.from_rows(['A'], [['1'], ['2']])
+		result = data.with_column('2A', [[2], [4]])
+
+		eq_(result.headings, ['A', '2A'])
+		eq_(result.types, ['scalar', 'scalar'])
+		assert_array_equal(result.column(1), [2, 4])
+
+		# The original is unchanged.
+		eq_(data.headings, ['A'])
+
+		assert_raises(ValueError, data.with_column, 'B', [1, 2, 3])
+
+	def testFormat(self):
+		"""
+		Cells are formatted on demand.
+		"""
+
+		data = columns.ColumnStore.from_rows(['A', 'B'], [['0.123456789012', 'abcdefghijkl']])
+
+		eq_(data.format_cell(0, 0), '0.123456789012')
+		eq_(data.format_cell(0, 0, 5), '0.123')
+		eq_(data.format_cell(0, 1, 3), 'abc')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,61 @@
+from nose.tools import assert_raises, eq_
+from numpy import array
+from numpy.testing import assert_array_almost_equal
+import time
+from unittest import main, TestCase
+
+from .. import expression
+
+
+class ExpressionTest(TestCase):
+	def testEvaluate(self):
+		"""
+		Evaluate over whole arrays.
+		"""
+
+		x, y = array([3., 0., -1.]), array([4., 1., 0.])
+
+		f = expression.Expression('sqrt(X ** 2 + Y ** 2)', ['X', 'Y'])
+		assert_array_almost_equal(f(X=x, Y=y), [5, 1, 1])
+
+		f = expression.Expression('where(X > 0, log10(X), -X) * pi', ['X'])
+		assert_array_almost_equal(f(X=x), [0.4771213 * 3.1415927, 0, 3.1415927])
+
+		f = expression.Expression('1 / X', ['X'])
+		assert_array_almost_equal(f(X=x), [1 / 3., float('inf'), -1])
+
+		eq_(expression.Expression('2 * 3', [])(), 6)
+
+		assert_raises(ValueError, expression.Expression('X + Y', ['X', 'Y']), X=x)
+
+	def testLarge(self):
+		"""
+		Huge powers overflow rather than taking forever.
+		"""
+
+		start_time = time.time()
+		result = expression.Expression('9 ** 9 ** 9', [])()
+		eq_(result, float('inf'))
+
+		result = expression.Expression('X ** 9 ** 9 ** 9', ['X'])(X=array([2., 0.5]))
+		assert_array_almost_equal(result, [float('inf'), 0])
+
+		assert time.time() - start_time < 1
+
+		eq_(expression.Expression('1' + '0' * 400, [])(), float('inf'))
+
+		# Integer arithmetic gives the same values as before.
+		eq_(expression.Expression('7 // 2', [])(), 3)
+
+	def testRestricted(self):
+		"""
+		Only arithmetic on the given names is allowed.
+		"""
+
+		for text in ['X +', 'Y', 'X.T', 'open("f")', '__import__("os").system("true")', 'X[0]', 'lambda: 1',
+				'"a"', 'sqrt(X, out=X)', '[X]']:
+			assert_raises(ValueError, expression.Expression, text, ['X'])
+
+
+if __name__ == '__main__':
+	main()
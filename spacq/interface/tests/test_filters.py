@@ -0,0 +1,90 @@
+from nose.tools import assert_raises, eq_
+from numpy.testing import assert_array_equal
+from unittest import main, TestCase
+
+from ..columns import ColumnStore
+
+from .. import filters
+
+
+data = ColumnStore.from_rows(['x', 'y', 'name'], [
+	['-2', '4', 'a'],
+	['-1', '1', 'b'],
+	['0', '0', 'c'],
+	['1', '1', 'd'],
+	['2', '4', 'e'],
+])
+
+
+class ColumnFilterTest(TestCase):
+	def testExpressions(self):
+		"""
+		Evaluate over whole columns.
+		"""
+
+		def check(text, expected, column=0):
+			assert_array_equal(filters.ColumnFilter(text, column)(data), expected)
+
+		check('# > 0', [False, False, False, True, True])
+		check('abs(#) <= 1', [False, True, True, True, False])
+		check('-1 < # < 2', [False, False, True, True, False])
+		check('# < -1 or # > 1', [True, False, False, False, True])
+		check('not # == 0 and # ** 2 != 4', [False, True, False, True, False])
+		check('i % 2 == 0', [True, False, True, False, True])
+		check('sqrt(#) == 2', [True, False, False, False, True], column=1)
+		check('# / 0 > 0', [False, False, False, True, True])
+		check('True', [True] * 5)
+
+	def testRestricted(self):
+		"""
+		Anything beyond simple expressions is refused.
+		"""
+
+		for text in ['# >', '__import__("os")', 'x > 0', '#.real', '[#]', 'abs(#, x=1)', '# in (1, 2)',
+				'"a" == #']:
+			assert_raises(ValueError, filters.ColumnFilter, text, 0)
+
+		assert_raises(ValueError, filters.ColumnFilter('# > 0', 2), data)
+
+
+class FilterStackTest(TestCase):
+	def testStack(self):
+		"""
+		Filters combine, and may be changed one at a time.
+		"""
+
+		calls = []
+
+		def counted(text, column=0):
+			f = filters.ColumnFilter(text, column)
+
+			def wrapped(data):
+				calls.append(text)
+				return f(data)
+
+			return wrapped
+
+		stack = filters.FilterStack(data)
+		assert stack.filtered() is data
+
+		stack.set('positive', counted('# >= 0'))
+		stack.set('small', counted('# < 4', 1))
+		eq_(list(stack.filtered().column(2)), ['c', 'd'])
+
+		stack.set('small', counted('# < 2', 1))
+		eq_(list(stack.filtered().column(2)), ['c', 'd'])
+		stack.set('positive', counted('# > 0'))
+		eq_(list(stack.filtered().column(2)), ['d'])
+
+		stack.remove('positive')
+		eq_(list(stack.filtered().column(2)), ['b', 'c', 'd'])
+		stack.remove('missing')
+
+		# Each filter is evaluated only when it is set.
+		eq_(calls, ['# >= 0', '# < 4', '# < 2', '# > 0'])
+
+		assert_raises(ValueError, stack.set, 'bad', lambda data: [True])
+
+
+if __name__ == '__main__':
+	main()
@@ -1,4 +1,5 @@
 from nose.tools import assert_raises, eq_
+from numpy import column_stack, linspace
 from unittest import main, TestCase
 
 from .. import list_columns
@@ -44,5 +45,20 @@ class ListParserTest(TestCase):
 			assert_raises(ValueError, lp, lst)
 
 
+
+class FormatListTest(TestCase):
+	def testArray(self):
+		"""
+		Format an array of rows, longer than NumPy would print in full.
+		"""
+
+		waveform = column_stack((linspace(0, 1, 1500), linspace(-1, 0, 1500)))
+
+		result = list_columns.format_list(waveform)
+
+		eq_(list_columns.ListParser()(result), [tuple(x) for x in waveform.tolist()])
+		eq_(list_columns.format_list([(1.0, 2.0)]), '[(1.0, 2.0)]')
+
+
 if __name__ == '__main__':
 	main()
@@ -0,0 +1,216 @@
+from io import BytesIO
+from nose.tools import eq_
+from numpy import column_stack, linspace, memmap
+from numpy.testing import assert_array_equal
+from os import path
+import shutil
+import tempfile
+from unittest import main, TestCase
+
+from ..columns import ColumnStore, find_type
+from ..list_columns import ListParser
+
+from .. import capture, loader
+
+
+class CountLinesTest(TestCase):
+	def testCount(self):
+		eq_(loader.count_lines(BytesIO(b'')), 0)
+		eq_(loader.count_lines(BytesIO(b'a\nb\n')), 2)
+		eq_(loader.count_lines(BytesIO(b'a\nb'), block_size=1), 2)
+
+
+class TableLoaderTest(TestCase):
+	def setUp(self):
+		self.dir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.dir)
+
+	def write(self, text, name='test.csv'):
+		p = path.join(self.dir, name)
+
+		with open(p, 'w') as f:
+			f.write(text)
+
+		return p
+
+	def load(self, p, **kwargs):
+		errors = []
+
+		l = loader.TableLoader(p, exception_callback=errors.append, **kwargs)
+		l.start()
+		l.join()
+
+		if errors:
+			raise errors[0]
+
+		return l
+
+	def testChunks(self):
+		"""
+		Load in several chunks, with progress.
+		"""
+
+		rows = [['{0}'.format(i), '{0}'.format(0.5 * i), '[(0, {0})]'.format(i), 'x{0}'.format(i)]
+				for i in range(25)]
+		p = self.write('a,b,c,d\n' + '\n'.join(','.join('"{0}"'.format(x) for x in row) for row in rows) + '\n')
+
+		progress, done = [], []
+		l = self.load(p, chunk_size=10, progress_callback=lambda *args: progress.append(args),
+				done_callback=lambda: done.append(True))
+
+		eq_(progress, [(10, 25), (20, 25), (25, 25)])
+		eq_(done, [True])
+		eq_(l.has_header, True)
+
+		data = l.data
+		expected = ColumnStore.from_rows(['a', 'b', 'c', 'd'], rows)
+
+		eq_(data.headings, expected.headings)
+		eq_(data.types, ['scalar', 'scalar', 'list', 'string'])
+		for i in range(4):
+			assert_array_equal(data.column(i), expected.column(i))
+
+		# Scalars are kept out of memory.
+		assert isinstance(data.column(0).base, memmap)
+
+	def testNoHeader(self):
+		"""
+		An empty first row means that there are no headings; blank lines are skipped.
+		"""
+
+		p = self.write('\n1,2\n\n3,4\n')
+		l = self.load(p)
+
+		eq_(l.has_header, False)
+		eq_(l.data.headings, ['', ''])
+		assert_array_equal(l.data.column(1), [2, 4])
+
+	def testEmpty(self):
+		eq_(self.load(self.write('')).data.shape, (0, 0))
+		eq_(self.load(self.write('a,b\n')).data.shape, (0, 2))
+
+	def testMixed(self):
+		"""
+		A scalar column with a later non-numeric value becomes a string column.
+		"""
+
+		p = self.write('a,b\n1,1\n2,2\n3,x\n4,4\n')
+		l = self.load(p, chunk_size=2)
+
+		eq_(l.data.types, ['scalar', 'string'])
+		eq_(list(l.data.column(1)), ['1.0', '2.0', 'x', '4'])
+
+	def testUnderestimate(self):
+		"""
+		Rows beyond the estimated count are still loaded.
+		"""
+
+		p = self.write('a\r1\r2\r3\r')
+		l = self.load(p, chunk_size=2)
+
+		assert_array_equal(l.data.column(0), [1, 2, 3])
+
+	def testCancel(self):
+		"""
+		Loading stops after the current chunk.
+		"""
+
+		p = self.write('a\n' + '\n'.join(str(i) for i in range(100)) + '\n')
+
+		l = loader.TableLoader(p, chunk_size=10)
+		l.progress_callback = lambda loaded, total: l.cancel()
+		l.start()
+		l.join()
+
+		assert l.cancelled
+		eq_(len(l.data), 10)
+
+	def testBad(self):
+		"""
+		Problems are reported as IOError.
+		"""
+
+		errors = []
+		l = loader.TableLoader(self.write('a,b\n1,2\n3\n'), exception_callback=errors.append)
+		l.start()
+		l.join()
+
+		eq_(len(errors), 1)
+		assert isinstance(errors[0], IOError)
+
+	def testCapture(self):
+		p = path.join(self.dir, 'test.{0}'.format(capture.extension))
+
+		with capture.CaptureWriter(p, ['A', 'B']) as w:
+			w.write_rows([[i, [(0.0, i)]] for i in range(5)])
+
+		l = self.load(p)
+
+		eq_(l.data.headings, ['A', 'B'])
+		eq_(l.data.types, ['scalar', 'list'])
+		assert_array_equal(l.data.column(0), list(range(5)))
+		eq_(l.data.column(1)[2], '[(0.0, 2)]')
+
+	def testCaptureBlocks(self):
+		"""
+		Load a capture file a block at a time, with progress.
+		"""
+
+		p = path.join(self.dir, 'test.{0}'.format(capture.extension))
+
+		with capture.CaptureWriter(p, ['A', 'B'], block_size=3) as w:
+			w.write_rows([[0.5 * i, [(0.0, i)]] for i in range(10)])
+
+		progress = []
+		l = self.load(p, progress_callback=lambda *args: progress.append(args))
+
+		eq_(progress, [(3, 10), (6, 10), (9, 10), (10, 10)])
+		assert isinstance(l.columns[0], memmap)
+		assert_array_equal(l.data.column(0), [0.5 * i for i in range(10)])
+		eq_(list(l.data.column(1)), ['[(0.0, {0})]'.format(i) for i in range(10)])
+
+	def testCaptureCancel(self):
+		p = path.join(self.dir, 'test.{0}'.format(capture.extension))
+
+		with capture.CaptureWriter(p, ['A'], block_size=2) as w:
+			w.write_rows([[i] for i in range(10)])
+
+		l = loader.TableLoader(p, progress_callback=lambda *args: l.cancel())
+		l.start()
+		l.join()
+
+		eq_(len(l.data), 2)
+
+	def testCaptureTypeChange(self):
+		p = path.join(self.dir, 'test.{0}'.format(capture.extension))
+
+		with capture.CaptureWriter(p, ['A', 'B']) as w:
+			w.write_rows([[0.0, 1.0], [1.0, 'overload']])
+
+		l = self.load(p)
+
+		eq_(l.data.types, ['scalar', 'string'])
+		eq_(list(l.data.column(1)), ['1.0', 'overload'])
+
+	def testCaptureWaveform(self):
+		"""
+		Long waveforms from a capture file are not abbreviated.
+		"""
+
+		p = path.join(self.dir, 'test.{0}'.format(capture.extension))
+		waveform = column_stack((linspace(0, 1, 2000), linspace(1, 2, 2000)))
+
+		with capture.CaptureWriter(p, ['A', 'B']) as w:
+			w.write_rows([[0.0, waveform]])
+
+		l = self.load(p)
+
+		eq_(l.data.types, ['scalar', 'list'])
+		eq_(find_type(l.data.column(1)[0]), 'list')
+		eq_(ListParser()(l.data.column(1)[0]), [tuple(x) for x in waveform.tolist()])
+
+
+if __name__ == '__main__':
+	main()
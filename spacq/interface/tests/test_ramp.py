@@ -0,0 +1,241 @@
+from nose.tools import assert_raises, eq_
+from threading import RLock
+import time
+from unittest import main, TestCase
+
+from ..resources import Resource
+from ..units import Quantity
+
+from .. import ramp
+
+
+class Recorder(object):
+	"""
+	Remembers every value written to it.
+	"""
+
+	def __init__(self):
+		self.values = []
+
+	def set(self, value):
+		self.values.append(value)
+
+
+class BufferingDevice(object):
+	"""
+	A device which can buffer writes into a multi-command message.
+	"""
+
+	def __init__(self, supported=True):
+		self.supported = supported
+		self.lock = RLock()
+
+		self.buffer = None
+		self.messages = []
+
+	def multi_command_start(self):
+		if not self.supported:
+			raise NotImplementedError()
+
+		self.buffer = []
+
+	def multi_command_cancel(self):
+		self.buffer = None
+
+	def multi_command_stop(self):
+		self.messages.append(';'.join(self.buffer))
+		self.buffer = None
+
+	def write(self, message):
+		if self.buffer is not None:
+			self.buffer.append(message)
+		else:
+			self.messages.append(message)
+
+	def resource(self, name):
+		res = Resource(self, setter=lambda value: self.write('{0} {1}'.format(name, value)))
+		res.combinable_write = True
+
+		return res
+
+
+class RampTest(TestCase):
+	def testLockstep(self):
+		"""
+		Step several resources together.
+		"""
+
+		rec1, rec2 = Recorder(), Recorder()
+
+		r = ramp.Ramp(delay=0)
+		r.add(Resource(setter=rec1.set), 0, 4, 5)
+		r.add(Resource(setter=rec2.set), 1.0, 0, 3)
+
+		eq_(len(r), 5)
+
+		r.run()
+
+		eq_(rec1.values, [0, 1, 2, 3, 4])
+		eq_(rec2.values, [1, 0.5, 0])
+
+	def testQuantities(self):
+		"""
+		A bare 0 takes on the units of the other end.
+		"""
+
+		rec = Recorder()
+		res = Resource(setter=rec.set)
+		res.units = 'V'
+
+		r = ramp.Ramp(delay=0)
+		r.add(res, Quantity('2 mV'), 0, 3)
+		r.run()
+
+		eq_(rec.values, [Quantity('2 mV'), Quantity('1 mV'), Quantity('0 mV')])
+
+		assert_raises(TypeError, r.add, res, Quantity('2 mV'), 1, 3)
+
+	def testRate(self):
+		"""
+		The steps follow from the maximum rate.
+		"""
+
+		r = ramp.Ramp(delay=0.1)
+
+		# 1 V at 2 V/s is 0.5 s, or 5 steps after the first.
+		target = r.add(Resource(setter=Recorder().set), Quantity('0 V'), Quantity('1 V'), 1000,
+				max_rate=Quantity(2, 'V.s-1'))
+		eq_(len(target), 6)
+
+		# The rate of the resource is used by default.
+		res = Resource(setter=Recorder().set)
+		res.max_rate = Quantity(5, 'mV.s-1')
+		target = r.add(res, Quantity('0 mV'), Quantity('-2 mV'))
+		eq_(len(target), 5)
+
+		target = r.add(Resource(setter=Recorder().set), 0, 3, max_rate=10)
+		eq_(len(target), 4)
+
+		assert_raises(ValueError, r.add, Resource(setter=Recorder().set), 0, 1)
+		assert_raises(ValueError, r.add, Resource(setter=Recorder().set), 0, 1, max_rate=0)
+
+	def testSchedule(self):
+		"""
+		Slow writes do not make the ramp take longer.
+		"""
+
+		delay = 0.05
+
+		def slow_set(value):
+			time.sleep(delay / 2)
+
+		r = ramp.Ramp(delay=delay)
+		r.add(Resource(setter=slow_set), 0, 1, 6)
+
+		start_time = time.time()
+		r.run()
+		elapsed = time.time() - start_time
+
+		assert 6 * delay <= elapsed < 8 * delay, elapsed
+
+	def testFailure(self):
+		"""
+		A failing resource is left alone, but the others continue.
+		"""
+
+		def bad_set(value):
+			if value > 1:
+				raise ValueError(value)
+
+		rec = Recorder()
+		errors = []
+
+		r = ramp.Ramp(delay=0)
+		r.add(Resource(setter=bad_set), 0, 4, 5, exception_callback=errors.append)
+		r.add(Resource(setter=rec.set), 0, 4, 5)
+		r.run()
+
+		eq_([str(e) for e in errors], ['2.0'])
+		eq_(rec.values, [0, 1, 2, 3, 4])
+
+	def testCombined(self):
+		"""
+		Writes to the same device are sent as a single message.
+		"""
+
+		dev = BufferingDevice()
+
+		r = ramp.Ramp(delay=0)
+		r.add(dev.resource('a'), 0, 2, 3)
+		r.add(dev.resource('b'), 2, 0, 3)
+		r.run()
+
+		eq_(dev.messages, ['a 0.0;b 2.0', 'a 1.0;b 1.0', 'a 2.0;b 0.0'])
+
+	def testCombinedFailure(self):
+		"""
+		A message is not sent if one of the writes in it fails.
+		"""
+
+		dev = BufferingDevice()
+		errors = []
+
+		def bad_set(value):
+			dev.write('a {0}'.format(value))
+
+			if value > 0:
+				raise ValueError(value)
+
+		bad = Resource(dev, setter=bad_set)
+		bad.combinable_write = True
+
+		r = ramp.Ramp(delay=0)
+		r.add(bad, 0, 2, 3, exception_callback=errors.append)
+		r.add(dev.resource('b'), 2, 0, 3)
+		r.run()
+
+		eq_([str(e) for e in errors], ['1.0'])
+		eq_(dev.messages, ['a 0.0;b 2.0', 'b 1.0', 'b 0.0'])
+		eq_(dev.buffer, None)
+
+	def testCombinedUnsupported(self):
+		"""
+		Writes are made individually if the device cannot buffer them.
+		"""
+
+		dev = BufferingDevice(supported=False)
+
+		r = ramp.Ramp(delay=0)
+		r.add(dev.resource('a'), 0, 1, 2)
+		r.add(dev.resource('b'), 1, 0, 2)
+		r.run()
+
+		eq_(dev.messages, ['a 0.0', 'b 1.0', 'a 1.0', 'b 0.0'])
+		eq_(r.combine_unsupported, set([dev]))
+
+	def testRunTasks(self):
+		"""
+		The writes for each step are handed off together.
+		"""
+
+		stages = []
+
+		def run_tasks(stage, tasks):
+			stages.append((stage, len(tasks)))
+
+			for _, f, args, kwargs in tasks:
+				f(*args, **kwargs)
+
+		rec1, rec2 = Recorder(), Recorder()
+
+		r = ramp.Ramp(delay=0, run_tasks=run_tasks)
+		r.add(Resource(setter=rec1.set), 0, 1, 2)
+		r.add(Resource(setter=rec2.set), 0, 2, 3)
+		r.run()
+
+		eq_(stages, [('ramp', 2), ('ramp', 2), ('ramp', 1)])
+		eq_(rec2.values, [0, 1, 2])
+
+
+if __name__ == '__main__':
+	main()
@@ -365,6 +365,35 @@ class ResourceTest(TestCase):
 		else:
 			assert False, 'Expected TypeError'
 
+	def testCache(self):
+		"""
+		Reuse values for a while.
+		"""
+
+		dev = CountingReads()
+		res = resources.Resource(dev, dev.get_x, dev.set_x)
+		wrapped = res.wrapped('negate', lambda x: -x)
+
+		# No caching by default.
+		eq_([res.value, res.value], [1, 2])
+		eq_((res.cache.hits, res.cache.misses), (0, 0))
+
+		res.ttl = 0.05
+
+		eq_([res.value, res.value, wrapped.value], [3, 3, -3])
+		eq_((res.cache.hits, res.cache.misses), (2, 1))
+
+		time.sleep(0.06)
+		eq_(wrapped.value, -4)
+
+		# Writing invalidates.
+		wrapped.value = 0
+		eq_(res.value, 1)
+		eq_((res.cache.hits, res.cache.misses), (2, 3))
+
+		res.ttl = None
+		eq_([res.value, res.value], [2, 3])
+
 
 class AcquisitionThreadTest(TestCase):
 	def testWithoutResource(self):
@@ -453,5 +482,216 @@ class AcquisitionThreadTest(TestCase):
 		eq_(buf, [])
 
 
+class CountingReads(object):
+	def __init__(self):
+		self.reads = 0
+
+	def get_x(self):
+		self.reads += 1
+
+		return self.reads
+
+	def set_x(self, value):
+		self.reads = value
+
+
+class ManualHub(resources.AcquisitionHub):
+	"""
+	A hub whose pollers are run by hand, with a clock that only moves when told to.
+	"""
+
+	def __init__(self):
+		resources.AcquisitionHub.__init__(self)
+
+		self.now = 0.0
+		self.clock = lambda: self.now
+
+	def _start_poller(self, poller):
+		pass
+
+	def poll(self, resource, seconds=0.0):
+		"""
+		Move the clock ahead, and run the poller of the resource once.
+		"""
+
+		self.now += seconds
+
+		with self.lock:
+			poller = self._pollers.get(resource)
+
+		if poller is not None:
+			poller.poll()
+
+
+class AcquisitionHubTest(TestCase):
+	def testShared(self):
+		"""
+		Several subscribers to one resource.
+		"""
+
+		dev = CountingReads()
+		res = resources.Resource(dev, dev.get_x)
+
+		hub = ManualHub()
+
+		fast, slow = [], []
+		delay = Quantity(30, 'ms')
+
+		sub1 = hub.subscribe(delay, fast.append, res)
+		sub2 = hub.subscribe(delay * 2, slow.append, res)
+
+		hub.poll(res)
+		for _ in range(4):
+			hub.poll(res, delay.value)
+
+		hub.close()
+
+		eq_(sub1.resource, None)
+		eq_(sub2.resource, None)
+
+		# A single read for both subscribers.
+		eq_(dev.reads, 5)
+		eq_(fast, [1, 2, 3, 4, 5])
+		eq_(slow, [1, 3, 5])
+
+	def testPaused(self):
+		"""
+		Pause one of the subscribers with a lock.
+		"""
+
+		dev = CountingReads()
+		res = resources.Resource(dev, dev.get_x)
+		lock = Lock()
+
+		hub = ManualHub()
+
+		buf = []
+		delay = Quantity(30, 'ms')
+
+		lock.acquire()
+		sub = hub.subscribe(delay, buf.append, res, running_lock=lock)
+
+		hub.poll(res)
+		hub.poll(res, delay.value)
+		lock.release()
+		hub.poll(res, delay.value)
+		hub.poll(res, delay.value)
+		sub.close()
+
+		# Nothing is read while nobody is listening.
+		eq_(dev.reads, 2)
+		eq_(buf, [1, 2])
+
+	def testFeed(self):
+		"""
+		Values obtained elsewhere are used instead of reading.
+		"""
+
+		dev = CountingReads()
+		res = resources.Resource(dev, dev.get_x)
+
+		hub = ManualHub()
+
+		buf = []
+		delay = Quantity(30, 'ms')
+
+		sub = hub.subscribe(delay, buf.append, res)
+
+		hub.poll(res)
+		hub.now += delay.value * 0.5
+		hub.feed(res, -1)
+		hub.poll(res, delay.value * 0.5)
+		hub.now += delay.value * 0.5
+		hub.feed(res, -2)
+		hub.poll(res, delay.value * 0.5)
+		sub.close()
+
+		eq_(buf, [1, -1, -2])
+		eq_(dev.reads, 1)
+
+	def testFeedNone(self):
+		"""
+		A failed read elsewhere does not stand in for a value.
+		"""
+
+		dev = CountingReads()
+		res = resources.Resource(dev, dev.get_x)
+
+		hub = ManualHub()
+
+		buf = []
+		delay = Quantity(30, 'ms')
+
+		sub = hub.subscribe(delay, buf.append, res)
+
+		hub.poll(res)
+		hub.now += delay.value * 0.5
+		hub.feed(res, None)
+		hub.poll(res, delay.value * 0.5)
+
+		# Even if it gets to the poller some other way.
+		hub._pollers[res].fed = (None, hub.now)
+		hub.poll(res, delay.value)
+		sub.close()
+
+		eq_(buf, [1, 2, 3])
+		eq_(dev.reads, 3)
+
+	def testMove(self):
+		"""
+		Switch a subscriber between resources.
+		"""
+
+		dev1, dev2 = CountingReads(), CountingReads()
+		res1 = resources.Resource(dev1, dev1.get_x)
+		res2 = resources.Resource(dev2, dev2.get_x)
+
+		hub = ManualHub()
+
+		buf = []
+		delay = Quantity(30, 'ms')
+
+		sub = hub.subscribe(delay, buf.append)
+		hub.poll(res1)
+		eq_(buf, [])
+
+		sub.resource = res1
+		hub.poll(res1)
+		hub.poll(res1, delay.value)
+		sub.resource = res2
+		hub.poll(res2, delay.value)
+		hub.poll(res2, delay.value)
+		sub.close()
+
+		eq_(buf, [1, 2, 1, 2])
+		eq_(dev1.reads, 2)
+		eq_(dev2.reads, 2)
+		eq_(hub.subscriptions(res1), [])
+
+	def testThreaded(self):
+		"""
+		The pollers run on their own.
+		"""
+
+		dev = CountingReads()
+		res = resources.Resource(dev, dev.get_x)
+
+		hub = resources.AcquisitionHub()
+
+		buf = []
+		sub = hub.subscribe(Quantity(10, 'ms'), buf.append, res)
+
+		for _ in range(100):
+			if len(buf) >= 2:
+				break
+
+			time.sleep(0.01)
+
+		sub.close()
+
+		assert len(buf) >= 2, buf
+		eq_(buf[:2], [1, 2])
+
+
 if __name__ == '__main__':
 	main()
@@ -1,5 +1,7 @@
 from copy import deepcopy
 from nose.tools import assert_raises, eq_
+import pickle
+import quantities as pq
 from unittest import main, TestCase
 
 from .. import units
@@ -246,6 +248,53 @@ class QuantityTest(TestCase):
 
 		eq_(deepcopy(q), units.Quantity('100 ns.V2'))
 
+	def testPickle(self):
+		"""
+		Pickle, including the old format with a quantities object.
+		"""
+
+		q = units.Quantity('-5 mG')
+
+		eq_(pickle.loads(pickle.dumps(q)), q)
+		eq_(str(pickle.loads(pickle.dumps(q))), '-5 mG')
+
+		old = units.Quantity.__new__(units.Quantity)
+		old.__setstate__({'_q': pq.Quantity(-5e-7, 'T'), 'original_units': 'mG', 'original_multiplier': -7.0})
+		eq_(old, q)
+		eq_(old.original_value, -5)
+
+	def testValueIn(self):
+		"""
+		Convert to other units.
+		"""
+
+		eq_(units.Quantity(0, 'mV').value_in('V'), 0)
+		eq_(units.Quantity(1500, 'mV').value_in('V'), 1.5)
+		eq_(units.Quantity(2, 'kg').value_in('g'), 2000)
+		assert_raises(units.IncompatibleDimensions, units.Quantity(1, 'V').value_in, 's')
+
+
+class QuantityArrayTest(TestCase):
+	def testArray(self):
+		"""
+		Many values with the same units.
+		"""
+
+		qa = units.QuantityArray([1, -2, 3.5], 'mV')
+
+		eq_(len(qa), 3)
+		eq_(list(qa.values), [1e-3, -2e-3, 3.5e-3])
+		eq_(list(qa.original_values), [1, -2, 3.5])
+		assert qa.assert_dimensions('V')
+		assert_raises(units.IncompatibleDimensions, qa.assert_dimensions, 's')
+
+		eq_(qa[1], units.Quantity(-2, 'mV'))
+		eq_(str(qa[2]), '3.5 mV')
+		eq_(list(qa[1:]), [units.Quantity(-2, 'mV'), units.Quantity(3.5, 'mV')])
+
+		for q, value in zip(qa, [1, -2, 3.5]):
+			eq_(q, units.Quantity(value, 'mV'))
+
 
 if __name__ == '__main__':
 	main()
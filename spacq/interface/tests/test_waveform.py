@@ -55,6 +55,28 @@ class GeneratorTest(TestCase):
 		eq_(wave, [0.0])
 		eq_(markers, {1: [True], 2: [False]})
 
+	def testLong(self):
+		"""
+		Generate a long waveform out of many pieces.
+		"""
+
+		wg = waveform.Generator(frequency=Quantity(1, 'GHz'))
+
+		for i in range(1000):
+			wg.marker(1, i % 2 == 0)
+			wg.square(1.0, Quantity(1, 'us'))
+			wg.delay(Quantity(1, 'us'))
+
+		wave, markers = wg.waveform
+
+		eq_(len(wave), 1000 * 2000)
+		eq_(len(markers[1]), len(wave))
+
+		eq_(list(wave[:1001]), [1.0] * 1000 + [0.0])
+		eq_(wave[1000:2000].sum(), 0.0)
+		eq_(markers[1][:2001], [True] * 2000 + [False])
+		eq_(markers[1][-1], False)
+
 	def testTooLong(self, dry_run=False):
 		"""
 		Try to create a waveform that is far too long.
@@ -1,9 +1,8 @@
 import logging
 log = logging.getLogger(__name__)
 
-from copy import deepcopy
 from math import log10
-from numpy import allclose
+from numpy import allclose, asarray
 import quantities as pq
 
 """
@@ -55,6 +54,58 @@ class SIValues(object):
 	units.update(['Hz', 'J', 'N', 'T', 'V', 'G'])
 
 
+class UnitInfo(object):
+	"""
+	Everything needed to create quantities with some units, worked out once.
+	"""
+
+	def __init__(self, units):
+		# Unit symbols without prefixes, and the power of 10 of the prefixes.
+		self.parsed_units, self.multiplier = Quantity.parse_units(units)
+
+		simplified = pq.Quantity(1.0, self.parsed_units).simplified
+
+		# Values are multiplied by this to normalize to SI base units.
+		self.factor = simplified.magnitude.tolist()
+		self.simplified_units = simplified.units
+		self.dimensionality = simplified.dimensionality
+		self.dimensions = frozenset(self.dimensionality.items())
+
+		# The power of 10 which takes normalized values back to the original units.
+		self.original_multiplier = self.multiplier
+		if self.factor != 1.0:
+			self.original_multiplier += log10(abs(self.factor))
+
+
+# Parsed units by unit string, along with the units that were valid at the time.
+unit_cache = {}
+unit_cache_units = set()
+
+
+def unit_info(units):
+	"""
+	The UnitInfo for a unit string, parsing it only the first time.
+	"""
+
+	global unit_cache_units
+
+	if SIValues.units != unit_cache_units:
+		unit_cache.clear()
+		unit_cache_units = set(SIValues.units)
+
+	try:
+		return unit_cache[units]
+	except KeyError:
+		pass
+	except TypeError:
+		# Not hashable, so not a valid unit string either.
+		raise ValueError('Invalid units: {0!r}'.format(units))
+
+	result = unit_cache[units] = UnitInfo(units)
+
+	return result
+
+
 class Quantity(object):
 	"""
 	A quantity with a value and dimensions.
@@ -141,24 +192,59 @@ class Quantity(object):
 		# Always work with single floats.
 		value = float(value)
 
-		log.debug('Creating Quantity: {0}, {1}'.format(value, units))
-
-		# Remove unit prefixes.
-		new_units, multiplier = self.parse_units(units)
-		new_value = value * (10 ** multiplier)
+		info = unit_info(units)
 
 		# Normalize to SI base units.
-		original_quantity = pq.Quantity(new_value, new_units)
-		self._q = original_quantity.simplified
+		self._info = info
+		self._value = value * (10 ** info.multiplier) * info.factor
 
 		# Information to restore original representation.
 		self.original_units = units
-		self.original_multiplier = multiplier
+		self.original_multiplier = info.original_multiplier
+
+	@classmethod
+	def from_base(cls, value, units):
+		"""
+		Create a quantity in the given units from a value already normalized to the SI base units.
+		"""
+
+		result = cls.__new__(cls)
+		result._info = unit_info(units)
+		result._value = float(value)
+		result.original_units = units
+		result.original_multiplier = result._info.original_multiplier
+
+		return result
+
+	def _with_value(self, value):
+		"""
+		A quantity like this one, but with a different normalized value.
+		"""
+
+		result = self.__class__.__new__(self.__class__)
+		result.__dict__.update(self.__dict__)
+		result._value = float(value)
+
+		return result
+
+	def __getstate__(self):
+		state = self.__dict__.copy()
+		del state['_info']
 
-		# Find the normalization factor.
-		q, orig = self._q.magnitude, original_quantity.magnitude
-		if q != orig:
-			self.original_multiplier += log10(abs(q)) - log10(abs(orig))
+		return state
+
+	def __setstate__(self, state):
+		if '_q' in state:
+			# Pickled before the normalized value was stored directly.
+			state = state.copy()
+			state['_value'] = float(state.pop('_q').magnitude)
+
+		self.__dict__.update(state)
+		self._info = unit_info(self.original_units)
+
+	@property
+	def _q(self):
+		return pq.Quantity(self._value, self._info.simplified_units)
 
 	@property
 	def dimensions(self):
@@ -166,15 +252,15 @@ class Quantity(object):
 		The set of simplified units and their exponents.
 		"""
 
-		return set(self._q.dimensionality.items())
-	
+		return self._info.dimensions
+
 	@property
 	def dimensions_string(self):
 		"""
 		Returns the simplified units and their exponents in string form.
 		"""
-		
-		return self._q.dimensionality
+
+		return self._info.dimensionality
 
 	@property
 	def value(self):
@@ -182,9 +268,7 @@ class Quantity(object):
 		The magnitude of the quantity, normalized to the base units.
 		"""
 
-		result = self._q.magnitude
-
-		return result.tolist()
+		return self._value
 
 	@property
 	def original_value(self):
@@ -192,7 +276,18 @@ class Quantity(object):
 		The magnitude of the quantity that matches the units.
 		"""
 
-		return self._q.magnitude / (10 ** self.original_multiplier)
+		return self._value / (10 ** self.original_multiplier)
+
+	def value_in(self, units):
+		"""
+		The magnitude of the quantity in some other units with the same dimensions.
+		"""
+
+		self.assert_dimensions(units)
+
+		info = unit_info(units)
+
+		return self._value / ((10 ** info.multiplier) * info.factor)
 
 	def assert_dimensions(self, other, exception=True):
 		"""
@@ -203,8 +298,8 @@ class Quantity(object):
 
 		if isinstance(other, str):
 			# Given a units string.
-			other = Quantity(1, other).dimensions
-		elif isinstance(other, Quantity):
+			other = unit_info(other).dimensions
+		elif isinstance(other, (Quantity, QuantityArray)):
 			# Given a Quantity.
 			other = other.dimensions
 
@@ -260,10 +355,7 @@ class Quantity(object):
 		except AttributeError:
 			raise TypeError('Expected dimensions for "{0!r}"'.format(other))
 
-		result = deepcopy(self)
-		result._q += other._q
-
-		return result
+		return self._with_value(self._value + other._value)
 
 	def __sub__(self, other):
 		"""
@@ -275,20 +367,14 @@ class Quantity(object):
 		except AttributeError:
 			raise TypeError('Expected dimensions for "{0!r}"'.format(other))
 
-		result = deepcopy(self)
-		result._q -= other._q
-
-		return result
+		return self._with_value(self._value - other._value)
 
 	def __mul__(self, other):
 		"""
 		Multiplication by reals.
 		"""
 
-		result = deepcopy(self)
-		result._q *= other
-
-		return result
+		return self._with_value(self._value * other)
 
 	def __rmul__(self, other):
 		return self * other
@@ -298,10 +384,9 @@ class Quantity(object):
 		Division by reals.
 		"""
 
-		result = deepcopy(self)
-		result._q /= other
+		return self._with_value(self._value / other)
 
-		return result
+	__truediv__ = __div__
 
 	def __repr__(self):
 		return '{0}(\'{1}\')'.format(self.__class__.__name__, str(self))
@@ -317,4 +402,68 @@ class Quantity(object):
 		Rather than copying anything, simply create a new instance.
 		"""
 
-		return Quantity(str(self))
+		return self._with_value(self._value)
+
+
+class QuantityArray(object):
+	"""
+	An array of values sharing the same units.
+	"""
+
+	def __init__(self, values, units):
+		info = unit_info(units)
+
+		# Normalize to SI base units.
+		self._info = info
+		self._values = asarray(values, dtype=float) * (10 ** info.multiplier) * info.factor
+
+		# Information to restore original representation.
+		self.original_units = units
+		self.original_multiplier = info.original_multiplier
+
+	@property
+	def dimensions(self):
+		"""
+		The set of simplified units and their exponents.
+		"""
+
+		return self._info.dimensions
+
+	@property
+	def values(self):
+		"""
+		The magnitudes of the quantities, normalized to the base units.
+		"""
+
+		return self._values
+
+	@property
+	def original_values(self):
+		"""
+		The magnitudes of the quantities that match the units.
+		"""
+
+		return self._values / (10 ** self.original_multiplier)
+
+	assert_dimensions = Quantity.assert_dimensions
+
+	def __len__(self):
+		return len(self._values)
+
+	def __getitem__(self, idx):
+		if isinstance(idx, slice):
+			result = self.__class__.__new__(self.__class__)
+			result.__dict__.update(self.__dict__)
+			result._values = self._values[idx]
+
+			return result
+
+		return Quantity.from_base(self._values[idx], self.original_units)
+
+	def __iter__(self):
+		for value in self._values:
+			yield Quantity.from_base(value, self.original_units)
+
+	def __repr__(self):
+		return '{0}({1!r}, {2!r})'.format(self.__class__.__name__, self.original_values.tolist(),
+				self.original_units)
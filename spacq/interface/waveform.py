@@ -2,7 +2,7 @@ import logging
 log = logging.getLogger(__name__)
 
 from collections import namedtuple
-from numpy import append, array, interp, linspace
+from numpy import asarray, interp, linspace, zeros
 
 """
 A waveform generator.
@@ -15,6 +15,9 @@ Waveform = namedtuple('Waveform', 'data, markers')
 class Generator(object):
 	"""
 	A generator for arbitrary waveforms.
+
+	Rather than growing the waveform point by point, the generator records segments (runs of a constant value or
+	literal data) and only assembles them once the total length is known, filling a single preallocated array.
 	"""
 
 	# Generation should fail if the number of points exceeds this value.
@@ -29,12 +32,38 @@ class Generator(object):
 		# If True, do not generate a waveform. Useful for verifying the generating code.
 		self.dry_run = dry_run
 
-		# The resulting wave, with each data point on the interval [-1.0, 1.0].
-		self._wave = array([])
+		# The segments of the resulting wave, with each data point on the interval [-1.0, 1.0]. Each segment is
+		# either a tuple of (value, count) for a run of a constant value, or an array of literal values.
+		self._segments = []
+		# The number of points in all the segments.
+		self._wave_length = 0
+		# The value of the last point.
+		self._last_value = None
 
-		# The resulting marker channels, with each channel being a sparse list represented as a dictionary.
+		# The resulting marker channels, with each channel run-length encoded as a dictionary from the position at
+		# which the value changes to the new value.
 		self._markers = {}
 
+	def _assemble(self, length):
+		"""
+		Fill a preallocated array with all the segments, padding with zeros.
+		"""
+
+		result = zeros(length)
+
+		pos = 0
+		for segment in self._segments:
+			if isinstance(segment, tuple):
+				value, count = segment
+				result[pos:pos + count] = value
+			else:
+				count = len(segment)
+				result[pos:pos + count] = segment
+
+			pos += count
+
+		return result
+
 	@property
 	def waveform(self):
 		"""
@@ -46,13 +75,10 @@ class Generator(object):
 		except ValueError:
 			last_marker_point = -1
 
-		extra_points = last_marker_point + 1 - len(self._wave)
-		if extra_points > 0:
-			resulting_wave = append(self._wave, [0.0] * extra_points)
-		else:
-			resulting_wave = self._wave
+		resulting_length = max(self._wave_length, last_marker_point + 1)
+		resulting_wave = self._assemble(resulting_length)
 
-		marker_data = dict((num, self._get_marker(num, len(resulting_wave))) for num in self._markers)
+		marker_data = dict((num, self._get_marker(num, resulting_length).tolist()) for num in self._markers)
 
 		return Waveform(resulting_wave, marker_data)
 
@@ -65,30 +91,38 @@ class Generator(object):
 	def append(self, values):
 		self.length += len(values)
 
-		if not self.dry_run:
-			self._wave = append(self._wave, values)
+		if not self.dry_run and len(values) > 0:
+			values = asarray(values, dtype=float)
 
-	def _get_marker(self, num, length):
+			self._segments.append(values)
+			self._wave_length += len(values)
+			self._last_value = values[-1]
+
+	def append_constant(self, value, count):
 		"""
-		Get the marker values for all data points in the waveform.
+		Append a run of a single value.
 		"""
 
-		result = []
+		if count <= 0:
+			return
+
+		self.length += count
 
-		def last_value():
-			try:
-				return result[-1]
-			except IndexError:
-				return False
+		if not self.dry_run:
+			self._segments.append((value, count))
+			self._wave_length += count
+			self._last_value = value
 
-		for idx, value in sorted(self._markers[num].items()):
-			if idx >= len(result):
-				result.extend([last_value()] * (idx - len(result) + 1))
+	def _get_marker(self, num, length):
+		"""
+		Get the marker values for all data points in the waveform.
+		"""
 
-			result[idx] = value
+		result = zeros(length, dtype=bool)
 
-		if len(result) < length:
-			result.extend([last_value()] * (length - len(result)))
+		changes = sorted(self._markers[num].items())
+		for (idx, value), (next_idx, _) in zip(changes, changes[1:] + [(length, None)]):
+			result[idx:next_idx] = value
 
 		return result
 
@@ -110,14 +144,14 @@ class Generator(object):
 		Due to the discrete nature of these waveforms, interpolation is used when changing duration.
 		"""
 
-		if not data:
+		if len(data) == 0:
 			return data
 
-		new_data = data[:]
+		new_data = asarray(data, dtype=float)
 
 		# Change amplitude.
 		if amplitude is not None:
-			new_data = [amplitude * x for x in new_data]
+			new_data = amplitude * new_data
 
 		# Change duration.
 		if duration is not None:
@@ -127,8 +161,7 @@ class Generator(object):
 			points = linspace(0, 1, duration)
 			actual_points = linspace(0, 1, actual_duration)
 
-			new_data = interp(points, actual_points, new_data)
-			new_data = [round(x, 5) for x in new_data]
+			new_data = interp(points, actual_points, new_data).round(5)
 
 		return new_data
 
@@ -138,7 +171,7 @@ class Generator(object):
 		"""
 
 		self.check_length(1)
-		self.append([value])
+		self.append_constant(value, 1)
 
 	def delay(self, value, less_points=1):
 		"""
@@ -149,21 +182,21 @@ class Generator(object):
 
 		self.check_length(delay_length)
 
-		try:
-			last_value = self._wave[-1]
-		except IndexError:
+		if self._last_value is not None:
+			last_value = self._last_value
+		else:
 			last_value = 0.0
 
-		self.append([last_value] * delay_length)
+		self.append_constant(last_value, delay_length)
 
 	def square(self, amplitude, length):
 		"""
 		Generate a square pulse.
 		"""
 
-		try:
-			return_to = self._wave[-1]
-		except IndexError:
+		if self._last_value is not None:
+			return_to = self._last_value
+		else:
 			return_to = 0.0
 
 		self.set_next(amplitude)
@@ -191,4 +224,4 @@ class Generator(object):
 		if num not in self._markers:
 			self._markers[num] = {}
 
-		self._markers[num][len(self._wave)] = value
+		self._markers[num][self._wave_length] = value
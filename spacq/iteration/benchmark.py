@@ -0,0 +1,268 @@
+from argparse import ArgumentParser
+from functools import wraps
+import json
+import platform
+import threading
+from time import sleep, strftime, time
+import tracemalloc
+
+from spacq.devices.agilent.mock.mock_dm34410a import MockDM34410A
+from spacq.devices.rohde_schwarz.mock.mock_smf100a import MockSMF100A
+from spacq.devices.sample.mock.mock_abc1234 import MockABC1234
+from spacq.devices.tektronix.mock.mock_awg5014b import MockAWG5014B
+from spacq.devices.tektronix.mock.mock_dpo7104 import MockDPO7104
+from spacq.interface.pulse.program import Program
+from spacq.interface.units import Quantity
+
+from .profiling import SweepProfiler
+from .sweep import PulseConfiguration, SweepController
+from .variables import (sort_condition_variables, sort_output_variables, Condition, ConditionVariable,
+		LinSpaceConfig, OutputVariable)
+
+"""
+Sweep throughput benchmarks, using mock devices.
+
+Run as a module to write the results as JSON:
+	python -m spacq.iteration.benchmark --latency 2 --output results.json
+
+With --pulse, every point also runs a pulse program on a mock AWG5014B and DPO7104, and with --conditions, a
+condition variable is checked at every point, so that the pulse and condition stages appear in the results.
+"""
+
+
+# A program with a single parameter, which is swept along with the innermost dimension.
+pulse_program = """
+int i = 1
+delay d = 1 ns
+pulse p = {shape: 'square', length: 1 ns, amplitude: 1 mV}
+
+output f1
+
+times i {
+	(100 ns):f1
+}
+
+acquire
+"""
+
+
+def add_latency(device, latency):
+	"""
+	Delay every write to and read from the device, to simulate the round-trip of a real bus.
+	"""
+
+	if not latency:
+		return device
+
+	def delayed(f):
+		@wraps(f)
+		def wrapped(*args, **kwargs):
+			sleep(latency)
+
+			return f(*args, **kwargs)
+
+		return wrapped
+
+	for name in ['write', 'read_raw']:
+		setattr(device, name, delayed(getattr(device, name)))
+
+	return device
+
+
+def build_pulse_config(latency=0):
+	"""
+	A pulse program on a mock AWG, acquired by a mock oscilloscope.
+	"""
+
+	program = Program.from_string(pulse_program)
+	program.frequency = Quantity(1, 'GHz')
+	program.set_value(('_acq_marker', 'marker_num'), 1)
+	program.set_value(('_acq_marker', 'output'), 'f1')
+
+	awg = add_latency(MockAWG5014B(), latency)
+	osc = add_latency(MockDPO7104(), latency)
+
+	return PulseConfiguration(program.with_resources, {'f1': 1}, awg, osc)
+
+
+def build_sweep(dimensions, steps, num_measurements=2, latency=0, use_plan=False, pipeline_depth=0, pulse=False,
+		conditions=False):
+	"""
+	A sweep of a frequency on each of several signal generators, nested in the given number of dimensions, which
+	reads several multimeters at every point.
+
+	pulse: Also run a pulse program at every point, sweeping its repetition count with the innermost frequency.
+	conditions: Also check a condition (which always holds) on the first frequency at every point.
+	"""
+
+	resources, variables = [], []
+	for dim in range(dimensions):
+		device = add_latency(MockSMF100A(), latency)
+
+		var = OutputVariable(name='Frequency {0}'.format(dim), order=dim + 1, enabled=True, wait='0 s')
+		var.config = LinSpaceConfig(1e9, 2e9, steps)
+		var.type = 'quantity'
+		var.units = 'Hz'
+
+		resources.append(('Frequency {0}'.format(dim), device.resources['frequency']))
+		variables.append(var)
+
+	pulse_config = None
+	if pulse:
+		pulse_config = build_pulse_config(latency)
+
+		var = OutputVariable(name='Repetitions', order=1, enabled=True, wait='0 s')
+		var.config = LinSpaceConfig(1, steps, steps)
+		var.type = 'integer'
+
+		program = pulse_config.program
+		resources.append(('Repetitions', program.resources[('i',)]))
+		variables.append(var)
+
+	measurement_resources = []
+	for i in range(num_measurements):
+		device = add_latency(MockDM34410A(), latency)
+		measurement_resources.append(('Reading {0}'.format(i), device.resources['reading']))
+
+	device = add_latency(MockABC1234(), latency)
+	measurement_resources.append(('Current', device.resources['reading']))
+
+	vars, num_items = sort_output_variables(variables)
+	# Group the resources in the same way as the variables.
+	by_name = dict(resources)
+	grouped_resources = [tuple((var.name, by_name[var.name]) for var in group) for group in vars]
+
+	condition_resources, condition_variables = [], []
+	if conditions:
+		condition = Condition('resource name', 'quantity', 'Frequency 0', '>', Quantity(0, 'Hz'))
+		condition_variables = sort_condition_variables([ConditionVariable(name='Positive', order=0, enabled=True,
+				wait='0 s', resource_names=['Frequency 0'], conditions=[condition])])
+		condition_resources = [(('Frequency 0', by_name['Frequency 0']),)]
+
+	return SweepController(grouped_resources, vars, num_items, measurement_resources, [], condition_resources,
+			condition_variables, pulse_config, use_plan=use_plan, pipeline_depth=pipeline_depth)
+
+
+def run(dimensions, steps, latency=0, use_plan=False, trace_allocations=True, pipeline_depth=0, pulse=False,
+		conditions=False):
+	"""
+	Run a single sweep and collect statistics about it.
+	"""
+
+	ctrl = build_sweep(dimensions, steps, latency=latency, use_plan=use_plan, pipeline_depth=pipeline_depth,
+			pulse=pulse, conditions=conditions)
+	ctrl.profiler = SweepProfiler()
+
+	points = [0]
+	max_threads = [threading.active_count()]
+
+	def data_callback(cur_time, values, measurement_values):
+		points[0] += 1
+		max_threads[0] = max(max_threads[0], threading.active_count())
+	ctrl.data_callback = data_callback
+
+	# A benchmark of a failing sweep is meaningless.
+	errors = []
+	ctrl.general_exception_handler = lambda f_name, e: errors.append((f_name, e))
+	ctrl.resource_exception_handler = lambda name, e, write: errors.append((name, e))
+
+	if trace_allocations:
+		tracemalloc.start()
+
+	start_time = time()
+
+	try:
+		ctrl.run()
+	finally:
+		seconds = time() - start_time
+
+		if trace_allocations:
+			snapshot = tracemalloc.take_snapshot()
+			_, peak_bytes = tracemalloc.get_traced_memory()
+			tracemalloc.stop()
+
+	result = {
+		'dimensions': dimensions,
+		'steps': steps,
+		'points': points[0],
+		'seconds': seconds,
+		'points_per_second': points[0] / seconds if seconds else None,
+		'profile': ctrl.profiler.as_dict(),
+		'device_stages': dict((stage, stats_dict(stats)) for stage, stats in ctrl.stage_stats.items()),
+		'max_threads': max_threads[0],
+	}
+
+	if errors:
+		raise ValueError('Sweep failed: {0!r}'.format(errors[0]))
+
+	if trace_allocations:
+		stats = snapshot.statistics('filename')
+		result['retained_blocks'] = sum(x.count for x in stats)
+		result['peak_bytes'] = peak_bytes
+
+	return result
+
+
+def stats_dict(stats):
+	return {
+		'calls': stats.count,
+		'total': stats.total,
+		'mean': stats.mean,
+		'min': stats.min,
+		'max': stats.max,
+	}
+
+
+def run_suite(steps=(50, 10, 4), latency=0, use_plan=False, trace_allocations=True, pipeline_depth=0, pulse=False,
+		conditions=False):
+	"""
+	Run 1D, 2D and 3D sweeps, with the given number of steps in each dimension.
+	"""
+
+	return {
+		'timestamp': strftime('%Y-%m-%dT%H:%M:%S'),
+		'python': platform.python_version(),
+		'latency': latency,
+		'use_plan': use_plan,
+		'pipeline_depth': pipeline_depth,
+		'pulse': pulse,
+		'conditions': conditions,
+		'results': [run(dimensions, dim_steps, latency, use_plan, trace_allocations, pipeline_depth, pulse, conditions)
+				for dimensions, dim_steps in enumerate(steps, 1)],
+	}
+
+
+def main(args=None):
+	parser = ArgumentParser(description='Benchmark sweeps over mock devices.')
+	parser.add_argument('--latency', type=float, default=0,
+			help='delay in ms for every write to and read from a device')
+	parser.add_argument('--steps', type=int, nargs=3, default=[50, 10, 4], metavar=('1D', '2D', '3D'),
+			help='steps per dimension of the 1D, 2D and 3D sweeps')
+	parser.add_argument('--plan', action='store_true', help='precompute the sweep plan')
+	parser.add_argument('--pipeline', type=int, default=0, metavar='DEPTH',
+			help='hand off up to DEPTH measured points to the data callback in the background')
+	parser.add_argument('--pulse', action='store_true',
+			help='run a pulse program on a mock AWG and oscilloscope at every point')
+	parser.add_argument('--conditions', action='store_true', help='check a condition variable at every point')
+	parser.add_argument('--no-allocations', action='store_true', help='do not trace allocations')
+	parser.add_argument('--output', help='file to which to write the JSON results')
+	args = parser.parse_args(args)
+
+	results = run_suite(args.steps, args.latency / 1000, args.plan, not args.no_allocations, args.pipeline, args.pulse,
+			args.conditions)
+
+	output = json.dumps(results, indent=2, sort_keys=True)
+
+	if args.output:
+		with open(args.output, 'w') as f:
+			f.write(output + '\n')
+
+		for result in results['results']:
+			print('{dimensions}D: {points} points in {seconds:.3f} s ({points_per_second:.1f} points/s)'.format(
+					**result))
+	else:
+		print(output)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,79 @@
+from queue import Queue
+from threading import Thread
+import logging
+log = logging.getLogger(__name__)
+
+
+"""
+Overlapping the handling of measurements with the rest of the sweep.
+"""
+
+
+class DataPipeline(Thread):
+	"""
+	A thread which handles finished points in order, while the sweep moves on to the next ones.
+
+	At most depth points may be waiting at once; beyond that, submitting blocks, so that slow handling holds back
+	the sweep instead of piling up.
+	"""
+
+	def __init__(self, depth, exception_callback=None):
+		"""
+		depth: The number of points which may be waiting to be handled.
+		exception_callback: Called with any exception raised while handling a point.
+		"""
+
+		Thread.__init__(self)
+
+		if depth <= 0:
+			raise ValueError('Pipeline depth must be positive, not "{0}".'.format(depth))
+
+		self.depth = depth
+		self.exception_callback = exception_callback
+		self.daemon = True
+
+		self.queue = Queue(maxsize=depth)
+
+		self.start()
+
+	def run(self):
+		while True:
+			task = self.queue.get()
+
+			try:
+				if task is None:
+					return
+
+				f, args = task
+
+				try:
+					f(*args)
+				except Exception as e:
+					if self.exception_callback is not None:
+						self.exception_callback(e)
+					else:
+						log.exception('Caught exception in data pipeline')
+			finally:
+				self.queue.task_done()
+
+	def submit(self, f, *args):
+		"""
+		Handle a point by calling f with the arguments, once all the earlier points have been handled.
+		"""
+
+		self.queue.put((f, args))
+
+	def flush(self):
+		"""
+		Wait for all the submitted points to be handled.
+		"""
+
+		self.queue.join()
+
+	def close(self):
+		"""
+		Handle the remaining points, and stop.
+		"""
+
+		self.queue.put(None)
+		self.join()
@@ -0,0 +1,174 @@
+from itertools import islice
+import numpy
+
+
+def compute_order_periods(variables, condition_orders=[]):
+	"""
+	Compute the number of elements iterated before each order changes.
+
+	variables: Output variables, as sorted and grouped by sort_output_variables.
+	condition_orders: Orders of the condition variable groups.
+
+	The returned value is a dictionary from order to period.
+	"""
+
+	periods = []
+	orders = []
+
+	for group in reversed(variables):
+		# Skip if vars in group are consts.
+		if group[0].use_const != 1:
+			num_in_group = min(len(var) for var in group)
+
+			# Append the period of this group and its order.
+			if not periods:
+				periods.append(num_in_group)
+			else:
+				periods.append(periods[-1] * num_in_group)
+
+			orders.append(group[0].order)
+
+	for order in condition_orders:
+		if order not in orders:
+			orders.append(order)
+			orders.sort()
+			new_index = orders.index(order)
+			if new_index > 0:
+				periods.insert(new_index, periods[new_index - 1])
+			else:  # If the condition is the smallest order, it has a period of 1.
+				periods.insert(new_index, 1)
+
+	return dict(list(zip(orders, periods)))
+
+
+class SweepPlan(object):
+	"""
+	The entire Cartesian schedule of a sweep, computed up front.
+
+	For every step of the sweep, the plan holds the index into each group of output variables and the
+	position of the outermost group which changed, so that iterating amounts to walking array rows.
+	"""
+
+	def __init__(self, variables, condition_orders=[]):
+		"""
+		variables: Output variables, as sorted and grouped by sort_output_variables.
+		condition_orders: Orders of the condition variable groups.
+		"""
+
+		self.variables = variables
+		self.condition_orders = list(condition_orders)
+
+		# Raw values of each variable, truncated to the length of its group.
+		self.raw_values = []
+		# Typed values of each group, as they are handed to the resources.
+		self.group_values = []
+		lengths = []
+
+		for group in self.variables:
+			num_in_group = min(len(var) for var in group)
+			lengths.append(num_in_group)
+
+			raw = [numpy.array(list(islice(var.raw_iter, num_in_group))) for var in group]
+			typed = [[var.with_type(x) for x in values] for var, values in zip(group, raw)]
+
+			self.raw_values.append(raw)
+			self.group_values.append(list(zip(*typed)))
+
+		self.lengths = numpy.array(lengths, dtype=int)
+		self.num_items = int(numpy.prod(self.lengths))
+
+		self.indices = self._compute_indices(self.lengths, self.num_items)
+		self.changed = self._compute_changed(self.indices)
+
+		self.order_periods = compute_order_periods(self.variables, self.condition_orders)
+
+	@staticmethod
+	def _compute_indices(lengths, num_items):
+		"""
+		Index into each group for every step; the last group varies fastest.
+		"""
+
+		dtype = numpy.min_scalar_type(max(lengths.max() if len(lengths) else 0, 1))
+		indices = numpy.empty((num_items, len(lengths)), dtype=dtype)
+
+		steps = numpy.arange(num_items)
+		period = 1
+		for pos in reversed(range(len(lengths))):
+			indices[:, pos] = (steps // period) % lengths[pos]
+			period *= lengths[pos]
+
+		return indices
+
+	@staticmethod
+	def _compute_changed(indices):
+		"""
+		Position of the outermost changed group for every step.
+
+		Every group after that position has either stepped or rolled over.
+		"""
+
+		num_items, num_groups = indices.shape
+		changed = numpy.zeros(num_items, dtype=numpy.min_scalar_type(max(num_groups, 1)))
+
+		if num_items > 1 and num_groups > 0:
+			differences = indices[1:] != indices[:-1]
+			changed[1:] = differences.argmax(axis=1)
+
+		return changed
+
+	def __len__(self):
+		return self.num_items
+
+	def values(self, item):
+		"""
+		The typed values of all groups at the given step.
+		"""
+
+		return [self.group_values[pos][idx] for pos, idx in enumerate(self.indices[item])]
+
+	def changed_indices(self, item):
+		"""
+		The positions of all the groups which changed at the given step.
+		"""
+
+		return list(range(self.changed[item], len(self.variables)))
+
+	def save(self, file):
+		"""
+		Persist the schedule to a NumPy archive.
+		"""
+
+		arrays = {
+			'lengths': self.lengths,
+			'indices': self.indices,
+			'changed': self.changed,
+			'orders': numpy.array(list(self.order_periods.keys())),
+			'periods': numpy.array(list(self.order_periods.values())),
+		}
+
+		for pos, raw in enumerate(self.raw_values):
+			for i, values in enumerate(raw):
+				arrays['values_{0}_{1}'.format(pos, i)] = values
+
+		numpy.savez(file, **arrays)
+
+	@classmethod
+	def load(cls, file, variables, condition_orders=[]):
+		"""
+		Load a schedule saved with save, verifying that it matches the given variables.
+		"""
+
+		result = cls(variables, condition_orders)
+
+		with numpy.load(file) as saved:
+			if not numpy.array_equal(saved['lengths'], result.lengths):
+				raise ValueError('Saved plan does not match the variables: lengths {0} != {1}'.format(
+						saved['lengths'].tolist(), result.lengths.tolist()))
+
+			for pos, raw in enumerate(result.raw_values):
+				for i, values in enumerate(raw):
+					if not numpy.array_equal(saved['values_{0}_{1}'.format(pos, i)], values):
+						raise ValueError('Saved plan does not match the values of "{0}"'.format(
+								variables[pos][i].name))
+
+		return result
@@ -0,0 +1,172 @@
+from queue import Queue
+from threading import Condition, Lock, Thread
+from time import time
+import logging
+log = logging.getLogger(__name__)
+
+
+def device_key(resource):
+	"""
+	The key on which accesses to the resource are serialized.
+
+	Resources belonging to the same device (or to subdevices of it) share the device lock, so they are keyed
+	by that lock. Resources without a device are independent of everything else.
+	"""
+
+	lock = getattr(resource.obj, 'lock', None)
+
+	if lock is not None:
+		return lock
+	else:
+		return resource
+
+
+class StageStats(object):
+	"""
+	Latency statistics for a stage of the sweep.
+	"""
+
+	def __init__(self):
+		self.count = 0
+		self.total = 0.0
+		self.min = None
+		self.max = None
+
+	def add(self, duration):
+		self.count += 1
+		self.total += duration
+
+		if self.min is None or duration < self.min:
+			self.min = duration
+		if self.max is None or duration > self.max:
+			self.max = duration
+
+	@property
+	def mean(self):
+		if self.count:
+			return self.total / self.count
+		else:
+			return None
+
+	def __str__(self):
+		if not self.count:
+			return 'no calls'
+
+		return '{0} calls, mean {1:.6f} s, min {2:.6f} s, max {3:.6f} s'.format(self.count, self.mean,
+				self.min, self.max)
+
+
+class DeviceWorker(Thread):
+	"""
+	A long-lived thread which performs all the accesses for one device, in order.
+	"""
+
+	def __init__(self, key):
+		Thread.__init__(self)
+
+		self.key = key
+		self.daemon = True
+
+		self.queue = Queue()
+
+	def run(self):
+		while True:
+			task = self.queue.get()
+
+			if task is None:
+				return
+
+			f, args, kwargs, done = task
+
+			try:
+				f(*args, **kwargs)
+			except Exception:
+				log.exception('Caught exception in worker for {0!r}'.format(self.key))
+			finally:
+				done()
+
+
+class DevicePool(object):
+	"""
+	A pool of workers, one per device, which replaces spawning a thread per resource access.
+
+	Accesses to resources on different devices run in parallel; accesses to resources on the same device are
+	coalesced onto a single worker, since they would serialize on the device lock anyway.
+	"""
+
+	def __init__(self, resources=[]):
+		"""
+		resources: Resources for which to start workers immediately.
+		"""
+
+		self.workers = {}
+		self.workers_lock = Lock()
+
+		self.stats = {}
+
+		for resource in resources:
+			if resource is not None:
+				self.worker_for(resource)
+
+	def __len__(self):
+		return len(self.workers)
+
+	def worker_for(self, resource):
+		"""
+		Find or start the worker for the device which owns the resource.
+		"""
+
+		key = device_key(resource)
+
+		with self.workers_lock:
+			try:
+				return self.workers[key]
+			except KeyError:
+				worker = DeviceWorker(key)
+				self.workers[key] = worker
+				worker.start()
+
+				return worker
+
+	def run(self, stage, tasks):
+		"""
+		Perform all the tasks and wait for them to finish.
+
+		stage: The name under which to record the latency of this batch.
+		tasks: Tuples of (resource, function, args, kwargs).
+		"""
+
+		start_time = time()
+
+		pending = [len(tasks)]
+		finished = Condition()
+
+		def done():
+			with finished:
+				pending[0] -= 1
+
+				if pending[0] == 0:
+					finished.notify()
+
+		with finished:
+			for resource, f, args, kwargs in tasks:
+				self.worker_for(resource).queue.put((f, args, kwargs, done))
+
+			while pending[0] > 0:
+				finished.wait()
+
+		self.stats.setdefault(stage, StageStats()).add(time() - start_time)
+
+	def close(self):
+		"""
+		Stop all the workers.
+		"""
+
+		with self.workers_lock:
+			workers, self.workers = self.workers, {}
+
+		for worker in list(workers.values()):
+			worker.queue.put(None)
+
+		for worker in list(workers.values()):
+			worker.join()
@@ -0,0 +1,127 @@
+from bisect import bisect_right
+from contextlib import contextmanager
+import json
+from math import log10
+from threading import Lock
+from time import time
+
+from .pool import StageStats
+
+"""
+Timing of the parts of a sweep, without an external profiler.
+"""
+
+
+class LatencyHistogram(object):
+	"""
+	Counts of durations in logarithmically-spaced bins.
+	"""
+
+	def __init__(self, low=1e-6, high=1e2, bins_per_decade=4):
+		"""
+		low, high: The range of durations (in s) with bins of their own; anything outside falls in the first or
+			last bin.
+		"""
+
+		num_edges = int(round((log10(high) - log10(low)) * bins_per_decade)) + 1
+		self.edges = [low * 10 ** (i / bins_per_decade) for i in range(num_edges)]
+
+		# One more bin than edges, for everything below the first edge.
+		self.counts = [0] * (num_edges + 1)
+
+	def add(self, duration):
+		self.counts[bisect_right(self.edges, duration)] += 1
+
+	def as_dict(self):
+		"""
+		The non-empty bins, by their lower edge (0 for the first bin).
+		"""
+
+		lower_edges = [0.0] + self.edges
+
+		return dict(('{0:.3g}'.format(edge), count) for edge, count in zip(lower_edges, self.counts) if count)
+
+
+class SweepProfiler(object):
+	"""
+	Collects the wall time of the stages of a sweep, of each resource access, and of the callbacks.
+
+	Timings are kept by kind ("stage", "read", "write", "callback") and name.
+	"""
+
+	def __init__(self):
+		self.lock = Lock()
+
+		self.stats = {}
+		self.histograms = {}
+
+		self.start_time = time()
+
+	def add(self, kind, name, duration):
+		with self.lock:
+			try:
+				stats = self.stats[kind][name]
+			except KeyError:
+				stats = self.stats.setdefault(kind, {})[name] = StageStats()
+				self.histograms.setdefault(kind, {})[name] = LatencyHistogram()
+
+			stats.add(duration)
+			self.histograms[kind][name].add(duration)
+
+	@contextmanager
+	def timing(self, kind, name):
+		"""
+		Time the body of the with statement.
+		"""
+
+		start_time = time()
+
+		try:
+			yield
+		finally:
+			self.add(kind, name, time() - start_time)
+
+	def total(self, kind):
+		"""
+		The total time spent on everything of a kind.
+		"""
+
+		with self.lock:
+			return sum(stats.total for stats in self.stats.get(kind, {}).values())
+
+	def as_dict(self):
+		result = {
+			'elapsed': time() - self.start_time,
+		}
+
+		with self.lock:
+			for kind, by_name in self.stats.items():
+				result[kind] = dict((name, {
+					'calls': stats.count,
+					'total': stats.total,
+					'mean': stats.mean,
+					'min': stats.min,
+					'max': stats.max,
+					'histogram': self.histograms[kind][name].as_dict(),
+				}) for name, stats in by_name.items())
+
+		return result
+
+	def save(self, path):
+		"""
+		Write the timings to a JSON file.
+		"""
+
+		with open(path, 'w') as f:
+			json.dump(self.as_dict(), f, indent=2, sort_keys=True)
+			f.write('\n')
+
+	def __str__(self):
+		lines = []
+
+		with self.lock:
+			for kind, by_name in sorted(self.stats.items()):
+				for name, stats in sorted(by_name.items()):
+					lines.append('{0} "{1}": {2}'.format(kind, name, stats))
+
+		return '\n'.join(lines)
@@ -1,6 +1,10 @@
-from spacq.tool.box import flatten
+from spacq.interface.ramp import Ramp
+from spacq.tool.box import flatten, Without
+from .plan import compute_order_periods, SweepPlan
+from .pipeline import DataPipeline
+from .pool import DevicePool
 from time import sleep, time
-from threading import Condition, Thread
+from threading import Condition
 from itertools import repeat
 from functools import partial, wraps
 import logging
@@ -67,7 +71,8 @@ class SweepController(object):
     """
 
     def __init__(self, resources, variables, num_items, measurement_resources, measurement_variables,
-                 condition_resources=[], condition_variables=[], pulse_config=None, continuous=False):
+                 condition_resources=[], condition_variables=[], pulse_config=None, continuous=False,
+                 use_plan=False, pipeline_depth=0):
         self.resources = resources
         self.variables = variables
         self.num_items = num_items
@@ -109,46 +114,76 @@ class SweepController(object):
             group[0].order for group in self.condition_variables]
         self.conditional_wait = 0
         self.order_periods = None
+        # Compiled conditions, for each order of condition variables.
+        self.condition_schedule = None
+
+        # Precompute the whole schedule instead of iterating over the variables.
+        self.use_plan = use_plan
+        self.plan = None
+
+        # Long-lived workers for accessing the resources, started on demand.
+        self.pool = None
+
+        # Hand the measurements of up to this many points to data_callback in the background, while the sweep moves
+        # on to the next points. The reads themselves always finish before the next point is written.
+        self.pipeline_depth = pipeline_depth
+        self.pipeline = None
+
+        # Combine reads of resources on the same device into a single message where possible.
+        self.combine_reads = True
+        self.combine_unsupported = set()
+
+        # An optional SweepProfiler, which times the stages, the resource accesses and the callbacks.
+        self.profiler = None
+
+        # When the last write to each resource finished; variables settle from then, not from the end of the stage.
+        self.write_times = {}
+        # The shortest time to spend in each dwell.
+        self.min_dwell = 0
+        # Seconds between reads of resources which report when they have settled.
+        self.ready_poll_interval = 0.01
 
     def compute_order_periods(self):
         """
         This function computes the number of elements iterated before each order changes.
         """
-        periods = []
-        orders = []
 
-        for group in reversed(self.variables):
-            # skip if vars in group are consts.
-            if group[0].use_const != 1:
-                num_in_group = None
+        self.order_periods = compute_order_periods(
+            self.variables, self.condition_orders)
 
-                # get the length of the group
-                for var in group:
-                    num_in_var = len(var)
+    def compile_conditions(self):
+        """
+        Compile the condition variables, from the lowest order to the highest.
 
-                    if num_in_group is None or num_in_var < num_in_group:
-                        num_in_group = num_in_var
+        Each entry of the schedule is a tuple of (period, wait, evaluators, resources), where the evaluators are
+        checked once every period items, after waiting for wait seconds, and together read the resources.
+        """
 
-                # append the period of this group and its order.
-                if not periods:
-                    periods.append(num_in_group)
-                else:
-                    periods.append(periods[-1]*num_in_group)
+        self.condition_schedule = []
+
+        for order, group in sorted(zip(self.condition_orders, self.condition_variables), key=lambda x: x[0]):
+            wait = max([0] + [var._wait.value for var in group])
+
+            evaluators, resources = [], []
+            for var in group:
+                evaluate, var_resources = var.compile(self.condition_resources)
+
+                evaluators.append(evaluate)
+                resources.extend(x for x in var_resources if x not in resources)
+
+            self.condition_schedule.append(
+                (self.order_periods[order], wait, evaluators, resources))
 
-                orders.append(group[0].order)
+        return self.condition_schedule
 
-        for order in self.condition_orders:
-            if order not in orders:
-                orders.append(order)
-                orders.sort()
-                new_index = orders.index(order)
-                if new_index > 0:
-                    periods.insert(new_index, periods[new_index - 1])
-                else:  # if the condition is the smallest order, it has a period of 1
-                    periods.insert(new_index, 1)
+    def build_plan(self):
+        """
+        Compute the schedule of the sweep up front.
+        """
 
-        # create a dict.
-        self.order_periods = dict(list(zip(orders, periods)))
+        self.plan = SweepPlan(self.variables, self.condition_orders)
+
+        return self.plan
 
     def create_iterator(self, pos):
         """
@@ -157,30 +192,69 @@ class SweepController(object):
 
         return zip(*(iter(var) for var in self.variables[pos]))
 
+    def start_pool(self):
+        """
+        Start a worker for each device used in the sweep.
+        """
+
+        all_resources = list(flatten(self.resources)) + \
+            list(self.measurement_resources) + list(self.condition_resources)
+
+        self.pool = DevicePool(
+            resource for _, resource in all_resources)
+
+    def run_tasks(self, stage, tasks):
+        """
+        Run the resource accesses on the device workers and wait for them.
+        """
+
+        if self.pool is None:
+            self.start_pool()
+
+        self.pool.run(stage, tasks)
+
+    @property
+    def stage_stats(self):
+        """
+        Latency statistics for the stages which access resources.
+        """
+
+        if self.pool is None:
+            return {}
+
+        return self.pool.stats
+
+    def profiled(self, kind, name):
+        """
+        Time the body of a with statement, if profiling.
+        """
+
+        if self.profiler is None:
+            return Without()
+
+        return self.profiler.timing(kind, name)
+
     def ramp(self, resources, values_from, values_to, steps):
         """
         Slowly sweep the resources.
         """
 
-        thrs = []
+        # All the resources are stepped together, with the writes for each step made in parallel.
+        ramp = Ramp(run_tasks=self.run_tasks)
         for (name, resource), value_from, value_to, resource_steps in zip(resources,
                                                                           values_from, values_to, steps):
             if resource is None:
                 continue
 
-            kwargs = {}
+            exception_callback = None
             if self.resource_exception_handler is not None:
-                kwargs['exception_callback'] = partial(
+                exception_callback = partial(
                     self.resource_exception_handler, name, write=True)
 
-            thr = Thread(target=resource.sweep, args=(
-                value_from, value_to, resource_steps), kwargs=kwargs)
-            thrs.append(thr)
-            thr.daemon = True
-            thr.start()
+            ramp.add(resource, value_from, value_to, resource_steps,
+                     name=name, exception_callback=exception_callback)
 
-        for thr in thrs:
-            thr.join()
+        ramp.run()
 
     def write_resource(self, name, resource, value):
         """
@@ -188,11 +262,14 @@ class SweepController(object):
         """
 
         try:
-            resource.value = value
+            with self.profiled('write', name):
+                resource.value = value
         except Exception as e:
             if self.resource_exception_handler is not None:
                 self.resource_exception_handler(name, e, write=True)
             return
+        finally:
+            self.write_times[resource] = time()
 
     def read_resource(self, name, resource, save_callback):
         """
@@ -200,7 +277,8 @@ class SweepController(object):
         """
 
         try:
-            value = resource.value
+            with self.profiled('read', name):
+                value = resource.value
         except Exception as e:
             if self.resource_exception_handler is not None:
                 self.resource_exception_handler(name, e, write=False)
@@ -208,6 +286,68 @@ class SweepController(object):
 
         save_callback(value)
 
+    def read_resources_combined(self, device, reads):
+        """
+        Read several resources of a device with a single message, or individually if the device cannot do so.
+
+        reads: Tuples of (name, resource, save_callback).
+        """
+
+        if device not in self.combine_unsupported:
+            try:
+                with self.profiled('read', ', '.join(name for name, _, _ in reads)):
+                    responses = device.multi_ask(
+                        [resource.query[0] for _, resource, _ in reads])
+            except NotImplementedError:
+                log.debug('Device does not support combined reads: {0!r}'.format(device))
+
+                self.combine_unsupported.add(device)
+            except Exception as e:
+                log.warning('Combined read failed for {0!r}: {1!r}'.format(device, e))
+            else:
+                for (name, resource, save_callback), response in zip(reads, responses):
+                    try:
+                        value = resource.value_from_response(response)
+                    except Exception as e:
+                        if self.resource_exception_handler is not None:
+                            self.resource_exception_handler(name, e, write=False)
+                        continue
+
+                    save_callback(value)
+
+                return
+
+        for name, resource, save_callback in reads:
+            self.read_resource(name, resource, save_callback)
+
+    def read_condition_resources(self, resources):
+        """
+        Read the resources in parallel.
+
+        Returns a function which gives the value of a resource, or raises the exception caused by reading it.
+        """
+
+        values, errors = {}, {}
+
+        names = dict((id(resource), name) for name, resource in self.condition_resources)
+
+        def read_one(resource):
+            try:
+                with self.profiled('read', names.get(id(resource), repr(resource))):
+                    values[resource] = resource.value
+            except Exception as e:
+                errors[resource] = e
+
+        self.run_tasks('condition', [(resource, read_one, (resource,), {}) for resource in resources])
+
+        def read(resource):
+            try:
+                return values[resource]
+            except KeyError:
+                raise errors[resource]
+
+        return read
+
     def run(self, next_f=None):
         """
         Run the sweep.
@@ -239,7 +379,8 @@ class SweepController(object):
                 log.debug('Starting function: {0}'.format(f_name))
 
                 try:
-                    next_f = next_f()
+                    with self.profiled('stage', f_name):
+                        next_f = next_f()
                 except Exception as e:
                     if self.general_exception_handler is not None:
                         self.general_exception_handler(f_name, e)
@@ -264,7 +405,16 @@ class SweepController(object):
 
         self.item = -1
 
-        self.compute_order_periods()
+        if self.use_plan:
+            # A plan may already have been built (and inspected) before running.
+            if self.plan is None:
+                self.build_plan()
+
+            self.order_periods = self.plan.order_periods
+        else:
+            self.compute_order_periods()
+
+        self.compile_conditions()
 
         if not self.devices_configured:
             log.debug('Configuring devices')
@@ -291,7 +441,10 @@ class SweepController(object):
         if self.current_values is not None:
             self.last_values = self.current_values[:]
 
-        if self.iterators is None:
+        if self.plan is not None and self.use_plan:
+            self.current_values = self.plan.values(self.item)
+            self.changed_indices = self.plan.changed_indices(self.item)
+        elif self.iterators is None:
             # First time around.
             self.iterators = []
             for pos in range(len(self.variables)):
@@ -374,21 +527,18 @@ class SweepController(object):
         Write the next values to their resources.
         """
 
-        thrs = []
+        tasks = []
         for pos in self.changed_indices:
             for i, ((name, resource), value) in enumerate(zip(self.resources[pos], self.current_values[pos])):
                 if resource is not None:
-                    thr = Thread(target=self.write_resource,
-                                 args=(name, resource, value))
-                    thrs.append(thr)
-                    thr.daemon = True
-                    thr.start()
+                    tasks.append((resource, self.write_resource,
+                                  (name, resource, value), {}))
 
                 if self.write_callback is not None:
-                    self.write_callback(pos, i, value)
+                    with self.profiled('callback', 'write'):
+                        self.write_callback(pos, i, value)
 
-        for thr in thrs:
-            thr.join()
+        self.run_tasks('write', tasks)
 
         return self.dwell
 
@@ -398,15 +548,54 @@ class SweepController(object):
         Wait for all changed variables.
         """
 
-        delay = max(
-            var._wait.value for pos in self.changed_indices for var in self.variables[pos])
-        sleep(delay)
+        now = time()
+        end_time = now + self.min_dwell
+        # Resources which can tell when they have settled, with the time after which to stop asking.
+        polled = []
+
+        for pos in self.changed_indices:
+            for var, (name, resource) in zip(self.variables[pos], self.resources[pos]):
+                # Only wait for whatever is left of the settling time after the write.
+                settled_time = self.write_times.get(resource, now) + var._wait.value
+
+                if resource is not None and resource.ready is not None:
+                    polled.append((name, resource.ready, settled_time))
+                else:
+                    end_time = max(end_time, settled_time)
+
+        while True:
+            polled = [(name, ready, settled_time) for name, ready, settled_time in polled
+                      if time() < settled_time and not self.is_ready(name, ready)]
+
+            if not polled:
+                delay = end_time - time()
+                if delay > 0:
+                    sleep(delay)
+
+                break
+
+            sleep(self.ready_poll_interval)
 
         if self.pulse_config is not None:
             return self.pulse
         else:
             return self.read
 
+    def is_ready(self, name, ready):
+        """
+        Whether a resource has settled, according to its ready resource.
+        """
+
+        try:
+            with self.profiled('read', 'ready'):
+                return bool(ready.value)
+        except Exception as e:
+            if self.resource_exception_handler is not None:
+                self.resource_exception_handler(name, e, write=False)
+
+            # Fall back to waiting.
+            return False
+
     @update_current_f
     def pulse(self):
         """
@@ -414,7 +603,8 @@ class SweepController(object):
         """
 
         if self.pulse_config.channels:
-            waveforms = self.pulse_config.program.generate_waveforms()
+            with self.profiled('stage', 'generate_waveforms'):
+                waveforms = self.pulse_config.program.generate_waveforms()
             times = self.pulse_config.program.times_average
 
             # AWG
@@ -490,23 +680,41 @@ class SweepController(object):
         Take measurements.
         """
         measurements = [None] * len(self.measurement_resources)
+        succeeded = [False] * len(self.measurement_resources)
 
-        thrs = []
+        tasks = []
+        # Reads which can be combined, by device.
+        combined = {}
         for i, (name, resource) in enumerate(self.measurement_resources):
             if resource is not None:
                 def save_callback(value, i=i):
                     measurements[i] = value
-                    if self.read_callback is not None:
-                        self.read_callback(i, value)
+                    succeeded[i] = True
 
-                thr = Thread(target=self.read_resource,
-                             args=(name, resource, save_callback))
-                thrs.append(thr)
-                thr.daemon = True
-                thr.start()
+                if (self.combine_reads and resource.query is not None and
+                        hasattr(resource.obj, 'multi_ask')):
+                    combined.setdefault(resource.obj, []).append(
+                        (resource, (name, resource, save_callback)))
+                else:
+                    tasks.append((resource, self.read_resource,
+                                  (name, resource, save_callback), {}))
 
-        for thr in thrs:
-            thr.join()
+        for device, reads in combined.items():
+            if len(reads) > 1:
+                tasks.append((reads[0][0], self.read_resources_combined,
+                              (device, [args for _, args in reads]), {}))
+            else:
+                resource, args = reads[0]
+                tasks.append((resource, self.read_resource, args, {}))
+
+        self.run_tasks('read', tasks)
+
+        # The reads finish in any order, but are reported in the order of the resources.
+        if self.read_callback is not None:
+            for i, value in enumerate(measurements):
+                if succeeded[i]:
+                    with self.profiled('callback', 'read'):
+                        self.read_callback(i, value)
 
         if self.data_callback is not None:
             if self.first_time_point is None:
@@ -515,11 +723,34 @@ class SweepController(object):
             else:
                 cur_time = time() - self.first_time_point
 
-            self.data_callback(cur_time, tuple(
-                flatten(self.current_values)), tuple(measurements))
+            values = tuple(flatten(self.current_values))
+
+            if self.pipeline_depth:
+                if self.pipeline is None:
+                    self.pipeline = DataPipeline(self.pipeline_depth, self.pipeline_exception_handler)
+
+                self.pipeline.submit(self.deliver_data, cur_time, values, tuple(measurements))
+            else:
+                self.deliver_data(cur_time, values, tuple(measurements))
 
         return self.condition
 
+    def deliver_data(self, cur_time, values, measurement_values):
+        with self.profiled('callback', 'data'):
+            self.data_callback(cur_time, values, measurement_values)
+
+    def pipeline_exception_handler(self, e):
+        """
+        Handling a point failed in the background, so stop as if the read stage had failed.
+        """
+
+        if self.general_exception_handler is not None:
+            self.general_exception_handler('read', e)
+        else:
+            log.error('Caught exception in data pipeline: {0!r}'.format(e))
+
+        self.abort(fatal=True)
+
     @update_current_f
     def condition(self):
         """
@@ -530,32 +761,21 @@ class SweepController(object):
         """
         boolean = True
 
-        if self.condition_variables:
-
-            # Find the orders that have changed
-            orders_changed = []
-            for order in list(self.order_periods.keys()):
-                if (self.item + 1) % self.order_periods[order] == 0:
-                    orders_changed.append(order)
-            orders_changed.sort()
-
-            # The wait time is defined by the max of the wait times of the lowest triggered order of condition variables
-            self.conditional_wait = 0
-            for order in orders_changed:
-                if order in self.condition_orders:
-                    corresponding_index = self.condition_orders.index(order)
-                    for var in self.condition_variables[corresponding_index]:
-                        if var._wait.value > self.conditional_wait:
-                            self.conditional_wait = var._wait.value
-                    break
+        # The orders of condition variables which have changed, starting from the lowest.
+        due = [entry for entry in self.condition_schedule if (self.item + 1) % entry[0] == 0]
+
+        # The wait time is defined by the max of the wait times of the lowest triggered order of condition variables
+        self.conditional_wait = due[0][1] if due else 0
 
-            # Check the conditions for the changed orders, starting from the lowest order.
-            for order in orders_changed:
-                if order in self.condition_orders:
-                    for var in self.condition_variables[self.condition_orders.index(order)]:
-                        boolean_to_compound = var.evaluate_conditions(
-                            self.condition_resources)
-                        boolean = boolean and boolean_to_compound
+        if due:
+            resources = []
+            for _, _, _, entry_resources in due:
+                resources.extend(x for x in entry_resources if x not in resources)
+
+            # Each resource is read only once, however many conditions refer to it.
+            read = self.read_condition_resources(resources)
+
+            boolean = all(evaluate(read) for _, _, evaluators, _ in due for evaluate in evaluators)
 
         if boolean == True:
             if self.item == self.num_items - 1:
@@ -614,6 +834,20 @@ class SweepController(object):
         assert not self.done
         self.done = True
 
+        if self.pipeline is not None:
+            # Every measured point is handled before the sweep is closed.
+            self.pipeline.close()
+            self.pipeline = None
+
+        if self.pool is not None:
+            for stage, stats in sorted(self.pool.stats.items()):
+                log.debug('Stage "{0}": {1}'.format(stage, stats))
+
+            self.pool.close()
+
+        if self.profiler is not None:
+            log.debug('Profile:\n{0}'.format(self.profiler))
+
         if self.close_callback is not None:
             self.close_callback()
 
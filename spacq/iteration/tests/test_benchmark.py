@@ -0,0 +1,50 @@
+from nose.tools import eq_
+from unittest import main, TestCase
+
+from .. import benchmark
+
+
+class BenchmarkTest(TestCase):
+	def testRun(self):
+		"""
+		Run small sweeps through the benchmark.
+		"""
+
+		result = benchmark.run(2, 3, latency=0.001)
+
+		eq_(result['points'], 9)
+		eq_(result['profile']['stage']['write']['calls'], 9)
+		eq_(result['profile']['stage']['read']['calls'], 9)
+		eq_(result['profile']['read']['Reading 0']['calls'], 9)
+		eq_(result['device_stages']['read']['calls'], 9)
+		assert result['points_per_second'] > 0
+		assert result['retained_blocks'] > 0
+
+		suite = benchmark.run_suite(steps=(2, 2, 2), trace_allocations=False)
+
+		eq_([x['points'] for x in suite['results']], [2, 4, 8])
+		assert 'retained_blocks' not in suite['results'][0]
+
+	def testConditions(self):
+		"""
+		Check a condition at every point.
+		"""
+
+		result = benchmark.run(2, 2, trace_allocations=False, conditions=True)
+
+		eq_(result['points'], 4)
+		eq_(result['device_stages']['condition']['calls'], 4)
+
+	def testPulse(self):
+		"""
+		Run a pulse program at every point.
+		"""
+
+		result = benchmark.run(1, 2, trace_allocations=False, pulse=True)
+
+		eq_(result['points'], 2)
+		eq_(result['profile']['stage']['pulse']['calls'], 2)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,86 @@
+from nose.tools import assert_raises, eq_
+from threading import current_thread
+from time import sleep
+from unittest import main, TestCase
+
+from .. import pipeline
+
+
+class DataPipelineTest(TestCase):
+	def testOrder(self):
+		"""
+		Points are handled in order, in the background.
+		"""
+
+		handled, threads = [], []
+
+		def handle(x):
+			sleep(0.001)
+			handled.append(x)
+			threads.append(current_thread())
+
+		p = pipeline.DataPipeline(3)
+
+		for x in range(20):
+			p.submit(handle, x)
+
+		p.flush()
+		eq_(handled, list(range(20)))
+
+		p.submit(handle, 20)
+		p.close()
+		eq_(handled, list(range(21)))
+
+		assert current_thread() not in threads
+		eq_(len(set(threads)), 1)
+
+	def testBounded(self):
+		"""
+		Submitting blocks once the pipeline is full.
+		"""
+
+		handled = []
+
+		p = pipeline.DataPipeline(2)
+
+		def handle(x):
+			sleep(0.05)
+			handled.append(x)
+
+		for x in range(4):
+			p.submit(handle, x)
+
+		# At most the depth may be waiting, besides the one being handled.
+		assert len(handled) >= 1, handled
+
+		p.close()
+		eq_(handled, list(range(4)))
+
+		assert_raises(ValueError, pipeline.DataPipeline, 0)
+
+	def testException(self):
+		"""
+		Failures are reported, and do not stop the pipeline.
+		"""
+
+		errors, handled = [], []
+
+		def handle(x):
+			if x == 1:
+				raise ValueError(x)
+
+			handled.append(x)
+
+		p = pipeline.DataPipeline(1, errors.append)
+
+		for x in range(3):
+			p.submit(handle, x)
+
+		p.close()
+
+		eq_([e.args for e in errors], [(1,)])
+		eq_(handled, [0, 2])
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,82 @@
+from io import BytesIO
+from nose.tools import assert_raises, eq_
+from unittest import main, TestCase
+
+from ..variables import sort_output_variables, ArbitraryConfig, LinSpaceConfig, OutputVariable
+
+from .. import plan
+
+
+class SweepPlanTest(TestCase):
+	def build_variables(self):
+		vars = [
+			OutputVariable(config=LinSpaceConfig(1.0, 3.0, 3), name='A', order=2, enabled=True),
+			OutputVariable(config=ArbitraryConfig([5.0, 6.0]), name='B', order=1, enabled=True),
+			OutputVariable(config=LinSpaceConfig(-1.0, 1.0, 3), name='C', order=1, enabled=True),
+			OutputVariable(name='D', order=3, enabled=True, const=9.0, use_const=True),
+		]
+		vars[0].type = 'integer'
+
+		return sort_output_variables(vars)
+
+	def testOrderPeriods(self):
+		"""
+		Compute the periods of each order.
+		"""
+
+		variables, num_items = self.build_variables()
+
+		eq_(plan.compute_order_periods(variables), {1: 2, 2: 6})
+		eq_(plan.compute_order_periods(variables, [0, 3]), {0: 1, 1: 2, 2: 6, 3: 6})
+
+	def testSchedule(self):
+		"""
+		The schedule matches iterating over the variables directly.
+		"""
+
+		variables, num_items = self.build_variables()
+		p = plan.SweepPlan(variables)
+
+		eq_(len(p), num_items)
+
+		eq_([p.values(i) for i in range(len(p))], [
+			[(9.0,), (1,), (5.0, -1.0)],
+			[(9.0,), (1,), (6.0, 0.0)],
+			[(9.0,), (2,), (5.0, -1.0)],
+			[(9.0,), (2,), (6.0, 0.0)],
+			[(9.0,), (3,), (5.0, -1.0)],
+			[(9.0,), (3,), (6.0, 0.0)],
+		])
+
+		eq_([p.changed_indices(i) for i in range(len(p))], [
+			[0, 1, 2],
+			[2],
+			[1, 2],
+			[2],
+			[1, 2],
+			[2],
+		])
+
+	def testSaveLoad(self):
+		"""
+		Persist a schedule and load it back.
+		"""
+
+		variables, num_items = self.build_variables()
+		p = plan.SweepPlan(variables)
+
+		f = BytesIO()
+		p.save(f)
+
+		f.seek(0)
+		loaded = plan.SweepPlan.load(f, variables)
+		eq_(loaded.indices.tolist(), p.indices.tolist())
+
+		variables[2][0].config = ArbitraryConfig([5.0, 7.0])
+
+		f.seek(0)
+		assert_raises(ValueError, plan.SweepPlan.load, f, variables)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,73 @@
+from nose.tools import eq_
+from threading import current_thread, RLock
+from unittest import main, TestCase
+
+from spacq.interface.resources import Resource
+
+from .. import pool
+
+
+class FakeDevice(object):
+	def __init__(self):
+		self.lock = RLock()
+
+
+class DevicePoolTest(TestCase):
+	def testCoalesce(self):
+		"""
+		Resources on the same device share a worker.
+		"""
+
+		dev1, dev2 = FakeDevice(), FakeDevice()
+		res1, res2 = Resource(dev1, 'a', 'a'), Resource(dev1, 'b', 'b')
+		res3 = Resource(dev2, 'a', 'a')
+		res4 = Resource(setter=lambda x: None)
+
+		p = pool.DevicePool([res1, res2, res3, res4, None])
+
+		try:
+			eq_(len(p), 3)
+
+			threads = {}
+			def record(name):
+				threads[name] = current_thread()
+
+			p.run('write', [(res, record, (name,), {}) for name, res in
+					[('1', res1), ('2', res2), ('3', res3), ('4', res4)]])
+
+			eq_(threads['1'], threads['2'])
+			assert threads['1'] is not threads['3']
+			assert threads['3'] is not threads['4']
+
+			p.run('write', [])
+
+			eq_(p.stats['write'].count, 2)
+		finally:
+			p.close()
+
+		eq_(len(p), 0)
+
+	def testException(self):
+		"""
+		A failing task does not stop the worker.
+		"""
+
+		res = Resource(setter=lambda x: None)
+		values = []
+
+		def fail():
+			raise ValueError()
+
+		p = pool.DevicePool()
+
+		try:
+			p.run('read', [(res, fail, (), {}), (res, values.append, (1,), {})])
+			p.run('read', [(res, values.append, (2,), {})])
+		finally:
+			p.close()
+
+		eq_(values, [1, 2])
+
+
+if __name__ == '__main__':
+	main()
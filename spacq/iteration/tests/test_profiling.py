@@ -0,0 +1,74 @@
+from nose.tools import eq_
+import json
+from os import path
+from tempfile import mkdtemp
+from unittest import main, TestCase
+
+from spacq.interface.resources import Resource
+
+from ..variables import sort_output_variables, LinSpaceConfig, OutputVariable
+
+from .. import profiling, sweep
+
+
+class LatencyHistogramTest(TestCase):
+	def testAdd(self):
+		"""
+		Durations land in the right bins.
+		"""
+
+		hist = profiling.LatencyHistogram(low=1e-3, high=1, bins_per_decade=1)
+
+		eq_(hist.edges, [1e-3, 1e-2, 1e-1, 1])
+
+		for duration in [1e-4, 2e-3, 5e-3, 0.5, 10]:
+			hist.add(duration)
+
+		eq_(hist.counts, [1, 2, 0, 1, 1])
+		eq_(hist.as_dict(), {'0': 1, '0.001': 2, '0.1': 1, '1': 1})
+
+
+class SweepProfilerTest(TestCase):
+	def testSweep(self):
+		"""
+		Profile a simple sweep.
+		"""
+
+		res_buf = []
+
+		res = Resource(setter=res_buf.append)
+		meas = Resource(getter=lambda: 5)
+
+		var = OutputVariable(name='Var', order=1, enabled=True, wait='0 s')
+		var.config = LinSpaceConfig(1.0, 4.0, 4)
+
+		vars, num_items = sort_output_variables([var])
+		ctrl = sweep.SweepController([(('Res', res),)], vars, num_items, [('Meas', meas)], [])
+		ctrl.data_callback = lambda *args: None
+
+		ctrl.profiler = profiling.SweepProfiler()
+		ctrl.run()
+
+		eq_(res_buf, [1.0, 2.0, 3.0, 4.0])
+
+		result = ctrl.profiler.as_dict()
+
+		for stage in ['init', 'next_values', 'write', 'dwell', 'read', 'condition', 'ramp_down']:
+			assert stage in result['stage'], stage
+		eq_(result['stage']['read']['calls'], 4)
+		eq_(result['write']['Res']['calls'], 4)
+		eq_(result['read']['Meas']['calls'], 4)
+		eq_(result['callback']['data']['calls'], 4)
+		eq_(sum(result['read']['Meas']['histogram'].values()), 4)
+
+		assert ctrl.profiler.total('stage') <= result['elapsed']
+
+		file_path = path.join(mkdtemp(), 'profile.json')
+		ctrl.profiler.save(file_path)
+
+		with open(file_path) as f:
+			eq_(json.load(f)['read']['Meas']['calls'], 4)
+
+
+if __name__ == '__main__':
+	main()
@@ -6,6 +6,7 @@ from time import sleep, time
 from unittest import main, TestCase
 from itertools import cycle
 
+from spacq.devices.agilent.mock.mock_dm34410a import MockDM34410A
 from spacq.devices.config import DeviceConfig
 from spacq.interface.pulse.program import Program
 from spacq.interface.resources import Resource
@@ -285,6 +286,145 @@ class SweepControllerTest(TestCase):
 
 		eq_(exceptions, [('Meas res', e)] * 4)
 
+	def testCombinedReads(self):
+		"""
+		Read several resources on the same device with a single message.
+		"""
+
+		dev = MockDM34410A()
+
+		multi_asks = []
+		def multi_ask(messages):
+			multi_asks.append(messages)
+
+			return MockDM34410A.multi_ask(dev, messages)
+		dev.multi_ask = multi_ask
+
+		res = Resource(setter=lambda x: x)
+		var = OutputVariable(name='Var', order=1, enabled=True, wait='0 ms')
+		var.config = LinSpaceConfig(1.0, 3.0, 3)
+
+		meas_vars = [InputVariable(name='Reading'), InputVariable(name='NPLC')]
+
+		vars, num_items = sort_output_variables([var])
+		ctrl = sweep.SweepController([(('Res', res),)], vars, num_items,
+				[('Reading', dev.resources['reading']), ('NPLC', dev.resources['integration_time'])], meas_vars)
+
+		actual_measurement_values = []
+		def data_callback(cur_time, values, measurement_values):
+			actual_measurement_values.append(measurement_values)
+		ctrl.data_callback = data_callback
+
+		ctrl.run()
+
+		eq_(multi_asks, [['read?', 'sense:voltage:dc:nplc?']] * 3)
+		eq_(len(actual_measurement_values), 3)
+		for reading, nplc in actual_measurement_values:
+			reading.assert_dimensions('V')
+			eq_(nplc, 1.0)
+
+	def testDwell(self):
+		"""
+		Only wait for what is left of the settling time after each write.
+		"""
+
+		delay = 0.1
+
+		def slow_setter(value):
+			sleep(delay)
+
+		slow_res = Resource(setter=slow_setter)
+		fast_res = Resource(setter=lambda value: None)
+
+		slow_var = OutputVariable(name='Slow', order=1, enabled=True, wait='0 ms')
+		slow_var.config = LinSpaceConfig(1.0, 4.0, 4)
+		fast_var = OutputVariable(name='Fast', order=1, enabled=True, wait=str(Quantity(delay, 's')))
+		fast_var.config = LinSpaceConfig(1.0, 4.0, 4)
+
+		vars, num_items = sort_output_variables([slow_var, fast_var])
+		ctrl = sweep.SweepController([(('Slow', slow_res), ('Fast', fast_res))], vars, num_items, [], [])
+
+		start_time = time()
+		ctrl.run()
+		elapsed_time = time() - start_time
+
+		# The fast resource settles while the slow one is being written.
+		assert num_items * delay <= elapsed_time < num_items * delay * 1.5, elapsed_time
+
+	def testReady(self):
+		"""
+		Poll resources which report when they have settled.
+		"""
+
+		ready = [True]
+
+		res = Resource(setter=lambda value: None)
+		res.ready = Resource(getter=lambda: ready[0])
+
+		var = OutputVariable(name='Var', order=1, enabled=True, wait='1 s')
+		var.config = LinSpaceConfig(1.0, 4.0, 4)
+
+		vars, num_items = sort_output_variables([var])
+		ctrl = sweep.SweepController([(('Res', res),)], vars, num_items, [], [])
+
+		start_time = time()
+		ctrl.run()
+		assert time() - start_time < 0.5
+
+		# Never ready, so the full wait is used.
+		ready[0] = False
+		var.wait = '50 ms'
+
+		ctrl = sweep.SweepController([(('Res', res),)], vars, num_items, [], [])
+
+		start_time = time()
+		ctrl.run()
+		assert time() - start_time >= num_items * 0.05
+
+	def testPipelined(self):
+		"""
+		Handle the measurements of a point while the next one is written.
+		"""
+
+		delay = 0.05
+		output = [None]
+
+		def setter(value):
+			sleep(delay)
+			output[0] = value
+
+		res = Resource(setter=setter)
+		# The measurement depends on the output.
+		meas_res = Resource(getter=lambda: output[0])
+
+		var = OutputVariable(name='Var', order=1, enabled=True, wait='0 ms')
+		var.config = LinSpaceConfig(1.0, 6.0, 6)
+		meas = InputVariable(name='Meas')
+
+		vars, num_items = sort_output_variables([var])
+		ctrl = sweep.SweepController([(('Res', res),)], vars, num_items, [('Meas res', meas_res)], [meas],
+				pipeline_depth=2)
+
+		actual_values = []
+		def data_callback(cur_time, values, measurement_values):
+			sleep(delay)
+			actual_values.append((values, measurement_values))
+		ctrl.data_callback = data_callback
+
+		closed = []
+		ctrl.close_callback = lambda: closed.append(len(actual_values))
+
+		start_time = time()
+		ctrl.run()
+		elapsed_time = time() - start_time
+
+		# Every point was measured at its own value, and handled before closing.
+		eq_(actual_values, [((x,), (x,)) for x in [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]])
+		eq_(closed, [num_items])
+
+		# Sequentially, this would take 2 * num_items * delay.
+		assert elapsed_time < 1.5 * num_items * delay, elapsed_time
+
 	def testPulseProgram(self):
 		"""
 		Iterate with a pulse program.
@@ -158,6 +158,50 @@ class ConditionVariableTest(TestCase):
 			pass
 		else:
 			assert False, 'Expected IncompatibleDimensions error.'
+
+	def testCompile(self):
+		"""
+		Compiled conditions read each resource only once.
+		"""
+
+		reads = []
+
+		def getter(value):
+			reads.append(value)
+
+			return value
+
+		res0 = Resource(getter=partial(getter, 5))
+		res1 = Resource(getter=partial(getter, 7))
+		resources = [('res0', res0), ('res1', res1)]
+
+		c1 = variables.Condition('resource name', 'integer', 'res0', '>', 6) # False
+		c2 = variables.Condition('resource name', 'resource name', 'res0', '<', 'res1') # True
+		c3 = variables.Condition('string', 'string', 'res0', '==', 'res0') # Not a resource.
+		c4 = variables.Condition('resource name', 'string', 'missing', '==', 'missing') # Not found.
+
+		cv = variables.ConditionVariable(1, conditions=[c1, c2, c3, c4], name='cv')
+
+		evaluate, cv_resources = cv.compile(resources)
+		eq_(cv_resources, [res0, res1])
+
+		values = {}
+		def read(resource):
+			if resource not in values:
+				values[resource] = resource.value
+
+			return values[resource]
+
+		eq_(evaluate(read), True)
+		eq_(reads, [5, 7])
+
+		# As with evaluate.
+		for c in [c1, c2, c3, c4]:
+			eq_(c.compile(resources)[0](read), c.evaluate(resources))
+
+		evaluate, cv_resources = variables.ConditionVariable(1, conditions=[], name='empty').compile(resources)
+		eq_(evaluate(read), True)
+		eq_(cv_resources, [])
 		
 		
 class OutputVariableTest(TestCase):
@@ -2,7 +2,11 @@ from itertools import groupby, islice
 import numpy
 import operator
 
-from spacq.interface.units import Quantity
+from spacq.interface.units import Quantity, QuantityArray
+
+
+# Comparisons which can be made by conditions.
+condition_operators = {'>': operator.gt, '==': operator.eq, '!=': operator.ne, '<': operator.lt}
 
 
 def sort_output_variables(variables):
@@ -102,6 +106,29 @@ class ConditionVariable(Variable):
 			boolean = True
 		
 		return boolean
+
+	def compile(self, condition_resources=None):
+		"""
+		Produce a function which checks the conditions, given a function which reads a resource.
+
+		Also returns the resources which the conditions read.
+		"""
+
+		compiled = [condition.compile(condition_resources) for condition in self.conditions]
+
+		if not compiled:
+			return (lambda read: True), []
+
+		evaluators = [evaluate for evaluate, _ in compiled]
+		resources = []
+		for _, condition_reads in compiled:
+			resources.extend(x for x in condition_reads if x not in resources)
+
+		def evaluate(read):
+			# We take OR of all the conditions.
+			return any(f(read) for f in evaluators)
+
+		return evaluate, resources
 	
 	@property
 	def wait(self):
@@ -139,7 +166,7 @@ class Condition(object):
 		"""
 		Evaluate a condition. 'resources' comes as a list of 2-tuples (name, resource obj).
 		"""
-		op = {'>':operator.gt, '==':operator.eq, '!=':operator.ne, '<':operator.lt}
+		op = condition_operators
 		
 		arg1_to_evaluate = self.arg1
 		arg2_to_evaluate = self.arg2
@@ -164,6 +191,45 @@ class Condition(object):
 		
 		return boolean
 
+	@staticmethod
+	def _compile_arg(type, arg, resources_by_name):
+		"""
+		A function of a resource reader which produces the value of an argument, and the resource it reads.
+		"""
+
+		if type == 'resource name' and arg in resources_by_name:
+			resource = resources_by_name[arg]
+		elif type == 'resource':
+			resource = arg
+		else:
+			return (lambda read: arg), None
+
+		return (lambda read: read(resource)), resource
+
+	def compile(self, resources=None):
+		"""
+		Produce a function which evaluates the condition, given a function which reads a resource.
+
+		Resource names are resolved once, here, rather than on every evaluation. Also returns the resources which
+		the condition reads.
+		"""
+
+		resources_by_name = dict(resources) if resources else {}
+		op = condition_operators[self.op_symbol]
+
+		get1, resource1 = self._compile_arg(self.type1, self.arg1, resources_by_name)
+		get2, resource2 = self._compile_arg(self.type2, self.arg2, resources_by_name)
+
+		def evaluate(read):
+			return op(get1(read), get2(read))
+
+		reads = []
+		for resource in [resource1, resource2]:
+			if resource is not None and resource not in reads:
+				reads.append(resource)
+
+		return evaluate, reads
+
 
 
 	def __str__(self):
@@ -253,6 +319,10 @@ class OutputVariable(Variable):
 			return iter(self.config)
 
 	def __iter__(self):
+		if self.type == 'quantity' and self.units is not None:
+			# Share the parsed units between all the values.
+			return iter(QuantityArray(list(self.raw_iter), self.units))
+
 		return (self.with_type(x) for x in self.raw_iter)
 
 	def __len__(self):
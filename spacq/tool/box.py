@@ -1,8 +1,7 @@
 from functools import wraps
 from itertools import chain
-from numpy import linspace, meshgrid, sort, unique, where, nan, zeros, ones, arange, fliplr
-from numpy import min as npmin
-from scipy.interpolate import griddata, interp1d
+from numpy import linspace, meshgrid, sort, unique, where, nan, zeros, arange, fliplr, empty
+from numpy import allclose, asarray, bincount, column_stack, count_nonzero, diff, full, ix_, nanmax, nanmin, rint
 
 """
 Generic tools.
@@ -24,35 +23,73 @@ def sift(items, cls):
 
 	return [item for item in items if isinstance(item, cls)]
 
-def get_mask(x,y, tx, ty):
+def get_mask(x, y, tx, ty):
+	"""
+	A mask for the target grid (tx by ty) which is 1 where there is a data point within the diagonal of a grid cell,
+	and NaN elsewhere.
+	"""
+
+	from scipy.spatial import cKDTree
+
 	dx = (tx[-1] - tx[0])/(tx.size -1)
 	dy = (ty[-1] - ty[0])/(ty.size -1)
 
 	d2 = dx**2 + dy**2
 
-	xgrid = meshgrid(x,tx)
-	ygrid = meshgrid(y,ty)
-	
-	xdist = (xgrid[0] - xgrid[1])**2
-	ydist = (ygrid[0] - ygrid[1])**2
+	target_x, target_y = meshgrid(tx, ty)
 
-	mask = ones((tx.shape[0], ty.shape[0]))
-	
-	for i in range (mask.shape[0]):
-		for j in range (mask.shape[1]):
-			mask[i,j] = npmin(xdist[i] + ydist[j])
+	# The distance from each target cell to the nearest data point.
+	tree = cKDTree(column_stack([x, y]))
+	distances, _ = tree.query(column_stack([target_x.ravel(), target_y.ravel()]))
 
-	mask = (mask < d2)*1
-	mask = where(mask, mask, nan)
+	return where(distances.reshape(target_x.shape)**2 < d2, 1.0, nan)
 
-	return mask.T
-	
+
+def grid_indices(x, y):
+	"""
+	Find where each point is in the grid of distinct x and y values, if the points lie on a rectilinear grid.
+
+	The values along each axis must be evenly spaced, no two points may share a cell, and at most one row or column
+	may be incomplete (as when a sweep is stopped early).
+
+	Returns a tuple of:
+		the x values
+		the y values
+		the x index of each point
+		the y index of each point
+	or None if the points are not on such a grid.
+	"""
+
+	x_values, x_idx = unique(x, return_inverse=True)
+	y_values, y_idx = unique(y, return_inverse=True)
+
+	for values in [x_values, y_values]:
+		if len(values) > 2:
+			step = (values[-1] - values[0]) / (len(values) - 1)
+
+			if not allclose(diff(values), step, rtol=1e-6, atol=0):
+				return None
+
+	num_x, num_y = len(x_values), len(y_values)
+
+	if len(unique(y_idx * num_x + x_idx)) != len(x_idx):
+		return None
+
+	incomplete_rows = count_nonzero(bincount(y_idx, minlength=num_y) < num_x)
+	incomplete_columns = count_nonzero(bincount(x_idx, minlength=num_x) < num_y)
+	if incomplete_rows > 1 and incomplete_columns > 1:
+		return None
+
+	return x_values, y_values, x_idx, y_idx
 
 
 def triples_to_mesh(x, y, z, max_mesh=[-1,-1], has_mask=False):
 	"""
 	Convert 3 equal-sized lists of co-ordinates into an interpolated 2D mesh of z-values.
 
+	Points on a rectilinear grid (such as those from a sweep) are placed directly, without interpolation, and any
+	missing cells are NaN.
+
 	Returns a tuple of:
 		the mesh
 		the x bounds
@@ -60,7 +97,13 @@ def triples_to_mesh(x, y, z, max_mesh=[-1,-1], has_mask=False):
 		the z bounds
 	"""
 
-	x_values, y_values = sort(unique(x)), sort(unique(y))
+	x, y, z = asarray(x, dtype=float), asarray(y, dtype=float), asarray(z, dtype=float)
+
+	grid = grid_indices(x, y)
+	if grid is not None:
+		x_values, y_values, x_idx, y_idx = grid
+	else:
+		x_values, y_values = unique(x), unique(y)
 	
 	if (all (item > 0 for item in max_mesh)):
 		display_len_x = min (len(x_values), max_mesh[0])
@@ -69,19 +112,32 @@ def triples_to_mesh(x, y, z, max_mesh=[-1,-1], has_mask=False):
 		display_len_x = len(x_values)
 		display_len_y = len(y_values)
 
-	x_space = linspace(x_values[0], x_values[-1], display_len_x)
-	y_space = linspace(y_values[0], y_values[-1], display_len_y)
+	if grid is not None:
+		target_z = full((len(y_values), len(x_values)), nan)
+		target_z[y_idx, x_idx] = z
+
+		# Keep only the nearest rows and columns to those of a smaller mesh.
+		if display_len_x < len(x_values) or display_len_y < len(y_values):
+			rows = rint(linspace(0, len(y_values) - 1, display_len_y)).astype(int)
+			columns = rint(linspace(0, len(x_values) - 1, display_len_x)).astype(int)
+			target_z = target_z[ix_(rows, columns)]
+	else:
+		x_space = linspace(x_values[0], x_values[-1], display_len_x)
+		y_space = linspace(y_values[0], y_values[-1], display_len_y)
+
+		target_x, target_y = meshgrid(x_space, y_space)
 
-	target_x, target_y = meshgrid(x_space, y_space)
+		# SciPy is slow to import, and only needed here.
+		from scipy.interpolate import griddata
 
-	target_z = griddata((x, y), z, (target_x, target_y), method='cubic')
+		target_z = griddata((x, y), z, (target_x, target_y), method='cubic')
 
-	if (has_mask):	
-		mask =	get_mask (x, y, x_space, y_space)
-		target_z = target_z * mask
+		if (has_mask):	
+			mask =	get_mask (x, y, x_space, y_space)
+			target_z = target_z * mask
 
 	return (target_z, (x_values[0], x_values[-1]), (y_values[0], y_values[-1]),
-			(min(z), max(z)))
+			(nanmin(z), nanmax(z)))
 
 def triples_to_mesh_y(x, y, z, max_mesh=[-1,-1]):
 	"""
@@ -110,6 +166,8 @@ def triples_to_mesh_y(x, y, z, max_mesh=[-1,-1]):
 
 	target_z = zeros([display_len_x, display_len_y])
 
+	from scipy.interpolate import interp1d
+
 	for i, xi in enumerate(x_space):
 		yrange = arange(i*xperiod, (i+1)*xperiod-1).tolist()
 		fy = interp1d (y[yrange], z[yrange], kind='cubic', bounds_error=False)
@@ -143,6 +201,101 @@ class Enum(set):
 			return set.__getattribute__(self, name)
 
 
+class RingBuffer(object):
+	"""
+	A fixed-capacity buffer of values (or rows of values), which discards the oldest values once it is full.
+
+	Every value is stored twice, so that the contents are always available as a contiguous view without copying.
+	"""
+
+	def __init__(self, capacity, width=None, dtype=float):
+		"""
+		capacity: The maximum number of values to keep.
+		width: The length of each row, or None for scalar values. Determined by the first row if set to 0.
+		"""
+
+		if capacity <= 0:
+			raise ValueError('Capacity must be positive, not "{0}"'.format(capacity))
+
+		self.capacity = int(capacity)
+		self.width = width
+		self.dtype = dtype
+
+		self._data = None
+		if width != 0:
+			self._allocate()
+
+		self.clear()
+
+	def _allocate(self):
+		if self.width is None:
+			shape = (2 * self.capacity,)
+		else:
+			shape = (2 * self.capacity, self.width)
+
+		self._data = empty(shape, dtype=self.dtype)
+
+	def clear(self):
+		# The position of the oldest value, and the number of values.
+		self._start = 0
+		self._length = 0
+
+	def __len__(self):
+		return self._length
+
+	def append(self, value):
+		if self._data is None:
+			self.width = len(value)
+			self._allocate()
+
+		if self._length < self.capacity:
+			pos = self._start + self._length
+			self._length += 1
+		else:
+			pos = self._start
+			self._start = (self._start + 1) % self.capacity
+
+		pos %= self.capacity
+		self._data[pos] = value
+		self._data[pos + self.capacity] = value
+
+	@property
+	def data(self):
+		"""
+		The values from oldest to newest, as a view which is only valid until the next change.
+		"""
+
+		if self._data is None:
+			return empty((0, 0), dtype=self.dtype)
+
+		return self._data[self._start:self._start + self._length]
+
+	def __getitem__(self, idx):
+		return self.data[idx]
+
+	def resize(self, capacity):
+		"""
+		Change the capacity, keeping as many of the newest values as possible.
+		"""
+
+		capacity = int(capacity)
+
+		if capacity <= 0:
+			raise ValueError('Capacity must be positive, not "{0}"'.format(capacity))
+		elif capacity == self.capacity:
+			return
+
+		values = self.data[-capacity:].copy()
+
+		self.capacity = capacity
+		if self._data is not None:
+			self._allocate()
+
+		self.clear()
+		for value in values:
+			self.append(value)
+
+
 class PubDict(dict):
 	"""
 	A locking, publishing dictionary.
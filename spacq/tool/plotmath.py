@@ -0,0 +1,122 @@
+from numpy import arange, asarray, errstate, full, minimum, maximum, nan
+
+"""
+Calculations on swept data, for plotmath.
+"""
+
+
+methods = ['central', 'forward', 'backward']
+
+
+def sweep_period(x):
+	"""
+	Find how x is swept, as the (period, inner) of the innermost loop of the sweep.
+
+	If x is the innermost variable (it changes from one point to the next), inner is True and x restarts every period
+	points. Otherwise, x stays constant for period points at a time.
+	"""
+
+	x = asarray(x)
+
+	if len(x) < 2:
+		return len(x), True
+
+	if x[0] == x[1]:
+		changes = (x[1:] != x[0]).nonzero()[0]
+
+		if len(changes) > 0:
+			return changes[0] + 1, False
+		else:
+			return len(x), False
+	else:
+		restarts = (x[1:] == x[0]).nonzero()[0]
+
+		if len(restarts) > 0:
+			return restarts[0] + 1, True
+		else:
+			return len(x), True
+
+
+def stencil(n, step=1, method='central'):
+	"""
+	The indices (lo, hi) between which the difference is taken at each of n points.
+
+	Central differences narrow towards the ends; forward and backward differences turn around instead.
+	"""
+
+	if method not in methods:
+		raise ValueError('Unknown method "{0}"; expected one of: {1}'.format(method, ', '.join(methods)))
+
+	if step < 1:
+		raise ValueError('Step must be positive, not "{0}"'.format(step))
+
+	# Too wide a stencil is no use.
+	if step >= n // 2:
+		step = 1
+
+	idxs = arange(n)
+
+	if method == 'central':
+		lo, hi = maximum(idxs - step, 0), minimum(idxs + step, n - 1)
+	elif method == 'forward':
+		lo = maximum(minimum(idxs, n - 1 - step), 0)
+		hi = minimum(lo + step, n - 1)
+	else:
+		hi = minimum(maximum(idxs, step), n - 1)
+		lo = maximum(hi - step, 0)
+
+	return lo, hi
+
+
+def difference(y, x, axis, step=1, method='central'):
+	"""
+	The finite difference dy/dx of 2D arrays along the given axis.
+	"""
+
+	lo, hi = stencil(y.shape[axis], step, method)
+
+	if axis == 0:
+		dy, dx = y[hi] - y[lo], x[hi] - x[lo]
+	else:
+		dy, dx = y[:,hi] - y[:,lo], x[:,hi] - x[:,lo]
+
+	with errstate(all='ignore'):
+		return dy / dx
+
+
+def derivative(y, x, step=1, method='central'):
+	"""
+	The derivative dy/dx of swept data.
+
+	The period of the innermost loop is found from x, and the data is taken as a 2D map; the derivative is then
+	taken along the direction in which x changes, with x itself giving the spacing.
+
+	Points which do not fit the map, such as those of an unfinished outer step, are nan.
+	"""
+
+	y, x = asarray(y, dtype=float), asarray(x, dtype=float)
+
+	if y.shape != x.shape:
+		raise ValueError('Mismatched lengths: {0}, {1}'.format(len(y), len(x)))
+
+	result = full(len(y), nan)
+
+	if len(y) < 2:
+		return result
+
+	period, inner = sweep_period(x)
+	num_complete = (len(y) // period) * period
+
+	if inner:
+		result[:num_complete] = difference(y[:num_complete].reshape(-1, period),
+				x[:num_complete].reshape(-1, period), 1, step, method).reshape(-1)
+
+		# An unfinished last sweep of x is still a sweep of x.
+		if num_complete < len(y) - 1:
+			result[num_complete:] = difference(y[num_complete:].reshape(1, -1), x[num_complete:].reshape(1, -1), 1,
+					step, method).reshape(-1)
+	elif num_complete > period:
+		result[:num_complete] = difference(y[:num_complete].reshape(-1, period),
+				x[:num_complete].reshape(-1, period), 0, step, method).reshape(-1)
+
+	return result
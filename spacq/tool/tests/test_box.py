@@ -1,5 +1,6 @@
-from nose.tools import eq_
-from numpy import arange, linspace, repeat
+from nose.tools import assert_raises, eq_
+from numpy import arange, empty, isnan, linspace, nan, repeat
+from numpy.random import RandomState
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 from pubsub import pub
 from threading import RLock, Thread
@@ -118,6 +119,94 @@ class TriplesToMeshTest(TestCase):
 		eq_(z_bounds, (0, 99999))
 
 
+	def testPartialGrid(self):
+		"""
+		A sweep which was stopped part of the way through its last row.
+		"""
+
+		x = [1, 2, 3] * 3
+		y = repeat([5, 6, 7], 3)
+		z = arange(9.0)
+
+		result, x_bounds, y_bounds, z_bounds = box.triples_to_mesh(x[:7], y[:7], z[:7])
+
+		expected = z.reshape(3, 3)
+		expected[2, 1:] = nan
+		assert_array_equal(result, expected)
+		eq_(x_bounds, (1, 3))
+		eq_(y_bounds, (5, 7))
+		eq_(z_bounds, (0, 6))
+
+	def testGridMaxMesh(self):
+		"""
+		A grid larger than the mesh is thinned out.
+		"""
+
+		x = list(range(5)) * 3
+		y = repeat(list(range(3)), 5)
+		z = arange(15.0)
+
+		result, x_bounds, y_bounds, _ = box.triples_to_mesh(x, y, z, [3, 3])
+
+		assert_array_equal(result, z.reshape(3, 5)[:, [0, 2, 4]])
+		eq_(x_bounds, (0, 4))
+		eq_(y_bounds, (0, 2))
+
+	def testGridIndices(self):
+		"""
+		Recognize grids.
+		"""
+
+		x_values, y_values, x_idx, y_idx = box.grid_indices([0.5, 0, 1, 0, 0.5], [2, 2, 2, 3, 3])
+		assert_array_equal(x_values, [0, 0.5, 1])
+		assert_array_equal(y_values, [2, 3])
+		assert_array_equal(x_idx, [1, 0, 2, 0, 1])
+		assert_array_equal(y_idx, [0, 0, 0, 1, 1])
+
+		# Uneven spacing.
+		eq_(box.grid_indices([0, 0.25, 1], [0, 0, 0]), None)
+		# Repeated points.
+		eq_(box.grid_indices([0, 1, 0], [0, 0, 0]), None)
+		# Too sparse.
+		eq_(box.grid_indices([0, 1, 2], [0, 1, 2]), None)
+
+	def testMask(self):
+		"""
+		The mask matches the distance to the nearest point.
+		"""
+
+		rand = RandomState(0)
+		x, y = rand.uniform(0, 10, 50), rand.uniform(0, 5, 50)
+		tx, ty = linspace(0, 10, 30), linspace(0, 5, 20)
+
+		d2 = (tx[1] - tx[0])**2 + (ty[1] - ty[0])**2
+
+		expected = empty((len(ty), len(tx)))
+		for i, yi in enumerate(ty):
+			for j, xj in enumerate(tx):
+				expected[i, j] = 1 if min((x - xj)**2 + (y - yi)**2) < d2 else nan
+
+		assert_array_equal(box.get_mask(x, y, tx, ty), expected)
+
+	def testMaskedInterpolated(self):
+		"""
+		Scattered points are interpolated, and masked away from the data.
+		"""
+
+		rand = RandomState(0)
+		x, y = rand.uniform(0, 10, 50), rand.uniform(0, 5, 50)
+		z = x + y
+
+		result, x_bounds, y_bounds, _ = box.triples_to_mesh(x, y, z, [20, 10], has_mask=True)
+		unmasked, _, _, _ = box.triples_to_mesh(x, y, z, [20, 10])
+
+		mask = box.get_mask(x, y, linspace(x_bounds[0], x_bounds[1], 20), linspace(y_bounds[0], y_bounds[1], 10))
+
+		eq_(result.shape, (10, 20))
+		assert_array_almost_equal(result, unmasked * mask)
+		assert isnan(mask).any()
+
+
 class EnumTest(TestCase):
 	def testEmpty(self):
 		"""
@@ -320,5 +409,60 @@ class WithoutTest(TestCase):
 			assert False, 'Expected IndexError.'
 
 
+class RingBufferTest(TestCase):
+	def testScalar(self):
+		"""
+		Overfill a buffer of scalars.
+		"""
+
+		rb = box.RingBuffer(3)
+
+		eq_(len(rb), 0)
+
+		for x in range(5):
+			rb.append(x)
+
+		eq_(len(rb), 3)
+		assert_array_equal(rb.data, [2, 3, 4])
+		eq_(rb[-1], 4)
+
+		rb.clear()
+		eq_(len(rb), 0)
+
+		assert_raises(ValueError, box.RingBuffer, 0)
+
+	def testRows(self):
+		"""
+		Rows, with the width determined by the first one.
+		"""
+
+		rb = box.RingBuffer(2, 0)
+
+		eq_(rb.data.shape, (0, 0))
+
+		for x in range(3):
+			rb.append([x, x * 10, x * 100])
+
+		eq_(rb.width, 3)
+		assert_array_equal(rb.data, [[1, 10, 100], [2, 20, 200]])
+
+	def testResize(self):
+		"""
+		Shrinking keeps the newest values; growing keeps them all.
+		"""
+
+		rb = box.RingBuffer(4, 2)
+
+		for x in range(6):
+			rb.append((x, -x))
+
+		rb.resize(2)
+		assert_array_equal(rb.data, [[4, -4], [5, -5]])
+
+		rb.resize(5)
+		rb.append((6, -6))
+		assert_array_equal(rb.data, [[4, -4], [5, -5], [6, -6]])
+
+
 if __name__ == '__main__':
 	main()
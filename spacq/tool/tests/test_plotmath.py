@@ -0,0 +1,111 @@
+from nose.tools import assert_raises, eq_
+from numpy import arange, isnan, linspace, meshgrid, repeat, tile
+from numpy.random import RandomState
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+from unittest import main, TestCase
+
+from .. import plotmath
+
+
+def loop_derivative(y, x, step):
+	"""
+	Central differences along x, one point at a time.
+	"""
+
+	n = len(y)
+	if step >= n // 2:
+		step = 1
+
+	result = []
+	for i in range(n):
+		lo, hi = max(i - step, 0), min(i + step, n - 1)
+		result.append((y[hi] - y[lo]) / (x[hi] - x[lo]))
+
+	return result
+
+
+class SweepPeriodTest(TestCase):
+	def testPeriod(self):
+		eq_(plotmath.sweep_period([1, 2, 3, 1, 2, 3]), (3, True))
+		eq_(plotmath.sweep_period([1, 1, 2, 2, 3, 3]), (2, False))
+		eq_(plotmath.sweep_period([1, 2, 3, 4]), (4, True))
+		eq_(plotmath.sweep_period([5, 5, 5]), (3, False))
+		eq_(plotmath.sweep_period([5]), (1, True))
+
+
+class StencilTest(TestCase):
+	def testMethods(self):
+		lo, hi = plotmath.stencil(6, 2, 'central')
+		assert_array_equal(lo, [0, 0, 0, 1, 2, 3])
+		assert_array_equal(hi, [2, 3, 4, 5, 5, 5])
+
+		lo, hi = plotmath.stencil(6, 2, 'forward')
+		assert_array_equal(lo, [0, 1, 2, 3, 3, 3])
+		assert_array_equal(hi, [2, 3, 4, 5, 5, 5])
+
+		lo, hi = plotmath.stencil(6, 2, 'backward')
+		assert_array_equal(lo, [0, 0, 0, 1, 2, 3])
+		assert_array_equal(hi, [2, 2, 2, 3, 4, 5])
+
+		# Too wide.
+		lo, hi = plotmath.stencil(6, 3, 'central')
+		assert_array_equal(hi - lo, [1, 2, 2, 2, 2, 1])
+
+		assert_raises(ValueError, plotmath.stencil, 6, 1, 'sideways')
+		assert_raises(ValueError, plotmath.stencil, 6, 0)
+
+
+class DerivativeTest(TestCase):
+	def setUp(self):
+		self.x, self.y = meshgrid(linspace(0, 1, 20), linspace(-1, 1, 15))
+		self.z = RandomState(0).rand(*self.x.shape)
+
+	def testInner(self):
+		"""
+		Along the inner variable, row by row.
+		"""
+
+		x, z = self.x.reshape(-1), self.z.reshape(-1)
+		result = plotmath.derivative(z, x, step=3)
+
+		expected = [loop_derivative(zs, xs, 3) for zs, xs in zip(self.z, self.x)]
+		assert_array_almost_equal(result, sum(expected, []))
+
+	def testOuter(self):
+		"""
+		Along the outer variable, column by column.
+		"""
+
+		y, z = self.y.reshape(-1), self.z.reshape(-1)
+		result = plotmath.derivative(z, y, step=2).reshape(self.z.shape)
+
+		for k in range(self.z.shape[1]):
+			assert_array_almost_equal(result[:,k], loop_derivative(self.z[:,k], self.y[:,k], 2))
+
+	def testLinear(self):
+		x = tile(arange(5.), 3)
+		y = 3 * x + 1
+
+		for method in plotmath.methods:
+			assert_array_almost_equal(plotmath.derivative(y, x, 1, method), [3] * 15)
+
+	def testIncomplete(self):
+		"""
+		An unfinished sweep.
+		"""
+
+		x = tile(arange(5.), 3)[:-2]
+		result = plotmath.derivative(2 * x, x)
+		assert_array_almost_equal(result, [2] * 13)
+
+		y = repeat(arange(3.), 4)[:-1]
+		result = plotmath.derivative(2 * y, y)
+		assert_array_almost_equal(result[:8], [2] * 8)
+		assert isnan(result[8:]).all()
+
+		assert isnan(plotmath.derivative([1], [1])).all()
+		assert_raises(ValueError, plotmath.derivative, [1, 2], [1])
+
+
+if __name__ == '__main__':
+	main()